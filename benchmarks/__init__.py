@@ -0,0 +1,5 @@
+"""Synthetic-state benchmarks for the Houssam Ascension CLI."""
+
+from .generator import generate_state
+
+__all__ = ["generate_state"]
@@ -0,0 +1,75 @@
+"""Deterministic synthetic ``GameState`` generator for benchmarks."""
+from __future__ import annotations
+
+import datetime as _dt
+import random
+import uuid
+
+from houssam_rpg.models import GameState, PlayerProgress, Quest, QuestStatus
+from houssam_rpg.state import quest_templates
+
+STATUS_MIX = (
+    (QuestStatus.COMPLETED, 0.72),
+    (QuestStatus.FAILED, 0.08),
+    (QuestStatus.PENDING, 0.20),
+)
+
+
+def generate_state(
+    quests: int,
+    tracks: int = 16,
+    days: int = 365,
+    chain_ratio: float = 0.02,
+    max_chain: int = 40,
+    seed: int = 7,
+    today: _dt.date = _dt.date(2025, 1, 1),
+) -> GameState:
+    """Build a state with ``quests`` quests spread over the ``days`` before ``today``.
+
+    Resolved quests are spread across the whole range and pending quests
+    cluster around ``today``. A ``chain_ratio`` share of pending quests
+    carries a failure chain of up to ``max_chain`` doublings.
+    """
+    rng = random.Random(seed)
+    # Separate stream so calendars don't shift the quests generated for a seed.
+    calendar_rng = random.Random(seed + 1)
+    blueprints = list(quest_templates())
+    skills = [f"{blueprints[n % len(blueprints)]['skill']} #{n}" for n in range(tracks)]
+    player = PlayerProgress(level=rng.randint(1, 60), xp=rng.randint(0, 500), last_login=today)
+    for skill in skills:
+        track = player.ensure_track(skill)
+        track.streak = rng.randint(0, 60)
+        track.last_completed = today - _dt.timedelta(days=rng.randint(1, 3))
+        for back in range(days - 1, -1, -1):
+            if back < track.streak or calendar_rng.random() < 0.6:
+                track.mark_day(track.last_completed - _dt.timedelta(days=back))
+
+    statuses = [status for status, _ in STATUS_MIX]
+    weights = [weight for _, weight in STATUS_MIX]
+    ledger = []
+    for _ in range(quests):
+        blueprint = rng.choice(blueprints)
+        status = rng.choices(statuses, weights)[0]
+        if status == QuestStatus.PENDING:
+            deadline = today + _dt.timedelta(days=rng.randint(-2, 7))
+        else:
+            deadline = today - _dt.timedelta(days=rng.randint(0, days))
+        quest = Quest(
+            title=blueprint["title"],
+            tree=blueprint["tree"],
+            skill=rng.choice(skills),
+            difficulty=blueprint["difficulty"],
+            estimated_effort=blueprint["estimated_effort"],
+            xp_reward=blueprint["xp_reward"],
+            streak_impact=1,
+            deadline=deadline,
+            status=status,
+            id=uuid.UUID(int=rng.getrandbits(128)).hex,
+        )
+        if status == QuestStatus.PENDING and rng.random() < chain_ratio:
+            quest.escalate_failure(rng.randint(2, max_chain))
+        ledger.append(quest)
+    return GameState(player=player, quests=ledger, current_day=today)
+
+
+__all__ = ["generate_state"]
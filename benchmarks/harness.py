@@ -0,0 +1,102 @@
+"""Time every CLI-facing operation against synthetic states.
+
+Usage::
+
+    python -m benchmarks.harness --sizes 1000 10000 --output bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from houssam_rpg import GameEngine, load_game_state, save_game_state
+from houssam_rpg.models import GameState, QuestStatus
+
+from .generator import generate_state
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def _first_pending(state: GameState) -> str:
+    return next(state.index.with_status(QuestStatus.PENDING)).id
+
+
+OPERATIONS: Dict[str, Callable[[GameEngine], object]] = {
+    "morning_briefing": lambda engine: engine.morning_briefing(),
+    "status_overview": lambda engine: engine.status_overview(),
+    "status_first_page": lambda engine: engine.status_overview(limit=50),
+    "status_summary": lambda engine: engine.status_overview(summary=True),
+    "complete_quest": lambda engine: engine.complete_quest(_first_pending(engine.state)),
+    "schedule_quest": lambda engine: engine.schedule_quest(engine.catalog[0].id),
+    "advance_day": lambda engine: engine.advance_day(),
+}
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_size(size: int, repeat: int, seed: int) -> List[Dict]:
+    results: List[Dict] = []
+
+    def record(op: str, samples: List[float]) -> None:
+        results.append({"size": size, "op": op, "best_s": min(samples), "samples_s": samples})
+        print(f"{size:>9} {op:<18} {min(samples) * 1000:10.2f} ms", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game_state.json"
+        state = generate_state(size, seed=seed)
+        record("save_game_state", [_timed(lambda: save_game_state(state, path, check_version=False)) for _ in range(repeat)])
+        record("load_game_state", [_timed(lambda: load_game_state(path)) for _ in range(repeat)])
+        binary = path.with_suffix(".hrpg")
+        record("save_binary", [_timed(lambda: save_game_state(state, binary, check_version=False)) for _ in range(repeat)])
+        record("load_binary", [_timed(lambda: load_game_state(binary)) for _ in range(repeat)])
+        for name, op in OPERATIONS.items():
+            samples = []
+            for _ in range(repeat):
+                # Start every sample from the same snapshot so mutations don't compound.
+                save_game_state(state, path, check_version=False)
+                engine = GameEngine(load_game_state(path), path=path)
+                samples.append(_timed(lambda: op(engine)))
+            record(name, samples)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the Houssam RPG engine on synthetic states.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Quest counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per operation (best is reported)")
+    parser.add_argument("--seed", type=int, default=7, help="Generator seed")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"), help="JSON report path")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results: List[Dict] = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.repeat, args.seed))
+    report = {
+        "generated_at": _dt.datetime.now(_dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {len(results)} measurements → {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,43 @@
-"""Core package for the Houssam Ascension life-RPG prototype."""
+"""Core package for the Houssam Ascension life-RPG prototype.
 
+The engine, the state layer and the modules that plug snapshot formats,
+storage backends and save hooks into it load eagerly; ``daemon``, ``watch``,
+``profiles`` and ``simulator`` load on first access.
+"""
+
+import importlib
+
+from . import achievements, binary_snapshot, briefing, metrics, sqlite_store, undo  # noqa: F401
+from .catalog import TemplateCatalog, load_catalog
 from .engine import GameEngine
-from .state import load_game_state, save_game_state
+from .sqlite_store import SqliteStorage
+from .state import load_game_state, save_game_state, storage_for
+
+# These pull in asyncio or multiprocessing, so they load on first access.
+_LAZY_MODULES = {"daemon", "profiles", "simulator", "watch"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["GameEngine", "load_game_state", "save_game_state"]
+__all__ = [
+    "GameEngine",
+    "SqliteStorage",
+    "TemplateCatalog",
+    "achievements",
+    "binary_snapshot",
+    "briefing",
+    "daemon",
+    "metrics",
+    "profiles",
+    "simulator",
+    "undo",
+    "watch",
+    "load_catalog",
+    "load_game_state",
+    "save_game_state",
+    "storage_for",
+]
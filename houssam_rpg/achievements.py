@@ -0,0 +1,197 @@
+"""Achievements: declarative rules advanced by gameplay events.
+
+Each rule subscribes to a few event kinds and folds every matching event
+into one small integer counter kept on the player. The book indexes rules by
+event kind, so an action only pays for the rules listening to the events it
+fires, never for a rescan of the quest ledger or the history.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import OUTCOMES, Difficulty, EventHistory, PlayerProgress, SkillTree
+
+EVENT_KINDS = ("quest_completed", "quest_failed", "day_advanced", "level_up")
+
+
+@dataclass(frozen=True, slots=True)
+class AchievementEvent:
+    kind: str
+    day: _dt.date
+    tree: Optional[SkillTree] = None
+    skill: Optional[str] = None
+    difficulty: Optional[Difficulty] = None
+    xp: int = 0
+    # Skill streak after a completion, and how many failures the quest had survived.
+    streak: int = 0
+    chain: int = 0
+    level: int = 0
+    # Midnights rolled over by a day_advanced event.
+    days: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Achievement:
+    """One rule: ``step`` folds a subscribed event into the counter; reaching ``goal`` unlocks it."""
+
+    id: str
+    title: str
+    description: str
+    on: Tuple[str, ...]
+    step: Callable[[int, AchievementEvent], int]
+    goal: int
+
+
+def counting(
+    achievement_id: str,
+    title: str,
+    description: str,
+    kind: str,
+    goal: int,
+    where: Optional[Callable[[AchievementEvent], bool]] = None,
+) -> Achievement:
+    """Unlock after ``goal`` events of ``kind`` (that satisfy ``where``)."""
+
+    def step(value: int, event: AchievementEvent) -> int:
+        return value + 1 if where is None or where(event) else value
+
+    return Achievement(achievement_id, title, description, (kind,), step, goal)
+
+
+def reaching(
+    achievement_id: str,
+    title: str,
+    description: str,
+    kind: str,
+    goal: int,
+    measure: Callable[[AchievementEvent], int],
+) -> Achievement:
+    """Unlock once ``measure`` of an event of ``kind`` reaches ``goal``; the counter keeps the best so far."""
+    return Achievement(
+        achievement_id, title, description, (kind,), lambda value, event: max(value, measure(event)), goal
+    )
+
+
+def clean_days(achievement_id: str, title: str, description: str, goal: int) -> Achievement:
+    """Unlock after ``goal`` midnights in a row without a failed or missed quest."""
+
+    def step(value: int, event: AchievementEvent) -> int:
+        return 0 if event.kind == "quest_failed" else value + event.days
+
+    return Achievement(achievement_id, title, description, ("quest_failed", "day_advanced"), step, goal)
+
+
+def _tree_counts(tree: SkillTree, names: Tuple[Tuple[int, str], ...]) -> List[Achievement]:
+    return [
+        counting(
+            f"{tree.value.lower()}-{goal}",
+            title,
+            f"Clear {goal} {tree.value} quests",
+            "quest_completed",
+            goal,
+            where=lambda event, tree=tree: event.tree == tree,
+        )
+        for goal, title in names
+    ]
+
+
+ACHIEVEMENTS: Tuple[Achievement, ...] = (
+    reaching("streak-7", "Week-Long Flame", "Keep one skill streak alive for 7 days", "quest_completed", 7,
+             lambda event: event.streak),
+    reaching("streak-30", "Moon-Cycle Flame", "Keep one skill streak alive for 30 days", "quest_completed", 30,
+             lambda event: event.streak),
+    reaching("streak-100", "Eternal Flame", "Keep one skill streak alive for 100 days", "quest_completed", 100,
+             lambda event: event.streak),
+    *_tree_counts(SkillTree.DEV, ((25, "Code Adept"), (250, "Code Sovereign"))),
+    *_tree_counts(SkillTree.FAITH, ((25, "Devoted Seeker"), (250, "Steadfast Worshipper"))),
+    *_tree_counts(SkillTree.BODY, ((25, "Iron Novice"), (250, "Iron Vanguard"))),
+    clean_days("clean-30", "Unbroken Discipline", "Go 30 days without a failed or missed quest", 30),
+    reaching("chain-1", "Second Wind", "Clear a quest after failing it", "quest_completed", 1,
+             lambda event: event.chain),
+    reaching("chain-3", "Phoenix Rising", "Clear a quest that had failed 3 times in a row", "quest_completed", 3,
+             lambda event: event.chain),
+    counting("brutal-1", "Brutal Victor", "Clear a Brutal quest", "quest_completed", 1,
+             where=lambda event: event.difficulty == Difficulty.BRUTAL),
+    reaching("level-10", "Gate Breaker", "Reach level 10 and leave E-Rank behind", "level_up", 10,
+             lambda event: event.level),
+)
+
+
+class AchievementBook:
+    """Achievement rules indexed by the event kinds they subscribe to."""
+
+    def __init__(self, achievements: Iterable[Achievement] = ACHIEVEMENTS) -> None:
+        self.achievements: Dict[str, Achievement] = {}
+        self._by_kind: Dict[str, List[Achievement]] = {kind: [] for kind in EVENT_KINDS}
+        for achievement in achievements:
+            self.achievements[achievement.id] = achievement
+            for kind in achievement.on:
+                self._by_kind[kind].append(achievement)
+
+    def __len__(self) -> int:
+        return len(self.achievements)
+
+    def __iter__(self):
+        return iter(self.achievements.values())
+
+    def fire(self, player: PlayerProgress, event: AchievementEvent, touched: Set[str]) -> List[Achievement]:
+        """Advance the rules subscribed to ``event.kind`` and return the ones it unlocked.
+
+        Ids whose counter changed are added to ``touched``. An unlocked rule
+        drops its counter and adds its title to the player's titles.
+        """
+        unlocked: List[Achievement] = []
+        counters = player.achievement_counters
+        for achievement in self._by_kind[event.kind]:
+            if achievement.id in player.achievements:
+                continue
+            value = counters.get(achievement.id, 0)
+            new = achievement.step(value, event)
+            if new >= achievement.goal:
+                player.achievements[achievement.id] = event.day
+                counters.pop(achievement.id, None)
+                if achievement.title not in player.titles:
+                    player.titles.append(achievement.title)
+                unlocked.append(achievement)
+            elif new != value:
+                counters[achievement.id] = new
+            else:
+                continue
+            touched.add(achievement.id)
+        return unlocked
+
+    def replay_history(self, player: PlayerProgress, history: EventHistory) -> List[Achievement]:
+        """Fold recorded outcomes into the counters, for players who predate achievements.
+
+        History rows carry no streaks, failure chains or rollovers, so only
+        the rules that count completions and failures catch up.
+        """
+        trees = list(SkillTree)
+        difficulties = list(Difficulty)
+        touched: Set[str] = set()
+        unlocked: List[Achievement] = []
+        for day, _, outcome, tree, skill, difficulty, xp in history.rows():
+            kind = "quest_completed" if OUTCOMES[outcome] == "completed" else "quest_failed"
+            event = AchievementEvent(
+                kind, _dt.date.fromordinal(day), trees[tree], skill, difficulties[difficulty], xp
+            )
+            unlocked.extend(self.fire(player, event, touched))
+        return unlocked
+
+
+BOOK = AchievementBook()
+
+
+__all__ = [
+    "ACHIEVEMENTS",
+    "BOOK",
+    "EVENT_KINDS",
+    "Achievement",
+    "AchievementBook",
+    "AchievementEvent",
+    "clean_days",
+    "counting",
+    "reaching",
+]
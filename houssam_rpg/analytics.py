@@ -0,0 +1,234 @@
+"""Batched progress analytics over the outcome history.
+
+Every function works on whole columns at once: with NumPy installed the
+history arrays are viewed without copying and reduced with ``bincount``;
+otherwise the same results come from single pure-Python passes.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models import OUTCOMES, EventHistory, SkillTree
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+COMPLETED = OUTCOMES.index("completed")
+_INT64_MAX = 2**63 - 1
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _column(history: EventHistory, name: str, window: slice):
+    column = getattr(history, name)
+    if np is not None:
+        return np.frombuffer(column, dtype=column.typecode)[window] if len(column) else np.zeros(0)
+    return column[window]
+
+
+def _group_codes(history: EventHistory, by: str, window: slice) -> Tuple[Sequence[int], List[str]]:
+    if by == "tree":
+        return _column(history, "trees", window), [tree.value for tree in SkillTree]
+    if by == "skill":
+        return _column(history, "skills", window), list(history.skill_names)
+    raise ValueError(f"Unknown grouping {by!r}; use 'skill' or 'tree'.")
+
+
+def _bincount(codes: Sequence[int], size: int) -> List[int]:
+    if np is not None:
+        counts = np.bincount(np.asarray(codes, dtype=np.int64), minlength=size)
+        return [int(v) for v in counts[:size]]
+    counts = [0] * size
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def _sum_by_code(codes: Sequence[int], size: int, weights: Sequence[int]) -> List[int]:
+    """Exact integer sums of ``weights`` per code.
+
+    NumPy sums in int64 only when no total can overflow it; larger XP is
+    summed in Python integers, so both paths always agree.
+    """
+    if np is not None and len(weights):
+        bound = max(abs(int(weights.min())), abs(int(weights.max())))
+        if bound <= _INT64_MAX // len(weights):
+            totals = np.zeros(size, dtype=np.int64)
+            np.add.at(totals, np.asarray(codes, dtype=np.int64), weights)
+            return [int(v) for v in totals]
+    totals = [0] * size
+    for code, weight in zip(codes, weights):
+        totals[int(code)] += int(weight)
+    return totals
+
+
+def completion_rates(
+    history: EventHistory,
+    by: str = "skill",
+    first: Optional[_dt.date] = None,
+    last: Optional[_dt.date] = None,
+) -> List[Tuple[str, int, int, float]]:
+    """Return ``(name, completed, not completed, rate)`` per skill or tree."""
+    window = history.window(first, last)
+    codes, names = _group_codes(history, by, window)
+    outcomes = _column(history, "outcomes", window)
+    if np is not None:
+        done_mask = outcomes == COMPLETED
+        completed = _bincount(codes[done_mask], len(names))
+        missed = _bincount(codes[~done_mask], len(names))
+    else:
+        completed = [0] * len(names)
+        missed = [0] * len(names)
+        for code, outcome in zip(codes, outcomes):
+            if outcome == COMPLETED:
+                completed[code] += 1
+            else:
+                missed[code] += 1
+    rows = []
+    for idx, name in enumerate(names):
+        total = completed[idx] + missed[idx]
+        if total:
+            rows.append((name, completed[idx], missed[idx], completed[idx] / total))
+    return rows
+
+
+def xp_per_week(
+    history: EventHistory, first: Optional[_dt.date] = None, last: Optional[_dt.date] = None
+) -> List[Tuple[_dt.date, int]]:
+    """XP earned per Monday-based week."""
+    window = history.window(first, last)
+    days = _column(history, "days", window)
+    if not len(days):
+        return []
+    xp = _column(history, "xp", window)
+    origin = int(days[0]) - (int(days[0]) - 1) % 7  # ordinal 1 is a Monday
+    if np is not None:
+        weeks = (days.astype(np.int64) - origin) // 7
+    else:
+        weeks = [(day - origin) // 7 for day in days]
+    totals = _sum_by_code(weeks, int(weeks[-1]) + 1, xp)
+    return [(_dt.date.fromordinal(origin + 7 * n), total) for n, total in enumerate(totals)]
+
+
+def xp_curve(history: EventHistory) -> List[Tuple[_dt.date, int]]:
+    """Cumulative XP at the end of every day that recorded an outcome."""
+    curve: List[Tuple[_dt.date, int]] = []
+    running = 0
+    for day, xp in _daily_totals(history):
+        running += xp
+        curve.append((day, running))
+    return curve
+
+
+def _daily_totals(history: EventHistory) -> List[Tuple[_dt.date, int]]:
+    days = _column(history, "days", slice(None))
+    if not len(days):
+        return []
+    xp = _column(history, "xp", slice(None))
+    origin = int(days[0])
+    if np is not None:
+        offsets = days.astype(np.int64) - origin
+    else:
+        offsets = [day - origin for day in days]
+    totals = _sum_by_code(offsets, int(offsets[-1]) + 1, xp)
+    return [(_dt.date.fromordinal(origin + n), total) for n, total in enumerate(totals) if total]
+
+
+def rolling_completion_rate(
+    history: EventHistory, window_days: int, first: _dt.date, last: _dt.date
+) -> List[Tuple[_dt.date, Optional[float]]]:
+    """Completion rate over the trailing ``window_days`` for each day in ``[first, last]``."""
+    span_start = first - _dt.timedelta(days=window_days - 1)
+    window = history.window(span_start, last)
+    days = _column(history, "days", window)
+    outcomes = _column(history, "outcomes", window)
+    size = (last - span_start).days + 1
+    origin = span_start.toordinal()
+    if np is not None:
+        offsets = days.astype(np.int64) - origin
+        done = _bincount(offsets[outcomes == COMPLETED], size)
+        total = _bincount(offsets, size)
+    else:
+        offsets = [day - origin for day in days]
+        done = _bincount([o for o, out in zip(offsets, outcomes) if out == COMPLETED], size)
+        total = _bincount(offsets, size)
+    done_sum = _prefix_sums(done)
+    total_sum = _prefix_sums(total)
+    series = []
+    for n in range(window_days - 1, size):
+        finished = done_sum[n + 1] - done_sum[n + 1 - window_days]
+        attempted = total_sum[n + 1] - total_sum[n + 1 - window_days]
+        series.append((span_start + _dt.timedelta(days=n), finished / attempted if attempted else None))
+    return series
+
+
+def _prefix_sums(values: Sequence[int]) -> List[int]:
+    sums = [0]
+    for value in values:
+        sums.append(sums[-1] + value)
+    return sums
+
+
+def failure_heatmap(
+    history: EventHistory,
+    by: str = "skill",
+    first: Optional[_dt.date] = None,
+    last: Optional[_dt.date] = None,
+) -> Dict[str, List[int]]:
+    """Failures and missed days per skill/tree, split by weekday (Mon..Sun)."""
+    window = history.window(first, last)
+    codes, names = _group_codes(history, by, window)
+    days = _column(history, "days", window)
+    outcomes = _column(history, "outcomes", window)
+    if np is not None:
+        mask = outcomes != COMPLETED
+        cells = codes[mask].astype(np.int64) * 7 + (days[mask].astype(np.int64) - 1) % 7
+        flat = _bincount(cells, len(names) * 7)
+    else:
+        cells = [code * 7 + (day - 1) % 7 for code, day, out in zip(codes, days, outcomes) if out != COMPLETED]
+        flat = _bincount(cells, len(names) * 7)
+    heatmap = {}
+    for idx, name in enumerate(names):
+        row = flat[idx * 7 : idx * 7 + 7]
+        if any(row):
+            heatmap[name] = row
+    return heatmap
+
+
+def render_stats(history: EventHistory, today: _dt.date, window_days: int = 90, by: str = "skill") -> str:
+    first = today - _dt.timedelta(days=window_days - 1)
+    lines = [f"PROGRESS ANALYTICS · last {window_days} days · by {by}", ""]
+    rates = completion_rates(history, by=by, first=first, last=today)
+    lines.append("Completion rates:")
+    if not rates:
+        lines.append("  — no recorded outcomes —")
+    for name, done, missed, rate in sorted(rates, key=lambda row: -row[3]):
+        lines.append(f"  {name:<28} {rate:6.1%}  ({done} done / {missed} failed)")
+    lines.append("")
+    lines.append("XP per week:")
+    for week, xp in xp_per_week(history, first=first, last=today)[-12:]:
+        lines.append(f"  {week.isoformat()}  {xp}")
+    rolling = [rate for _, rate in rolling_completion_rate(history, 7, today, today) if rate is not None]
+    if rolling:
+        lines.append(f"  7-day completion rate: {rolling[-1]:.1%}")
+    lines.append("")
+    lines.append("Failure heatmap:")
+    lines.append("  " + " " * 28 + " ".join(f"{day:>4}" for day in WEEKDAYS))
+    heatmap = failure_heatmap(history, by=by, first=first, last=today)
+    if not heatmap:
+        lines.append("  — no failures —")
+    for name, row in sorted(heatmap.items()):
+        lines.append(f"  {name:<28}" + " ".join(f"{count:>4}" for count in row))
+    return "\n".join(lines)
+
+
+__all__ = [
+    "completion_rates",
+    "xp_per_week",
+    "xp_curve",
+    "rolling_completion_rate",
+    "failure_heatmap",
+    "render_stats",
+]
@@ -0,0 +1,84 @@
+"""Cold storage for resolved quests in monthly gzip JSONL segments."""
+from __future__ import annotations
+
+import datetime as _dt
+import gzip
+import json
+import os
+from itertools import groupby
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .models import GameState, Quest, QuestStatus
+from .state import _quest_from_payload, _quest_to_payload
+
+ARCHIVE_HORIZON_DAYS = 30
+RESOLVED_STATUSES = (QuestStatus.COMPLETED, QuestStatus.FAILED)
+
+
+def archive_dir(state_path: Path) -> Path:
+    return state_path.with_name(state_path.stem + "_archive")
+
+
+def archivable_quests(state: GameState, horizon_days: int = ARCHIVE_HORIZON_DAYS) -> List[Quest]:
+    """Resolved quests whose deadline is more than ``horizon_days`` in the past."""
+    cutoff = state.current_day - _dt.timedelta(days=horizon_days)
+    quests: List[Quest] = []
+    for status in RESOLVED_STATUSES:
+        quests.extend(state.index.due_before(status, cutoff))
+    return quests
+
+
+def archive_quests(quests: List[Quest], state_path: Path) -> None:
+    """Append ``quests`` to their month segments (one gzip member per call).
+
+    Segments are written before the hot state drops the quests, so a crash in
+    between leaves a duplicate that readers resolve in favour of the hot copy.
+    """
+    if not quests:
+        return
+    directory = archive_dir(state_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    ordered = sorted(quests, key=lambda q: q.deadline)
+    for month, group in groupby(ordered, key=lambda q: q.deadline.strftime("%Y-%m")):
+        lines = "".join(
+            json.dumps(_quest_to_payload(q), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for q in group
+        )
+        with (directory / f"{month}.jsonl.gz").open("ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+                fh.write(lines.encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def archived_months(state_path: Path) -> List[str]:
+    directory = archive_dir(state_path)
+    if not directory.exists():
+        return []
+    return sorted(p.name[: -len(".jsonl.gz")] for p in directory.glob("*.jsonl.gz"))
+
+
+def iter_archived_quests(
+    state_path: Path, first_month: Optional[str] = None, last_month: Optional[str] = None
+) -> Iterator[Quest]:
+    """Lazily stream archived quests, oldest month first."""
+    directory = archive_dir(state_path)
+    for month in archived_months(state_path):
+        if first_month and month < first_month:
+            continue
+        if last_month and month > last_month:
+            break
+        with gzip.open(directory / f"{month}.jsonl.gz", "rt", encoding="utf-8") as fh:
+            for line in fh:
+                yield _quest_from_payload(json.loads(line))
+
+
+__all__ = [
+    "ARCHIVE_HORIZON_DAYS",
+    "archive_dir",
+    "archivable_quests",
+    "archive_quests",
+    "archived_months",
+    "iter_archived_quests",
+]
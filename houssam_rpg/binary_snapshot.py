@@ -0,0 +1,273 @@
+"""Compact binary snapshots: string tables and typed columns instead of JSON objects.
+
+Layout (little-endian)::
+
+    magic  schema:u16  header_len:u32  header (compact JSON)
+    then, for every section named in the header: length:u32  bytes
+
+The header carries the payload schema, the scalar state (player, day,
+version, recurrence rules), the enum value tables and the section list. Quests are stored
+column by column: repeated titles, skills, effort labels and notes become
+codes into one string table, dates become day ordinals, enums small ints,
+and uuid hex ids 16 raw bytes.
+Every column decodes with a single ``array.frombytes``.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import metrics
+from .models import Difficulty, EventHistory, GameState, QuestStatus, SkillTree, restore_quests
+from .state import (
+    SCHEMA_VERSION,
+    SnapshotFormat,
+    _player_from_payload,
+    _player_to_payload,
+    _rule_from_payload,
+    _rule_to_payload,
+    register_snapshot_format,
+    upgrade_payload,
+)
+
+MAGIC = b"HRPGSNAP"
+BINARY_SCHEMA = 1
+SUFFIXES = (".hrpg",)
+_PREAMBLE = struct.Struct("<8sHI")
+_LENGTH = struct.Struct("<I")
+_ID_BYTES = 16
+# (column, typecode) for the integer quest columns, in section order.
+_QUEST_COLUMNS = (
+    ("title", "I"),
+    ("tree", "B"),
+    ("skill", "I"),
+    ("difficulty", "B"),
+    ("estimated_effort", "I"),
+    ("xp_reward", "q"),
+    ("streak_impact", "q"),
+    ("deadline", "i"),
+    ("status", "B"),
+    ("urgency", "B"),
+    ("failure_count", "I"),
+    ("notes", "I"),
+)
+
+
+def encode_state(state: GameState) -> bytes:
+    quests = state.quests
+    strings: Dict[str, int] = {}
+    code = strings.setdefault
+    trees = {member: index for index, member in enumerate(SkillTree)}
+    difficulties = {member: index for index, member in enumerate(Difficulty)}
+    statuses = {member: index for index, member in enumerate(QuestStatus)}
+    values = {
+        "title": [code(q.title, len(strings)) for q in quests],
+        "tree": [trees[q.tree] for q in quests],
+        "skill": [code(q.skill, len(strings)) for q in quests],
+        "difficulty": [difficulties[q.difficulty] for q in quests],
+        "estimated_effort": [code(q.estimated_effort, len(strings)) for q in quests],
+        "xp_reward": [q.xp_reward for q in quests],
+        "streak_impact": [q.streak_impact for q in quests],
+        "deadline": [q.deadline.toordinal() for q in quests],
+        "status": [statuses[q.status] for q in quests],
+        "urgency": [1 if q.urgency else 0 for q in quests],
+        "failure_count": [q.failure_count for q in quests],
+        # 0 is "no note"; real notes are shifted up by one.
+        "notes": [0 if q.notes is None else code(q.notes, len(strings)) + 1 for q in quests],
+    }
+    overflow: Dict[str, Dict[str, int]] = {}
+    sections: List[Tuple[str, str, bytes]] = []
+    for name, typecode in _QUEST_COLUMNS:
+        sections.append((name, typecode, _pack(typecode, values[name], overflow.setdefault(name, {}))))
+    id_blob, odd_ids = _pack_ids([q.id for q in quests])
+    sections.append(("id", "", id_blob))
+    table = list(strings)
+    sections.append(("string_sizes", "I", _pack("I", [len(s) for s in table], {})))
+    sections.append(("strings", "", "".join(table).encode("utf-8")))
+    history = state.history
+    for name, data in history.column_bytes().items():
+        sections.append((f"history.{name}", "", data))
+
+    header = {
+        "schema": SCHEMA_VERSION,
+        "version": state.version,
+        "current_day": state.current_day.toordinal(),
+        "player": _player_to_payload(state.player),
+        "rules": [_rule_to_payload(rule) for rule in state.rules],
+        "quests": len(quests),
+        "enums": {
+            "tree": [member.value for member in trees],
+            "difficulty": [member.value for member in difficulties],
+            "status": [member.value for member in statuses],
+        },
+        "odd_ids": odd_ids,
+        "overflow": {name: rows for name, rows in overflow.items() if rows},
+        "history_skills": list(history.skill_names),
+        "sections": [[name, typecode] for name, typecode, _ in sections],
+    }
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    parts = [_PREAMBLE.pack(MAGIC, BINARY_SCHEMA, len(head)), head]
+    for _, _, data in sections:
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_state(raw: bytes) -> GameState:
+    magic, schema, head_len = _PREAMBLE.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a binary state snapshot.")
+    decoder = _DECODERS.get(schema)
+    if decoder is None:
+        raise ValueError(f"Binary snapshot schema {schema} is not supported (newest is {BINARY_SCHEMA}).")
+    start = _PREAMBLE.size
+    return decoder(json.loads(raw[start : start + head_len]), raw, start + head_len)
+
+
+def _decode_v1(header: Dict, raw: bytes, offset: int) -> GameState:
+    view = memoryview(raw)
+    sections: Dict[str, object] = {}
+    for name, typecode in header["sections"]:
+        (size,) = _LENGTH.unpack_from(raw, offset)
+        offset += _LENGTH.size
+        data = view[offset : offset + size]
+        offset += size
+        sections[name] = _unpack(typecode, data) if typecode else bytes(data)
+    count = header["quests"]
+    overflow = header.get("overflow", {})
+    columns = {name: _with_overflow(sections[name], overflow.get(name)) for name, _ in _QUEST_COLUMNS}
+
+    text = sections["strings"].decode("utf-8")
+    ends = list(accumulate(sections["string_sizes"]))
+    table = [sys.intern(text[a:b]) for a, b in zip([0] + ends, ends)]
+    enums = header["enums"]
+    trees = [SkillTree(v) for v in enums["tree"]]
+    difficulties = [Difficulty(v) for v in enums["difficulty"]]
+    statuses = [QuestStatus(v) for v in enums["status"]]
+    dates = {ordinal: _dt.date.fromordinal(ordinal) for ordinal in set(columns["deadline"])}
+    notes_table = [None] + table
+
+    hex_ids = sections["id"].hex()
+    ids = [hex_ids[i : i + 32] for i in range(0, 32 * count, 32)]
+    for row, quest_id in header.get("odd_ids", {}).items():
+        ids[int(row)] = quest_id
+
+    quests = restore_quests(
+        count,
+        {
+            "title": [table[c] for c in columns["title"]],
+            "tree": [trees[c] for c in columns["tree"]],
+            "skill": [table[c] for c in columns["skill"]],
+            "difficulty": [difficulties[c] for c in columns["difficulty"]],
+            "estimated_effort": [table[c] for c in columns["estimated_effort"]],
+            "xp_reward": columns["xp_reward"],
+            "streak_impact": columns["streak_impact"],
+            "deadline": [dates[o] for o in columns["deadline"]],
+            "status": [statuses[c] for c in columns["status"]],
+            "id": ids,
+            "urgency": [c == 1 for c in columns["urgency"]],
+            "failure_count": columns["failure_count"],
+            "notes": [notes_table[c] for c in columns["notes"]],
+        },
+    )
+    metrics.count("quests_decoded", len(quests))
+    history = EventHistory.from_columns(
+        header.get("history_skills", []),
+        {name[len("history.") :]: data for name, data in sections.items() if name.startswith("history.")},
+    )
+    player = header["player"]
+    # Quests live in columns; only the player section follows payload migrations.
+    # Snapshots from before the header was stamped were written at schema 2.
+    schema = header.get("schema", 2)
+    if schema < SCHEMA_VERSION:
+        partial = {"schema": schema, "player": player, "history": history.to_payload()}
+        player = upgrade_payload(partial)["player"]
+    return GameState(
+        player=_player_from_payload(player),
+        quests=quests,
+        current_day=_dt.date.fromordinal(header["current_day"]),
+        version=header.get("version", 0),
+        history=history,
+        rules=[_rule_from_payload(rule) for rule in header.get("rules", [])],
+    )
+
+
+# Older binary schemas keep their decoder here so existing files stay readable.
+_DECODERS: Dict[int, Callable[[Dict, bytes, int], GameState]] = {1: _decode_v1}
+
+
+def _pack(typecode: str, values: Sequence[int], overflow: Dict[str, int]) -> bytes:
+    """Little-endian column bytes; values that do not fit go to ``overflow`` by row."""
+    try:
+        column = array(typecode, values)
+    except OverflowError:
+        column = array(typecode)
+        for row, value in enumerate(values):
+            try:
+                column.append(value)
+            except OverflowError:
+                column.append(0)
+                overflow[str(row)] = value
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(typecode: str, data: memoryview) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _with_overflow(column: array, overflow: Optional[Dict[str, int]]) -> Sequence[int]:
+    if not overflow:
+        return column
+    values = column.tolist()
+    for row, value in overflow.items():
+        values[int(row)] = value
+    return values
+
+
+def _pack_ids(ids: List[str]) -> Tuple[bytes, Dict[str, str]]:
+    """Pack lowercase 32-digit hex ids as raw bytes; anything else goes by row."""
+    joined = "".join(ids)
+    if len(joined) == 32 * len(ids) and joined == joined.lower():
+        try:
+            blob = bytes.fromhex(joined)
+        except ValueError:
+            blob = b""
+        # fromhex skips whitespace, so a short result means some id was not hex.
+        if len(blob) == _ID_BYTES * len(ids):
+            return blob, {}
+    blob = bytearray()
+    odd: Dict[str, str] = {}
+    for row, quest_id in enumerate(ids):
+        packed = _hex_id(quest_id)
+        if packed is None:
+            odd[str(row)] = quest_id
+            packed = bytes(_ID_BYTES)
+        blob += packed
+    return bytes(blob), odd
+
+
+def _hex_id(quest_id: str) -> Optional[bytes]:
+    if len(quest_id) != 32 or quest_id != quest_id.lower():
+        return None
+    try:
+        packed = bytes.fromhex(quest_id)
+    except ValueError:
+        return None
+    return packed if len(packed) == _ID_BYTES else None
+
+
+register_snapshot_format(SnapshotFormat("binary", MAGIC, SUFFIXES, encode_state, decode_state))
+
+
+__all__ = ["BINARY_SCHEMA", "MAGIC", "decode_state", "encode_state"]
@@ -0,0 +1,85 @@
+"""Pre-rendered morning briefings for the login path.
+
+The briefing only changes when the state does, so every committed save
+renders it once into ``<state>.briefing``::
+
+    HRPG-BRIEFING <version, 20 digits> <current day>
+    <briefing text>
+
+The version field matches the stamp in ``<state>.lock``. A reader that
+finds both equal can print the text as is, without importing this package
+or parsing the state; ``main.py morning --cached`` and
+``scripts/houssam_morning.sh`` do exactly that.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from .engine import GameEngine
+from .locking import VERSION_WIDTH, read_version
+from .models import GameState
+from .state import register_save_hook
+
+BRIEFING_MAGIC = "HRPG-BRIEFING"
+
+
+def briefing_path(target: Path) -> Path:
+    return target.with_name(target.name + ".briefing")
+
+
+def render_briefing(state: GameState) -> str:
+    return "\n".join(GameEngine(state, path=None).iter_morning())
+
+
+def write_briefing(state: GameState, target: Path) -> None:
+    """Save hook: render the briefing for ``state`` as committed at ``state.version``.
+
+    Working sets that hold only some quests are skipped; the stale artifact
+    then simply fails the version check.
+    """
+    if not state.partial:
+        _write_artifact(state, target)
+
+
+def _write_artifact(state: GameState, target: Path) -> None:
+    # The artifact is a cache: renamed into place without an fsync, and write errors are ignored.
+    head = f"{BRIEFING_MAGIC} {state.version:0{VERSION_WIDTH}d} {state.current_day.isoformat()}\n"
+    path = briefing_path(target)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(head + render_briefing(state) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def read_briefing(target: Path) -> Optional[str]:
+    """The cached briefing text if it matches the committed version, else ``None``."""
+    try:
+        with briefing_path(target).open("r", encoding="utf-8") as fh:
+            head = fh.readline().split()
+            body = fh.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    version = read_version(target)
+    if len(head) != 3 or head[0] != BRIEFING_MAGIC or version is None or head[1] != f"{version:0{VERSION_WIDTH}d}":
+        return None
+    return body
+
+
+def refresh_briefing(state: GameState, target: Path) -> None:
+    """Rewrite the artifact after a cache miss.
+
+    ``state`` must hold every quest the briefing shows (the full state or the
+    morning working set) and is only used if it is the committed version.
+    """
+    if read_version(target) == state.version:
+        _write_artifact(state, target)
+
+
+register_save_hook(write_briefing)
+
+
+__all__ = ["BRIEFING_MAGIC", "briefing_path", "read_briefing", "refresh_briefing", "render_briefing", "write_briefing"]
@@ -0,0 +1,392 @@
+"""Quest blueprint catalog loaded from JSON/JSONL files and indexed for planning."""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import metrics
+from .journal import atomic_write_bytes
+from .models import Difficulty, SkillTree
+from .state import quest_templates
+
+CATALOG_NAMES = ("quest_templates.jsonl", "quest_templates.json")
+CACHE_FORMAT = 2
+TREES = tuple(SkillTree)
+DIFFICULTIES = tuple(Difficulty)
+_TREE_CODES = {key: code for code, member in enumerate(TREES) for key in (member, member.value, member.name)}
+_DIFFICULTY_CODES = {
+    key: code for code, member in enumerate(DIFFICULTIES) for key in (member, member.value, member.name)
+}
+_TOKEN = re.compile(r"\w+")
+_EFFORT_PART = re.compile(r"(\d+)\s*(h|hr|hrs|hours?|m|min|mins|minutes?)\b", re.IGNORECASE)
+_NO_EFFORT = -1
+# TemplateCatalog attributes kept in the JSON cache: string lists, typed
+# arrays, and row indexes keyed by code or skill.
+_CACHED_LISTS = ("ids", "titles", "skills", "efforts", "_sorted_ids", "_vocabulary")
+_CACHED_ARRAYS = {
+    "trees": "B",
+    "difficulties": "B",
+    "effort_minutes": "i",
+    "xp_rewards": "q",
+    "_effort_keys": "i",
+    "_effort_rows": "I",
+    "_posting_rows": "I",
+    "_posting_starts": "I",
+}
+_CACHED_INDEXES = ("_by_tree", "_by_difficulty", "_by_skill")
+
+
+@dataclass(frozen=True, slots=True)
+class QuestTemplate:
+    id: str
+    title: str
+    tree: SkillTree
+    skill: str
+    difficulty: Difficulty
+    estimated_effort: str
+    xp_reward: int
+
+    @property
+    def effort_minutes(self) -> Optional[int]:
+        return parse_effort(self.estimated_effort)
+
+
+def parse_effort(text: str) -> Optional[int]:
+    """Turn effort strings such as ``"35 minutes"`` or ``"1h 30m"`` into minutes."""
+    total = 0
+    matched = False
+    for amount, unit in _EFFORT_PART.findall(text):
+        total += int(amount) * (60 if unit[0].lower() == "h" else 1)
+        matched = True
+    if not matched and text.strip().isdigit():
+        return int(text)
+    return total if matched else None
+
+
+def template_id(tree: SkillTree, skill: str, title: str) -> str:
+    """Derive a stable id for catalog entries that do not carry one."""
+    digest = hashlib.sha1(f"{tree.value}|{skill}|{title}".encode("utf-8")).hexdigest()
+    return digest[:10]
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class TemplateCatalog:
+    """Blueprints stored column-wise with lookups by id, tree, skill, difficulty,
+    effort and keyword.
+
+    Every index holds ascending row numbers, so filters are answered by
+    intersecting the shortest candidate lists instead of scanning the whole
+    catalog, and :class:`QuestTemplate` objects are only built for the rows a
+    caller actually receives.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()) -> None:
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.skills: List[str] = []
+        self.efforts: List[str] = []
+        self.trees = array("B")
+        self.difficulties = array("B")
+        self.effort_minutes = array("i")
+        self.xp_rewards = array("q")
+        self._rows_by_id: Dict[str, int] = {}
+        minutes_for: Dict[str, int] = {}
+        for entry in entries:
+            self._append(entry, minutes_for)
+        self._build_indexes()
+
+    def _append(self, entry: Dict[str, Any], minutes_for: Dict[str, int]) -> None:
+        try:
+            tree = _TREE_CODES[entry["tree"]]
+        except KeyError:
+            raise ValueError(f"unknown skill tree {entry.get('tree')!r}") from None
+        try:
+            difficulty = _DIFFICULTY_CODES[entry.get("difficulty", Difficulty.STANDARD)]
+        except KeyError:
+            raise ValueError(f"unknown difficulty {entry.get('difficulty')!r}") from None
+        skill = sys.intern(str(entry["skill"]))
+        title = str(entry["title"])
+        effort = sys.intern(str(entry.get("estimated_effort", "")))
+        xp = int(entry["xp_reward"])
+        ident = str(entry.get("id") or template_id(TREES[tree], skill, title))
+        if ident in self._rows_by_id:
+            raise ValueError(f"duplicate template id {ident!r}")
+        minutes = minutes_for.get(effort)
+        if minutes is None:
+            parsed = parse_effort(effort)
+            minutes = minutes_for[effort] = _NO_EFFORT if parsed is None else parsed
+        self._rows_by_id[ident] = len(self.ids)
+        self.ids.append(ident)
+        self.titles.append(title)
+        self.skills.append(skill)
+        self.efforts.append(effort)
+        self.trees.append(tree)
+        self.difficulties.append(difficulty)
+        self.effort_minutes.append(minutes)
+        self.xp_rewards.append(xp)
+
+    def _build_indexes(self) -> None:
+        self._by_tree: Dict[int, array] = {}
+        self._by_difficulty: Dict[int, array] = {}
+        self._by_skill: Dict[str, array] = {}
+        postings: Dict[str, List[int]] = {}
+        tree_words = [_tokens(tree.value) for tree in TREES]
+        skill_words: Dict[str, List[str]] = {}
+        for row, (title, skill, tree, difficulty) in enumerate(
+            zip(self.titles, self.skills, self.trees, self.difficulties)
+        ):
+            self._by_tree.setdefault(tree, array("I")).append(row)
+            self._by_difficulty.setdefault(difficulty, array("I")).append(row)
+            self._by_skill.setdefault(skill.lower(), array("I")).append(row)
+            words = skill_words.get(skill)
+            if words is None:
+                words = skill_words[skill] = _tokens(skill)
+            for token in set(_tokens(title)).union(words, tree_words[tree]):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = []
+                posting.append(row)
+        ranked = sorted(
+            (minutes, row) for row, minutes in enumerate(self.effort_minutes) if minutes != _NO_EFFORT
+        )
+        self._effort_keys = array("i", (minutes for minutes, _ in ranked))
+        self._effort_rows = array("I", (row for _, row in ranked))
+        self._sorted_ids = sorted(self._rows_by_id)
+        # Postings laid out back to back in vocabulary order: the rows for
+        # vocabulary[i] are _posting_rows[_posting_starts[i]:_posting_starts[i + 1]].
+        self._vocabulary = sorted(postings)
+        self._posting_rows = array("I")
+        self._posting_starts = array("I", [0])
+        for token in self._vocabulary:
+            self._posting_rows.extend(postings[token])
+            self._posting_starts.append(len(self._posting_rows))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> QuestTemplate:
+        return QuestTemplate(
+            id=self.ids[row],
+            title=self.titles[row],
+            tree=TREES[self.trees[row]],
+            skill=self.skills[row],
+            difficulty=DIFFICULTIES[self.difficulties[row]],
+            estimated_effort=self.efforts[row],
+            xp_reward=self.xp_rewards[row],
+        )
+
+    def __iter__(self) -> Iterator[QuestTemplate]:
+        for row in range(len(self)):
+            yield self[row]
+
+    @classmethod
+    def builtin(cls) -> "TemplateCatalog":
+        return cls(quest_templates())
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TemplateCatalog":
+        """Parse a JSON list (or ``{"templates": [...]}``) or a JSONL file."""
+        text = path.read_text(encoding="utf-8")
+        metrics.count("bytes_read", len(text))
+        if path.suffix == ".jsonl":
+            lines = [line for line in text.splitlines() if line.strip()]
+            try:
+                # One decode for the whole file; fall back per line to locate errors.
+                entries = json.loads("[" + ",".join(lines) + "]")
+            except ValueError:
+                entries = [_decode_line(path, n, line) for n, line in enumerate(lines, 1)]
+        else:
+            entries = json.loads(text)
+            if isinstance(entries, dict):
+                entries = entries.get("templates", [])
+        catalog = cls()
+        minutes_for: Dict[str, int] = {}
+        for n, entry in enumerate(entries, 1):
+            try:
+                catalog._append(entry, minutes_for)
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"{path}: entry {n}: invalid template ({exc})") from None
+        catalog._build_indexes()
+        return catalog
+
+    def to_cache(self) -> Dict[str, Any]:
+        """Columns and indexes as plain JSON values."""
+        payload: Dict[str, Any] = {name: getattr(self, name) for name in _CACHED_LISTS}
+        payload.update((name, getattr(self, name).tolist()) for name in _CACHED_ARRAYS)
+        payload.update(
+            (name, [[key, rows.tolist()] for key, rows in getattr(self, name).items()]) for name in _CACHED_INDEXES
+        )
+        return payload
+
+    @classmethod
+    def from_cache(cls, payload: Dict[str, Any]) -> "TemplateCatalog":
+        """Rebuild a catalog written by :meth:`to_cache` without re-indexing it."""
+        catalog = cls.__new__(cls)
+        for name in _CACHED_LISTS:
+            setattr(catalog, name, list(payload[name]))
+        catalog.skills = [sys.intern(skill) for skill in catalog.skills]
+        catalog.efforts = [sys.intern(effort) for effort in catalog.efforts]
+        for name, typecode in _CACHED_ARRAYS.items():
+            setattr(catalog, name, array(typecode, payload[name]))
+        for name in _CACHED_INDEXES:
+            setattr(catalog, name, {key: array("I", rows) for key, rows in payload[name]})
+        catalog._rows_by_id = {ident: row for row, ident in enumerate(catalog.ids)}
+        return catalog
+
+    def get(self, template_id: str) -> Optional[QuestTemplate]:
+        row = self._rows_by_id.get(template_id)
+        return None if row is None else self[row]
+
+    def find(self, id_prefix: str) -> List[QuestTemplate]:
+        """Templates whose id starts with ``id_prefix`` (an exact id wins)."""
+        exact = self.get(id_prefix)
+        if exact is not None:
+            return [exact]
+        start = bisect.bisect_left(self._sorted_ids, id_prefix)
+        matches = []
+        for ident in self._sorted_ids[start:]:
+            if not ident.startswith(id_prefix):
+                break
+            matches.append(self[self._rows_by_id[ident]])
+        return matches
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[QuestTemplate]:
+        """Templates matching every word of ``text``; words match as prefixes."""
+        rows = self._keyword_rows(text)
+        return [self[row] for row in (rows if limit is None else rows[:limit])]
+
+    def select(
+        self,
+        tree: Optional[SkillTree] = None,
+        skill: Optional[str] = None,
+        difficulty: Optional[Difficulty] = None,
+        max_effort: Optional[int] = None,
+        keywords: Optional[str] = None,
+    ) -> List[int]:
+        """Row numbers satisfying every given filter, in catalog order."""
+        candidates: List[Sequence[int]] = []
+        if tree is not None:
+            candidates.append(self._by_tree.get(_TREE_CODES[tree], ()))
+        if skill is not None:
+            candidates.append(self._by_skill.get(skill.lower(), ()))
+        if difficulty is not None:
+            candidates.append(self._by_difficulty.get(_DIFFICULTY_CODES[difficulty], ()))
+        if max_effort is not None:
+            end = bisect.bisect_right(self._effort_keys, max_effort)
+            candidates.append(sorted(self._effort_rows[:end]))
+        if keywords:
+            candidates.append(self._keyword_rows(keywords))
+        if not candidates:
+            return list(range(len(self)))
+        return _intersect(candidates)
+
+    def _keyword_rows(self, text: str) -> List[int]:
+        lists = []
+        for word in _tokens(text):
+            start = bisect.bisect_left(self._vocabulary, word)
+            end = start
+            while end < len(self._vocabulary) and self._vocabulary[end].startswith(word):
+                end += 1
+            rows = self._posting_rows[self._posting_starts[start] : self._posting_starts[end]]
+            lists.append(rows if end - start == 1 else sorted(set(rows)))
+        return _intersect(lists) if lists else []
+
+
+def _decode_line(path: Path, lineno: int, line: str) -> Dict[str, Any]:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"{path}: entry {lineno}: {exc}") from None
+
+
+def _intersect(lists: List[Sequence[int]]) -> List[int]:
+    ordered = sorted(lists, key=len)
+    result = list(ordered[0])
+    for other in ordered[1:]:
+        if not result:
+            break
+        members = set(other)
+        result = [row for row in result if row in members]
+    return result
+
+
+def catalog_path(state_path: Path) -> Optional[Path]:
+    """The catalog file kept beside ``state_path``, if there is one."""
+    for name in CATALOG_NAMES:
+        candidate = state_path.with_name(name)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache")
+
+
+_LOADED: Dict[Path, Tuple[Tuple[int, int], TemplateCatalog]] = {}
+_BUILTIN: List[TemplateCatalog] = []
+
+
+def load_catalog(path: Optional[Path] = None) -> TemplateCatalog:
+    """Return the parsed catalog for ``path``, reparsing only when the file changed.
+
+    Parsed catalogs are kept in memory and written as JSON to
+    ``<path>.cache``; both are keyed by the file's mtime and size. Without a file the built-in
+    blueprints are used.
+    """
+    if path is None:
+        if not _BUILTIN:
+            _BUILTIN.append(TemplateCatalog.builtin())
+        return _BUILTIN[0]
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    loaded = _LOADED.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+    catalog = _read_cache(cache_path(path), stamp)
+    if catalog is None:
+        catalog = TemplateCatalog.from_file(path)
+        try:
+            cache = {"format": CACHE_FORMAT, "stamp": stamp, "catalog": catalog.to_cache()}
+            atomic_write_bytes(cache_path(path), json.dumps(cache, separators=(",", ":")).encode("utf-8"))
+        except OSError:
+            pass  # read-only catalog directory: parse again next time
+    _LOADED[path] = (stamp, catalog)
+    return catalog
+
+
+def _read_cache(target: Path, stamp: Tuple[int, int]) -> Optional[TemplateCatalog]:
+    try:
+        data = target.read_bytes()
+    except OSError:
+        return None
+    metrics.count("bytes_read", len(data))
+    try:
+        cache = json.loads(data)
+        if cache["format"] != CACHE_FORMAT or tuple(cache["stamp"]) != stamp:
+            return None
+        return TemplateCatalog.from_cache(cache["catalog"])
+    except (KeyError, TypeError, ValueError, OverflowError):  # stale layout or a torn file; rebuild from the source
+        return None
+
+
+__all__ = [
+    "QuestTemplate",
+    "TemplateCatalog",
+    "cache_path",
+    "catalog_path",
+    "load_catalog",
+    "parse_effort",
+    "template_id",
+]
@@ -0,0 +1,221 @@
+"""Resident daemon that serves CLI commands over a Unix domain socket."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .engine import GameEngine
+from .locking import StateConflictError, read_version
+from .models import GameState
+from .state import STATE_PATH, load_game_state, merge_events, save_game_state
+from .undo import discard_pending
+
+SAVE_DELAY_SECONDS = 0.5
+CONNECT_TIMEOUT_SECONDS = 2.0
+# Output lines sent per reply message while a command's output streams back.
+STREAM_CHUNK_LINES = 256
+
+Output = Union[str, Iterable[str]]
+# Called with the resident engine, the command line and the caller's working
+# directory, which relative paths in the command line are resolved against.
+Handler = Callable[[GameEngine, List[str], Path], Tuple[int, Output]]
+
+
+def socket_path(state_path: Path | None = None) -> Path:
+    target = state_path or STATE_PATH
+    return target.with_name(target.name + ".sock")
+
+
+class CoalescingSaver:
+    """Engine ``saver`` that batches events and flushes them shortly afterwards.
+
+    Every event queued before a flush is merged into one journal record, so a
+    burst of commands costs a single append and fsync. The command lines that
+    queued them are kept too: if another process committed in the meantime,
+    the state is reloaded and those commands are run again on top of it, so
+    their effects (XP grants included) add to the other writer's instead of
+    overwriting them. A flush that fails keeps everything queued for the next
+    one and is reported in every reply until a save succeeds.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        delay: float = SAVE_DELAY_SECONDS,
+        handler: Optional[Handler] = None,
+    ) -> None:
+        self.loop = loop
+        self.delay = delay
+        self.handler = handler
+        self.engine: Optional[GameEngine] = None
+        # Why the last flush failed, or None once a save goes through.
+        self.failure: Optional[str] = None
+        self._pending: List[Dict] = []
+        self._commands: List[Tuple[List[str], Path]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def __call__(self, state: GameState, path: Path | None, event: Dict) -> None:
+        self._pending.append(event)
+        if self._timer is None:
+            self._timer = self.loop.call_later(self.delay, self.flush)
+
+    def run(self, argv: List[str], cwd: Path) -> Tuple[int, Output]:
+        """Run one forwarded command line against the resident engine."""
+        self.refresh()
+        queued = len(self._pending)
+        code, output = self.handler(self.engine, argv, cwd)
+        if len(self._pending) > queued:
+            self._commands.append((argv, cwd))
+        if self.failure is not None:
+            warning = f"daemon error: {len(self._pending)} changes not saved yet: {self.failure}"
+            lines = [output] if isinstance(output, str) else output
+            code, output = 1, itertools.chain(lines, [warning])
+        return code, output
+
+    def refresh(self) -> None:
+        """Pick up commits other processes made since the resident state was loaded."""
+        engine = self.engine
+        on_disk = read_version(engine.path or STATE_PATH)
+        if on_disk is None or on_disk == engine.state.version:
+            return
+        if self._pending:
+            self.flush()
+        else:
+            engine.state = load_game_state(engine.path)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self.engine is None:
+            return
+        engine = self.engine
+        events, self._pending = self._pending, []
+        commands, self._commands = self._commands, []
+        try:
+            try:
+                save_game_state(engine.state, engine.path, event=merge_events(events))
+            except StateConflictError:
+                events = self._rerun(commands)
+                if events:
+                    save_game_state(engine.state, engine.path, event=merge_events(events))
+        except Exception as exc:  # keep the changes queued for the next flush
+            self._pending[:0] = events
+            self._commands[:0] = commands
+            self.failure = str(exc) or type(exc).__name__
+            return
+        self.failure = None
+
+    def _rerun(self, commands: List[Tuple[List[str], Path]]) -> List[Dict]:
+        """Reload the state and run ``commands`` again on top of it, returning their events."""
+        engine = self.engine
+        discard_pending(engine.path or STATE_PATH)
+        engine.state = load_game_state(engine.path)
+        events: List[Dict] = []
+        engine.saver = lambda state, path, event: events.append(event)
+        try:
+            for argv, cwd in commands:
+                try:
+                    self.handler(engine, argv, cwd)
+                except Exception:  # already answered; a command that no longer applies is dropped
+                    pass
+        finally:
+            engine.saver = self
+        return events
+
+
+async def _serve(state_path: Path | None, handler: Handler, player_name: Optional[str]) -> None:
+    loop = asyncio.get_running_loop()
+    saver = CoalescingSaver(loop, handler=handler)
+    engine = GameEngine(load_game_state(state_path, player_name=player_name), path=state_path, saver=saver)
+    saver.engine = engine
+    sock = socket_path(state_path)
+    if sock.exists():
+        sock.unlink()
+
+    # Held from running a command until its output is sent, so a streamed
+    # report never sees another command's mutations halfway through.
+    busy = asyncio.Lock()
+
+    def send(writer: asyncio.StreamWriter, reply: Dict) -> None:
+        writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = await reader.readline()
+        async with busy:
+            try:
+                request = json.loads(request)
+                code, output = saver.run(list(request["argv"]), Path(request.get("cwd") or os.getcwd()))
+                lines = iter([output] if isinstance(output, str) else output)
+                while True:
+                    chunk = list(itertools.islice(lines, STREAM_CHUNK_LINES))
+                    if not chunk:
+                        break
+                    send(writer, {"lines": chunk})
+                    await writer.drain()
+            except Exception as exc:  # keep serving other clients
+                code = 1
+                send(writer, {"lines": [f"daemon error: {exc}"]})
+            send(writer, {"code": code})
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=str(sock))
+    stop = loop.create_future()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, lambda: stop.done() or stop.set_result(None))
+    try:
+        async with server:
+            await stop
+    finally:
+        saver.flush()
+        if sock.exists():
+            sock.unlink()
+    if saver.failure is not None:
+        raise RuntimeError(f"Could not save the pending changes: {saver.failure}")
+
+
+def serve(state_path: Path | None, handler: Handler, player_name: Optional[str] = None) -> None:
+    """Keep the state resident and answer forwarded commands until SIGINT/SIGTERM."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Daemon mode requires Unix domain sockets.")
+    asyncio.run(_serve(state_path, handler, player_name))
+
+
+def forward(state_path: Path | None, argv: List[str], out: Optional[IO[str]] = None) -> Optional[int]:
+    """Run ``argv`` on a running daemon and return its exit code; ``None`` means no daemon is listening.
+
+    Output is copied to ``out`` (stdout by default) as it arrives. Relative
+    paths in ``argv`` are resolved against this process's working directory.
+    """
+    sock_file = socket_path(state_path)
+    if not hasattr(socket, "AF_UNIX") or not sock_file.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.settimeout(CONNECT_TIMEOUT_SECONDS)
+            client.connect(str(sock_file))
+        except (ConnectionRefusedError, FileNotFoundError, socket.timeout):
+            return None
+        client.settimeout(None)
+        client.sendall(json.dumps({"argv": argv, "cwd": os.getcwd()}).encode("utf-8") + b"\n")
+        stream = out or sys.stdout
+        with client.makefile("rb") as replies:
+            for raw in replies:
+                reply = json.loads(raw)
+                if "code" in reply:
+                    return reply["code"]
+                stream.write("\n".join(reply["lines"]) + "\n")
+    stream.write("daemon error: the daemon closed the connection before finishing.\n")
+    return 1
+
+
+__all__ = ["SAVE_DELAY_SECONDS", "CoalescingSaver", "socket_path", "serve", "forward"]
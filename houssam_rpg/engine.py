@@ -2,59 +2,104 @@
 from __future__ import annotations
 
 import datetime as _dt
-from collections import defaultdict
-from typing import List
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from .models import GameState, Quest, QuestStatus
-from .state import award_xp, quest_templates, save_game_state
+from .achievements import BOOK, Achievement, AchievementBook, AchievementEvent
+from .analytics import render_stats
+from .archive import ARCHIVE_HORIZON_DAYS, archivable_quests, archive_dir, archive_quests, iter_archived_quests
+from .catalog import QuestTemplate, TemplateCatalog, catalog_path, load_catalog
+from .export import iter_export
+from .importer import CONFLICT_POLICIES, iter_import_rows, quest_from_record
+from .models import Difficulty, GameState, Quest, QuestStatus, RecurrenceRule, SkillTrackProgress, SkillTree
+from .render import Pager
+from .state import STATE_PATH, apply_event, award_xp, make_event, merge_events, save_game_state
+from .undo import UndoRecorder, discard_pending, peek_step, record_move, record_step, record_sync, undo_depth
 
 DIVIDER = "═" * 72
+CALENDAR_WEEKS = 4
+MAX_IMPORT_PROBLEMS = 20
+_CALENDAR_MARKS = str.maketrans("01", "·■")
 
 
 class GameEngine:
     """Facade that orchestrates the life-RPG loop."""
 
-    def __init__(self, state: GameState) -> None:
+    def __init__(
+        self,
+        state: GameState,
+        path: Path | None = None,
+        archive_horizon_days: int = ARCHIVE_HORIZON_DAYS,
+        saver: Callable[[GameState, Path | None, Dict], None] = save_game_state,
+        templates_path: Path | None = None,
+        book: AchievementBook = BOOK,
+        record_undo: bool = True,
+    ) -> None:
         self.state = state
+        self.path = path
+        self.archive_horizon_days = archive_horizon_days
+        self.templates_path = templates_path
+        # Called with (state, path, event) after every mutation.
+        self.saver = saver
+        self.book = book
+        # Achievement counters moved since the last commit, and unlocks not yet reported.
+        self._touched: Set[str] = set()
+        self._unlocked: List[Achievement] = []
+        # Before-images for the undo history; None turns recording off.
+        self._undo: Optional[UndoRecorder] = UndoRecorder() if record_undo else None
+        self._batching = False
+        # Quests the last advance_to failed and escalated, collapsed rule occurrences included.
+        self.escalated = 0
 
     # ------------------------------------------------------------------
     # Morning startup
     # ------------------------------------------------------------------
-    def morning_briefing(self) -> str:
+    def morning_briefing(self, **options) -> str:
+        return "\n".join(self.iter_morning(**options))
+
+    def iter_morning(
+        self, tree: Optional[SkillTree] = None, limit: Optional[int] = None, page: int = 1
+    ) -> Iterator[str]:
+        """Yield the briefing line by line; ``limit``/``page`` select one page of quests."""
         today = self.state.current_day
-        quests = self.state.quests_due_today(today)
-        overdue = self.state.overdue_quests(today)
-        banner = self._rank_banner()
-        lines = [banner, DIVIDER, f"DAWN REPORT · {today.isoformat()}".center(72), DIVIDER]
-        if overdue:
-            lines.append("⚠ URGENT QUESTS FROM YESTERDAY ⚠")
-            for quest in overdue:
-                lines.append(self._format_quest_line(quest))
-            lines.append(DIVIDER)
-        if quests:
-            lines.append("TODAY'S ACTIVE MISSIONS")
-            for quest in quests:
-                lines.append(self._format_quest_line(quest))
+        pager = Pager(limit, page)
+        yield self._rank_banner()
+        yield DIVIDER
+        yield f"DAWN REPORT · {today.isoformat()}".center(72)
+        yield DIVIDER
+        overdue = pager.take(self._in_tree(self.state.overdue_quests(today), tree))
+        first = next(overdue, None)
+        if first is not None:
+            yield "⚠ URGENT QUESTS FROM YESTERDAY ⚠"
+            yield self._format_quest_line(first)
+            yield from map(self._format_quest_line, overdue)
+            yield DIVIDER
+        due = pager.take(self._in_tree(self.state.quests_due_today(today), tree))
+        first = next(due, None)
+        if first is not None:
+            yield "TODAY'S ACTIVE MISSIONS"
+            yield self._format_quest_line(first)
+            yield from map(self._format_quest_line, due)
+        elif pager.paginated:
+            yield "No more quests on this page."
         else:
-            lines.append("No quests scheduled. Use night planning to prime the next assault.")
-        return "\n".join(lines)
+            yield "No quests scheduled. Use night planning to prime the next assault."
+        if pager.footer():
+            yield pager.footer()
 
     # ------------------------------------------------------------------
     # Quest interactions
     # ------------------------------------------------------------------
     def complete_quest(self, quest_id: str) -> str:
         quest = self._find_quest(quest_id)
-        if not quest:
-            return "Quest not found."
+        if not isinstance(quest, Quest):
+            return quest
         if quest.status == QuestStatus.COMPLETED:
             return "Quest already completed."
-        quest.status = QuestStatus.COMPLETED
-        quest.urgency = False
-        quest.failure_count = 0
-        titles = award_xp(self.state, quest.xp_reward)
-        track = self.state.player.ensure_track(quest.skill)
-        track.register_completion(self.state.current_day)
-        save_game_state(self.state)
+        track, row = self._mark_completed(quest)
+        titles = self._award(quest.xp_reward)
+        self._commit("quest_completed", quests=[quest], tracks=[track], player=True, history=[row])
         response = [
             f"✔ Mission Cleared: {quest.title}",
             f"XP +{quest.xp_reward}",
@@ -62,105 +107,717 @@ class GameEngine:
         ]
         if titles:
             response.append("Unlocked titles: " + ", ".join(titles))
-        return "\n".join(response)
+        return "\n".join(response + self._achievement_lines())
+
+    def complete_quests(self, quest_ids: Sequence[str] = (), quests: Sequence[Quest] = ()) -> str:
+        """Complete every quest named by id prefix or passed directly, with one XP award and one save."""
+        targets, problems = self._resolve_quests(quest_ids, quests, QuestStatus.COMPLETED)
+        if not targets:
+            return "\n".join(problems or ["No quests selected."])
+        player = self.state.player
+        level = player.level
+        tracks: Dict[str, SkillTrackProgress] = {}
+        rows = []
+        lines = [f"✔ Missions Cleared: {len(targets)}"]
+        for quest in targets:
+            track, row = self._mark_completed(quest)
+            tracks[track.skill_name] = track
+            rows.append(row)
+            lines.append(f"  [{quest.id[:6]}] {quest.title} · +{quest.xp_reward} XP · streak {track.streak}d")
+        total = sum(quest.xp_reward for quest in targets)
+        titles = self._award(total)
+        self._commit("quests_completed", quests=targets, tracks=list(tracks.values()), player=True, history=rows)
+        lines.append(f"XP +{total}")
+        if player.level != level:
+            lines.append(f"Level {level} → {player.level} · {player.rank}-Rank")
+        if titles:
+            lines.append("Unlocked titles: " + ", ".join(titles))
+        return "\n".join(lines + self._achievement_lines() + problems)
 
     def fail_quest(self, quest_id: str) -> str:
         quest = self._find_quest(quest_id)
-        if not quest:
-            return "Quest not found."
+        if not isinstance(quest, Quest):
+            return quest
         if quest.status == QuestStatus.FAILED:
             return "Quest already marked as failed."
-        quest.status = QuestStatus.FAILED
-        quest.escalate_failure()
-        track = self.state.player.ensure_track(quest.skill)
-        track.break_streak()
-        save_game_state(self.state)
-        return (
+        track, row = self._mark_failed(quest)
+        self._commit("quest_failed", quests=[quest], tracks=[track], history=[row])
+        response = [
             "✖ Mission Failed. Difficulty escalated, XP doubled."
             f" New difficulty: {quest.difficulty.value}, XP: {quest.xp_reward}."
-        )
+        ]
+        return "\n".join(response + self._achievement_lines())
 
-    def schedule_quest(self, template_index: int, due_days_from_now: int = 1) -> str:
-        templates = list(quest_templates())
-        if template_index < 0 or template_index >= len(templates):
-            return "Invalid template selection."
-        blueprint = templates[template_index]
-        deadline = self.state.current_day + _dt.timedelta(days=due_days_from_now)
-        quest = Quest(
-            title=blueprint["title"],
-            tree=blueprint["tree"],
-            skill=blueprint["skill"],
-            difficulty=blueprint["difficulty"],
-            estimated_effort=blueprint["estimated_effort"],
-            xp_reward=blueprint["xp_reward"],
-            streak_impact=1,
-            deadline=deadline,
-        )
-        self.state.quests.append(quest)
-        save_game_state(self.state)
-        return f"Planned: {quest.title} → due {deadline.isoformat()}"
+    def fail_quests(self, quest_ids: Sequence[str] = (), quests: Sequence[Quest] = ()) -> str:
+        """Fail every quest named by id prefix or passed directly, with one save."""
+        targets, problems = self._resolve_quests(quest_ids, quests, QuestStatus.FAILED)
+        if not targets:
+            return "\n".join(problems or ["No quests selected."])
+        tracks: Dict[str, SkillTrackProgress] = {}
+        rows = []
+        lines = [f"✖ Missions Failed: {len(targets)} · difficulty escalated, XP doubled"]
+        for quest in targets:
+            track, row = self._mark_failed(quest)
+            tracks[track.skill_name] = track
+            rows.append(row)
+            lines.append(f"  [{quest.id[:6]}] {quest.title} → {quest.difficulty.value}, {quest.xp_reward} XP")
+        self._commit("quests_failed", quests=targets, tracks=list(tracks.values()), history=rows)
+        return "\n".join(lines + self._achievement_lines() + problems)
+
+    def select_quests(
+        self,
+        tree: Optional[SkillTree] = None,
+        skill: Optional[str] = None,
+        first: Optional[_dt.date] = None,
+        last: Optional[_dt.date] = None,
+    ) -> List[Quest]:
+        """Pending quests in a skill tree/skill whose deadline falls in ``[first, last]``.
+
+        Unstored rule occurrences count from today on; an open-ended window
+        takes today's.
+        """
+        state = self.state
+        if first is None and last is None:
+            quests: List[Quest] = list(state.index.with_status(QuestStatus.PENDING))
+        else:
+            quests = state.index.due_between(QuestStatus.PENDING, first or _dt.date.min, last or _dt.date.max)
+        today = state.current_day
+        quests.extend(state.occurrences(max(first or today, today), last or today))
+        wanted_skill = skill.lower() if skill else None
+        return [
+            quest
+            for quest in quests
+            if (tree is None or quest.tree == tree)
+            and (wanted_skill is None or quest.skill.lower() == wanted_skill)
+        ]
+
+    def schedule_quest(self, template_id: str, due_days_from_now: int = 1) -> str:
+        blueprint = self._find_template(template_id)
+        if not isinstance(blueprint, QuestTemplate):
+            return blueprint
+        quest = self._quest_from_template(blueprint, due_days_from_now)
+        self._remember_quest(quest)
+        self.state.add_quest(quest)
+        self._commit("quest_scheduled", quests=[quest])
+        return f"Planned: {quest.title} → due {quest.deadline.isoformat()}"
+
+    def schedule_quests(self, template_ids: Sequence[str], due_days_from_now: int = 1) -> str:
+        """Schedule one quest per blueprint id and save them together."""
+        catalog = self.catalog
+        quests = []
+        problems = []
+        for template_id in template_ids:
+            blueprint = self._find_template(template_id, catalog)
+            if isinstance(blueprint, QuestTemplate):
+                quests.append(self._quest_from_template(blueprint, due_days_from_now))
+            else:
+                problems.append(f"  ? {blueprint}")
+        if not quests:
+            return "\n".join(problems)
+        for quest in quests:
+            self._remember_quest(quest)
+            self.state.add_quest(quest)
+        self._commit("quests_scheduled", quests=quests)
+        lines = [f"Planned {len(quests)} quests → due {quests[0].deadline.isoformat()}:"]
+        lines.extend(f"  [{quest.id[:6]}] {quest.title}" for quest in quests)
+        return "\n".join(lines + problems)
+
+    def import_quests(self, path: Path, fmt: Optional[str] = None, on_conflict: str = "skip") -> str:
+        """Stream quest records from ``path`` into the ledger and save them in one commit.
 
-    def list_templates(self) -> str:
+        Ids already in the ledger are skipped or, with ``on_conflict="upsert"``,
+        overwritten. Within the file the first row for an id wins when skipping
+        and the last when upserting. Invalid rows are reported, not fatal.
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy {on_conflict!r}; use one of {', '.join(CONFLICT_POLICIES)}.")
+        upsert = on_conflict == "upsert"
+        index = self.state.index
+        added: Dict[str, Quest] = {}
+        updated: Dict[str, Quest] = {}
+        skipped = duplicates = invalid = 0
+        problems = []
+        for line, record, error in iter_import_rows(path, fmt):
+            if error is None:
+                try:
+                    quest = quest_from_record(record)
+                except ValueError as exc:
+                    error = str(exc)
+            if error is not None:
+                invalid += 1
+                if len(problems) < MAX_IMPORT_PROBLEMS:
+                    problems.append(f"  line {line}: {error}")
+                continue
+            seen = added if quest.id in added else updated if quest.id in updated else None
+            if seen is not None:
+                duplicates += 1
+                if upsert:
+                    seen[quest.id] = quest
+            elif index.get(quest.id) is not None:
+                if upsert:
+                    updated[quest.id] = quest
+                else:
+                    skipped += 1
+            else:
+                added[quest.id] = quest
+        for quest in [*updated.values(), *added.values()]:
+            self._remember_quest(quest)
+        changed = self.state.upsert_quests([*updated.values(), *added.values()])
+        if changed:
+            self._commit("quests_imported", quests=changed)
+        lines = [
+            f"Imported {len(added)} new quests · {len(updated)} updated · {skipped} skipped (already present)"
+            f" · {duplicates} duplicate rows · {invalid} invalid rows"
+        ]
+        lines.extend(problems)
+        if invalid > len(problems):
+            lines.append(f"  … {invalid - len(problems)} more invalid rows")
+        return "\n".join(lines)
+
+    def list_templates(
+        self,
+        tree: Optional[SkillTree] = None,
+        skill: Optional[str] = None,
+        difficulty: Optional[Difficulty] = None,
+        max_effort: Optional[int] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> str:
+        catalog = self.catalog
+        rows = catalog.select(tree=tree, skill=skill, difficulty=difficulty, max_effort=max_effort, keywords=search)
+        shown = rows if not limit else rows[:limit]
         lines = ["Available Quest Blueprints:"]
-        for idx, blueprint in enumerate(quest_templates()):
+        for blueprint in map(catalog.__getitem__, shown):
             lines.append(
-                f"[{idx}] {blueprint['title']} ({blueprint['tree'].value} · {blueprint['skill']})"
-                f" — {blueprint['estimated_effort']} / {blueprint['difficulty'].value} / {blueprint['xp_reward']} XP"
+                f"[{blueprint.id}] {blueprint.title} ({blueprint.tree.value} · {blueprint.skill})"
+                f" — {blueprint.estimated_effort} / {blueprint.difficulty.value} / {blueprint.xp_reward} XP"
             )
+        if not rows:
+            lines.append("  — no matching blueprints —")
+        elif len(shown) < len(rows):
+            lines.append(f"  … {len(rows) - len(shown)} more of {len(catalog)} (narrow the filters or raise --limit)")
         return "\n".join(lines)
 
+    # ------------------------------------------------------------------
+    # Recurring quests
+    # ------------------------------------------------------------------
+    def add_rule(
+        self, template_id: str, pattern: str = "daily", interval: int = 1, start: Optional[_dt.date] = None
+    ) -> str:
+        """Repeat a blueprint on a schedule; occurrences are expanded on demand."""
+        blueprint = self._find_template(template_id)
+        if not isinstance(blueprint, QuestTemplate):
+            return blueprint
+        if interval < 1:
+            return "The interval must be at least one day."
+        rule = RecurrenceRule(
+            title=blueprint.title,
+            tree=blueprint.tree,
+            skill=blueprint.skill,
+            difficulty=blueprint.difficulty,
+            estimated_effort=blueprint.estimated_effort,
+            xp_reward=blueprint.xp_reward,
+            start=start or self.state.current_day,
+            pattern=pattern,
+            interval=interval,
+        )
+        self._remember_rule(rule)
+        self.state.upsert_rule(rule)
+        self._commit("rule_added", rules=[rule])
+        return f"Recurring: [{rule.id[:6]}] {rule.title} · {rule.describe()} from {rule.start.isoformat()}"
+
+    def stop_rule(self, rule_id: str) -> str:
+        """End a rule after today; stored occurrences stay in the ledger."""
+        matches = self.state.find_rules(rule_id) if rule_id else []
+        if not matches:
+            return f"No recurring quest with id '{rule_id}'."
+        if len(matches) > 1:
+            shown = ", ".join(rule.id[: len(rule_id) + 2] for rule in matches[:5])
+            return f"Ambiguous rule id '{rule_id}' matches {len(matches)} rules: {shown}."
+        rule = matches[0]
+        today = self.state.current_day
+        if rule.end is not None and rule.end <= today:
+            return f"{rule.title} already stopped after {rule.end.isoformat()}."
+        self._remember_rule(rule)
+        rule.end = today
+        self._commit("rule_stopped", rules=[rule])
+        return f"Stopped: {rule.title} · no occurrences after {today.isoformat()}"
+
+    def list_rules(self) -> str:
+        return "\n".join(["Recurring Quests:"] + self._rule_lines())
+
+    @property
+    def catalog(self) -> TemplateCatalog:
+        """Blueprint catalog: ``templates_path``, a catalog file beside the state, or the built-ins."""
+        return load_catalog(self.templates_path or catalog_path(self._state_path()))
+
+    # ------------------------------------------------------------------
+    # Transactions
+    # ------------------------------------------------------------------
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Buffer every commit made inside the block and save them as one record.
+
+        If the block raises, nothing is saved and the in-memory state is put
+        back as it was on entry, from the before-images of what it touched.
+        Quests already moved to the archive stay there.
+        """
+        saver, undo = self.saver, self._undo
+        events: List[Dict] = []
+        # Rollback needs before-images even when undo history is off.
+        recorder = self._undo = undo if undo is not None else UndoRecorder()
+        recorder.begin(self.state)
+        rows, unlocked = len(self.state.history), len(self._unlocked)
+        self.saver = lambda state, path, event: events.append(event)
+        self._batching = True
+        try:
+            yield
+        except BaseException:
+            self._rollback(recorder, rows)
+            del self._unlocked[unlocked:]
+            raise
+        finally:
+            self.saver = saver
+            self._undo = undo
+            self._batching = False
+        if events:
+            self._save(events[0] if len(events) == 1 else merge_events(events))
+        else:
+            recorder.reset()
+
+    def _rollback(self, recorder: UndoRecorder, rows: int) -> None:
+        counters = recorder.counters.keys() | self.state.player.achievement_counters.keys()
+        event = recorder.undo_event({"player": True, "counters": counters})
+        event["history_drop"] = len(self.state.history) - rows
+        apply_event(self.state, event)
+        recorder.reset()
+        self._touched = set()
+
+    # ------------------------------------------------------------------
+    # Undo and redo
+    # ------------------------------------------------------------------
+    def undo(self) -> str:
+        """Revert the most recent operation still in the undo history."""
+        return self._replay("undo")
+
+    def redo(self) -> str:
+        """Re-apply the most recently undone operation."""
+        return self._replay("redo")
+
+    def run_batch(self, operations: Sequence[Callable[["GameEngine"], str]]) -> str:
+        """Run ``operations`` in one transaction and append a combined progress report."""
+        player = self.state.player
+        level, title_count, rows = player.level, len(player.titles), len(self.state.history)
+        with self.transaction():
+            outputs = [operation(self) for operation in operations]
+        gained = sum(self.state.history.xp[rows:])
+        summary = f"BATCH · {len(operations)} operations · XP +{gained}"
+        if player.level != level:
+            summary += f" · Level {level} → {player.level} ({player.rank}-Rank)"
+        if len(player.titles) > title_count:
+            summary += " · Unlocked titles: " + ", ".join(player.titles[title_count:])
+        return "\n".join(outputs + [DIVIDER, summary])
+
     # ------------------------------------------------------------------
     # Day transitions
     # ------------------------------------------------------------------
     def advance_day(self) -> str:
+        return self.advance_to(self.state.current_day + _dt.timedelta(days=1))
+
+    def advance_to(self, target: _dt.date) -> str:
+        """Roll over every midnight up to ``target`` in a single pass.
+
+        A pending quest due on day ``d`` fails once per midnight between
+        ``max(d, today)`` and ``target``; those failures are applied at once.
+        """
         today = self.state.current_day
-        tomorrow = today + _dt.timedelta(days=1)
-        summary: List[str] = [DIVIDER, f"MIDNIGHT ROLLOVER → {tomorrow.isoformat()}".center(72), DIVIDER]
-        failed = []
-        for quest in self.state.quests:
-            if quest.deadline <= today and quest.status == QuestStatus.PENDING:
-                quest.status = QuestStatus.FAILED
-                quest.escalate_failure()
-                quest.reset_for_new_day(tomorrow)
-                failed.append(quest)
+        days = (target - today).days
+        if days < 1:
+            return f"Target day must be after {today.isoformat()}."
+        if days == 1:
+            heading = f"MIDNIGHT ROLLOVER → {target.isoformat()}"
+        else:
+            heading = f"CATCH-UP ROLLOVER → {target.isoformat()} · {days} days"
+        summary: List[str] = [DIVIDER, heading.center(72), DIVIDER]
+        if self._undo is not None:
+            self._undo.begin(self.state)
+        # Only the latest missed occurrence of each rule becomes a stored quest
+        # and fails like any other; earlier ones are recorded as missed on
+        # their own day, so a long absence does not pile up escalated copies.
+        collapsed: Dict[str, List[_dt.date]] = {}
+        for quest, earlier in self.state.missed_occurrences(today, target - _dt.timedelta(days=1)):
+            self._remember_quest(quest)
+            self.state.add_quest(quest)
+            collapsed[quest.id] = earlier
+        failed = self.state.overdue_quests(target)
+        self.escalated = len(failed)
+        for quest in failed:
+            self._remember_quest(quest)
+        missed_days = []
+        misses = []
+        for quest in failed:
+            first_miss = max(quest.deadline, today)
+            missed = (target - first_miss).days
+            earlier = collapsed.get(quest.id, [])
+            misses.extend((day, quest) for day in earlier)
+            misses.extend((first_miss + _dt.timedelta(days=n), quest) for n in range(missed))
+            missed_days.append(missed)
+        # History rows must stay in day order, so record misses day by day.
+        misses.sort(key=lambda item: item[0])
+        rows = [self.state.history.record("missed", quest, day) for day, quest in misses]
+        for quest, missed in zip(failed, missed_days):
+            quest.status = QuestStatus.FAILED
+            quest.escalate_failure(missed)
+            quest.reset_for_new_day(target)
         if failed:
             summary.append("The dungeon punished hesitation. These quests returned angrier:")
-            for quest in failed:
-                summary.append(self._format_quest_line(quest))
+            for quest, missed in zip(failed, missed_days):
+                missed += len(collapsed.get(quest.id, []))
+                suffix = f" · missed {missed}×" if missed > 1 else ""
+                summary.append(self._format_quest_line(quest) + suffix)
         else:
             summary.append("All missions resolved. Tomorrow awaits fresh orders.")
-        self.state.current_day = tomorrow
-        save_game_state(self.state)
-        return "\n".join(summary)
+        self.state.current_day = target
+        self._achieve_rollover(today, misses)
+        archived = self._archive(self.archive_horizon_days)
+        if archived:
+            summary.append(f"{len(archived)} resolved quests moved to the archive.")
+        self._commit("day_advanced", quests=failed, removed=[q.id for q in archived], history=rows)
+        return "\n".join(summary + self._achievement_lines())
+
+    def archive_resolved(self, horizon_days: Optional[int] = None) -> str:
+        horizon = self.archive_horizon_days if horizon_days is None else horizon_days
+        archived = self._archive(horizon)
+        if not archived:
+            return f"No resolved quests older than {horizon} days."
+        self._commit("quests_archived", removed=[q.id for q in archived])
+        return f"Archived {len(archived)} resolved quests → {archive_dir(self._state_path())}"
+
+    def archive_history(self, first_month: Optional[str] = None, last_month: Optional[str] = None) -> str:
+        lines = ["Archived Quest History:"]
+        for quest in iter_archived_quests(self._state_path(), first_month, last_month):
+            lines.append(f"  {quest.status.value:<9} " + self._format_quest_line(quest))
+        if len(lines) == 1:
+            lines.append("  — none —")
+        return "\n".join(lines)
 
-    def status_overview(self) -> str:
+    def stats_report(self, window_days: int = 90, by: str = "skill") -> str:
+        return render_stats(self.state.history, self.state.current_day, window_days=window_days, by=by)
+
+    def iter_achievements(self) -> Iterator[str]:
+        """Yield every achievement with its unlock day or the progress toward it."""
+        player = self.state.player
+        yield DIVIDER
+        yield f"ACHIEVEMENTS · {len(player.achievements)}/{len(self.book)} unlocked".center(72)
+        yield DIVIDER
+        for achievement in self.book:
+            unlocked = player.achievements.get(achievement.id)
+            if unlocked is not None:
+                yield f"  🏆 {achievement.title} — {achievement.description} · {unlocked.isoformat()}"
+            else:
+                progress = player.achievement_counters.get(achievement.id, 0)
+                yield f"  ·  {achievement.title} — {achievement.description} · {progress}/{achievement.goal}"
+
+    def iter_export(
+        self,
+        kind: str,
+        fmt: str = "jsonl",
+        include_archive: bool = False,
+        statuses: Sequence[QuestStatus] = (),
+        tree: Optional[SkillTree] = None,
+        first: Optional[_dt.date] = None,
+        last: Optional[_dt.date] = None,
+    ) -> Iterator[str]:
+        """Stream ``kind`` records as JSONL or CSV lines; see :mod:`houssam_rpg.export`."""
+        archive_path = self._state_path() if include_archive else None
+        return iter_export(self.state, kind, fmt, archive_path, statuses, tree, first, last)
+
+    def status_overview(self, **options) -> str:
+        return "\n".join(self.iter_status(**options))
+
+    def iter_status(
+        self,
+        include_archive: bool = False,
+        statuses: Sequence[QuestStatus] = (),
+        tree: Optional[SkillTree] = None,
+        limit: Optional[int] = None,
+        page: int = 1,
+        summary: bool = False,
+    ) -> Iterator[str]:
+        """Yield the status screen line by line.
+
+        ``statuses`` and ``tree`` filter the ledger, ``limit``/``page`` select
+        one page of it and ``summary`` replaces it with counts per status.
+        """
         state = self.state
         player = state.player
-        lines = [DIVIDER, "ASCENSION STATUS".center(72), DIVIDER]
-        lines.append(f"Name: {player.name} · Rank: {player.rank}-Rank · Level {player.level}")
-        lines.append(f"XP in reserve: {player.xp}")
-        lines.append("")
-        lines.append("Streak Flames:")
+        yield DIVIDER
+        yield "ASCENSION STATUS".center(72)
+        yield DIVIDER
+        yield f"Name: {player.name} · Rank: {player.rank}-Rank · Level {player.level}"
+        yield f"XP in reserve: {player.xp}"
+        yield ""
+        yield "Streak Flames:"
+        today = state.current_day
         for track_name, track in sorted(player.skill_tracks.items()):
-            ember = self._streak_flame(track.streak)
-            lines.append(f"  {track_name}: {track.streak}d streak {ember}")
-        lines.append("")
-        lines.append("Quest Ledger:")
-        ledger = defaultdict(list)
-        for quest in state.quests:
-            ledger[quest.status].append(quest)
-        for status in (QuestStatus.PENDING, QuestStatus.COMPLETED, QuestStatus.FAILED):
-            lines.append(f" {status.value.upper()} ::")
-            if ledger[status]:
-                for quest in ledger[status]:
-                    lines.append("  " + self._format_quest_line(quest))
-            else:
-                lines.append("  — none —")
-        return "\n".join(lines)
+            yield (
+                f"  {track_name}: {track.streak}d streak {self._streak_flame(track.streak)}"
+                f" · best {track.longest_streak}d"
+            )
+            yield "    " + self._calendar_strip(track, today)
+        yield ""
+        yield f"Achievements: {len(player.achievements)}/{len(self.book)} unlocked"
+        yield ""
+        if state.rules:
+            yield "Recurring Quests:"
+            yield from self._rule_lines()
+            yield ""
+        shown = statuses or (QuestStatus.PENDING, QuestStatus.COMPLETED, QuestStatus.FAILED)
+        if summary:
+            yield "Quest Ledger Summary:"
+            for status in shown:
+                if tree is None:
+                    count = state.index.count(status)
+                else:
+                    count = sum(1 for _ in self._in_tree(state.index.with_status(status), tree))
+                yield f" {status.value.upper():<10} {count}"
+            return
+        yield "Quest Ledger:"
+        pager = Pager(limit, page)
+        for status in shown:
+            total = state.index.count(status) if tree is None else None
+            quests = pager.take(self._in_tree(state.index.with_status(status), tree), total)
+            first = next(quests, None)
+            if first is None:
+                if not pager.paginated:
+                    yield f" {status.value.upper()} ::"
+                    yield "  — none —"
+                continue
+            yield f" {status.value.upper()} ::"
+            yield "  " + self._format_quest_line(first)
+            for quest in quests:
+                yield "  " + self._format_quest_line(quest)
+        if pager.footer():
+            yield pager.footer()
+        if include_archive:
+            yield " ARCHIVED ::"
+            for quest in iter_archived_quests(self._state_path()):
+                if state.index.get(quest.id) is None and (tree is None or quest.tree == tree):
+                    if not statuses or quest.status in statuses:
+                        yield f"  {quest.status.value:<9} " + self._format_quest_line(quest)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _commit(
+        self,
+        kind: str,
+        quests: Sequence[Quest] = (),
+        tracks: Sequence[SkillTrackProgress] = (),
+        player: bool = False,
+        removed: Sequence[str] = (),
+        history: Sequence[List] = (),
+        rules: Sequence[RecurrenceRule] = (),
+    ) -> None:
+        touched, self._touched = self._touched, set()
+        # An unlock changes the player's titles and achievements.
+        unlocked = any(achievement_id in self.state.player.achievements for achievement_id in touched)
+        event = make_event(
+            kind,
+            self.state,
+            quests=quests,
+            tracks=tracks,
+            player=player or unlocked,
+            removed=removed,
+            history=history,
+            rules=rules,
+            counters=touched,
+        )
+        if self._batching:
+            self.saver(self.state, self.path, event)
+        else:
+            self._save(event)
+
+    def _save(self, event: Dict) -> None:
+        """Hand one operation's event to the saver, staging its undo step alongside."""
+        target = self._state_path()
+        if self._undo is not None:
+            if self._undo.active:
+                record_step(target, self.state.version, _step_label(event), self._undo.undo_event(event), event)
+            else:
+                record_sync(target, self.state.version)
+            self._undo.reset()
+        try:
+            self.saver(self.state, self.path, event)
+        except BaseException:
+            discard_pending(target)
+            raise
+
+    def _replay(self, stack: str) -> str:
+        if self._undo is None:
+            return "Undo history is not recorded for this engine."
+        target = self._state_path()
+        step = peek_step(target, self.state.version, stack)
+        if isinstance(step, str):
+            return step
+        event = step[stack]
+        apply_event(self.state, event)
+        record_move(target, self.state.version, stack)
+        try:
+            self.saver(self.state, self.path, event)
+        except BaseException:
+            discard_pending(target)
+            raise
+        depth = undo_depth(target, self.state.version)
+        verb = "↶ Undone" if stack == "undo" else "↷ Redone"
+        return f"{verb}: {step['label']}\n{depth['undo']} more to undo · {depth['redo']} to redo"
+
+    def _remember_quest(self, quest: Quest) -> None:
+        if self._undo is not None:
+            self._undo.quest(self.state, quest)
+
+    def _remember_track(self, skill: str) -> None:
+        if self._undo is not None:
+            self._undo.track(self.state, skill)
+
+    def _remember_rule(self, rule: RecurrenceRule) -> None:
+        if self._undo is not None:
+            self._undo.rule(self.state, rule)
+
+    def _achieve(self, kind: str, day: Optional[_dt.date] = None, **fields) -> None:
+        """Fire one achievement event, on the current day unless ``day`` is given.
+
+        Unlocks are reported by the next response.
+        """
+        event = AchievementEvent(kind, day or self.state.current_day, **fields)
+        self._unlocked.extend(self.book.fire(self.state.player, event, self._touched))
+
+    def _achieve_rollover(self, today: _dt.date, misses: Sequence[Tuple[_dt.date, Quest]]) -> None:
+        """Replay the midnights from ``today`` to the current day as achievement events.
+
+        ``misses`` are ``(day, quest)`` pairs in day order, each missed at the
+        midnight ending ``day``. Runs of clean midnights become one
+        ``day_advanced`` event and every miss a ``quest_failed`` event, in the
+        order they happened.
+        """
+        one_day = _dt.timedelta(days=1)
+        clean_from = today
+        for day, quest in misses:
+            if day > clean_from:
+                self._achieve("day_advanced", day=day, days=(day - clean_from).days)
+            clean_from = max(clean_from, day + one_day)
+            self._achieve(
+                "quest_failed", day=clean_from, tree=quest.tree, skill=quest.skill, difficulty=quest.difficulty
+            )
+        target = self.state.current_day
+        if target > clean_from:
+            self._achieve("day_advanced", days=(target - clean_from).days)
+
+    def _achievement_lines(self) -> List[str]:
+        unlocked, self._unlocked = self._unlocked, []
+        return [f"🏆 Achievement unlocked: {a.title} — {a.description}" for a in unlocked]
+
+    def _award(self, xp: int) -> List[str]:
+        """:func:`award_xp` plus the ``level_up`` achievement event."""
+        level = self.state.player.level
+        titles = award_xp(self.state, xp)
+        if self.state.player.level != level:
+            self._achieve("level_up", level=self.state.player.level)
+        return titles
+
+    def _mark_completed(self, quest: Quest) -> Tuple[SkillTrackProgress, List]:
+        self._remember_quest(quest)
+        self._remember_track(quest.skill)
+        self._store(quest)
+        chain = quest.failure_count
+        quest.status = QuestStatus.COMPLETED
+        quest.urgency = False
+        quest.failure_count = 0
+        track = self.state.player.ensure_track(quest.skill)
+        track.register_completion(self.state.current_day)
+        row = self.state.history.record("completed", quest, self.state.current_day, quest.xp_reward)
+        self._achieve(
+            "quest_completed",
+            tree=quest.tree,
+            skill=quest.skill,
+            difficulty=quest.difficulty,
+            xp=quest.xp_reward,
+            streak=track.streak,
+            chain=chain,
+        )
+        return track, row
+
+    def _mark_failed(self, quest: Quest) -> Tuple[SkillTrackProgress, List]:
+        self._remember_quest(quest)
+        self._remember_track(quest.skill)
+        self._store(quest)
+        row = self.state.history.record("failed", quest, self.state.current_day)
+        quest.status = QuestStatus.FAILED
+        quest.escalate_failure()
+        track = self.state.player.ensure_track(quest.skill)
+        track.break_streak()
+        self._achieve("quest_failed", tree=quest.tree, skill=quest.skill, difficulty=quest.difficulty)
+        return track, row
+
+    def _store(self, quest: Quest) -> None:
+        """Add a rule occurrence to the ledger the first time it is resolved."""
+        if self.state.index.get(quest.id) is None:
+            self.state.add_quest(quest)
+
+    def _resolve_quests(
+        self, quest_ids: Sequence[str], quests: Sequence[Quest], done: QuestStatus
+    ) -> Tuple[List[Quest], List[str]]:
+        """Resolve id prefixes, dropping duplicates and quests already in ``done``."""
+        candidates = list(quests)
+        problems = []
+        for quest_id in quest_ids:
+            found = self._find_quest(quest_id)
+            if isinstance(found, Quest):
+                candidates.append(found)
+            else:
+                problems.append(f"  ? {quest_id}: {found}")
+        targets = []
+        seen = set()
+        for quest in candidates:
+            if quest.id in seen:
+                continue
+            seen.add(quest.id)
+            if quest.status == done:
+                problems.append(f"  · [{quest.id[:6]}] {quest.title}: already {done.value}.")
+            else:
+                targets.append(quest)
+        return targets, problems
+
+    def _find_template(self, template_id: str, catalog: Optional[TemplateCatalog] = None) -> QuestTemplate | str:
+        matches = (catalog or self.catalog).find(template_id) if template_id else []
+        if not matches:
+            return f"No quest blueprint with id '{template_id}'."
+        if len(matches) > 1:
+            shown = ", ".join(template.id for template in matches[:5])
+            return f"Ambiguous blueprint id '{template_id}' matches {len(matches)} templates: {shown}."
+        return matches[0]
+
+    def _quest_from_template(self, blueprint: QuestTemplate, due_days_from_now: int) -> Quest:
+        return Quest(
+            title=blueprint.title,
+            tree=blueprint.tree,
+            skill=blueprint.skill,
+            difficulty=blueprint.difficulty,
+            estimated_effort=blueprint.estimated_effort,
+            xp_reward=blueprint.xp_reward,
+            streak_impact=1,
+            deadline=self.state.current_day + _dt.timedelta(days=due_days_from_now),
+        )
+
+    def _state_path(self) -> Path:
+        return self.path or STATE_PATH
+
+    def _archive(self, horizon_days: int) -> List[Quest]:
+        quests = archivable_quests(self.state, horizon_days)
+        archive_quests(quests, self._state_path())
+        self.state.remove_quests(q.id for q in quests)
+        return quests
+
     def _streak_flame(self, streak: int) -> str:
         if streak >= 30:
             return "🔥🔥🔥"
@@ -174,25 +831,85 @@ class GameEngine:
             return "✦"
         return "□"
 
+    def _calendar_strip(self, track: SkillTrackProgress, today: _dt.date) -> str:
+        """The last ``CALENDAR_WEEKS`` weeks ending today, one mark per day."""
+        days = 7 * CALENDAR_WEEKS
+        first = today - _dt.timedelta(days=days - 1)
+        bits = track.window(first, days)
+        marks = format(bits, f"0{days}b")[::-1].translate(_CALENDAR_MARKS)
+        weeks = " ".join(marks[start : start + 7] for start in range(0, days, 7))
+        return f"{weeks}  {bits.bit_count()}/{days} days"
+
+    def _rule_lines(self) -> List[str]:
+        today = self.state.current_day
+        lines = []
+        for rule in self.state.rules:
+            if rule.end is not None and rule.end < today:
+                today_status = f"stopped {rule.end.isoformat()}"
+            elif not rule.occurs_on(today):
+                today_status = "off today"
+            else:
+                stored = self.state.index.get(rule.occurrence_id(today))
+                today_status = "today " + (stored.status.value if stored else QuestStatus.PENDING.value)
+            lines.append(
+                f"  [{rule.id[:6]}] {rule.title} — {rule.tree.value}/{rule.skill}"
+                f" — {rule.describe()} — {rule.xp_reward} XP — {today_status}"
+            )
+        if not lines:
+            lines.append("  — none —")
+        return lines
+
     def _format_quest_line(self, quest: Quest) -> str:
+        shown = (
+            quest.id, quest.title, quest.tree, quest.skill, quest.difficulty,
+            quest.xp_reward, quest.deadline, quest.urgency,
+        )
+        memo = quest.display_line
+        if memo is not None and memo[0] == shown:
+            return memo[1]
         urgency = " !!" if quest.urgency else ""
-        return (
+        line = (
             f"[{quest.id[:6]}] {quest.title}"
             f" — {quest.tree.value}/{quest.skill}"
             f" — {quest.difficulty.value}"
             f" — {quest.xp_reward} XP"
             f" — due {quest.deadline.isoformat()}{urgency}"
         )
+        quest.display_line = (shown, line)
+        return line
+
+    @staticmethod
+    def _in_tree(quests: Iterable[Quest], tree: Optional[SkillTree]) -> Iterable[Quest]:
+        if tree is None:
+            return quests
+        return (quest for quest in quests if quest.tree == tree)
 
     def _rank_banner(self) -> str:
         player = self.state.player
         return f"◈ {player.rank}-Rank Ascendant · Level {player.level} ◈".center(72)
 
-    def _find_quest(self, quest_id: str) -> Quest | None:
-        for quest in self.state.quests:
-            if quest.id.startswith(quest_id) or quest.id == quest_id:
-                return quest
-        return None
+    def _find_quest(self, quest_id: str) -> Quest | str:
+        """Resolve an id prefix, or return the message explaining why it failed."""
+        matches = self.state.find_quests(quest_id) if quest_id else []
+        if not matches:
+            return "Quest not found."
+        if len(matches) > 1:
+            shown = ", ".join(quest.id[: len(quest_id) + 2] for quest in matches[:5])
+            more = f" (+{len(matches) - 5} more)" if len(matches) > 5 else ""
+            return f"Ambiguous quest id '{quest_id}' matches {len(matches)} quests: {shown}{more}."
+        return matches[0]
+
+
+def _step_label(event: Dict) -> str:
+    """Short description of a committed operation for undo/redo messages."""
+    label = event["event"].replace("_", " ")
+    if event["event"] == "day_advanced":
+        return f"{label} → {event['day']}"
+    titles = [quest["title"] for quest in event.get("quests", [])]
+    if titles:
+        more = f" (+{len(titles) - 3} more)" if len(titles) > 3 else ""
+        label += ": " + ", ".join(titles[:3]) + more
+    return label
 
 
 __all__ = ["GameEngine"]
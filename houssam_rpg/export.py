@@ -0,0 +1,193 @@
+"""Streaming export of quests, skill tracks and the outcome history as JSONL or CSV.
+
+Records are produced by generators and turned into text one line at a time,
+so nothing the size of the ledger is built up: hot quests are read straight
+off the index and archived months are decompressed lazily, one line each.
+"""
+from __future__ import annotations
+
+import csv
+import datetime as _dt
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+from .archive import iter_archived_quests
+from .models import OUTCOMES, QUEST_FIELDS, Difficulty, GameState, Quest, QuestStatus, SkillTree
+from .render import write_lines
+from .state import _quest_to_payload, _track_to_payload
+
+EXPORT_KINDS = ("quests", "tracks", "history")
+EXPORT_FORMATS = ("jsonl", "csv")
+QUEST_EXPORT_FIELDS = QUEST_FIELDS
+TRACK_EXPORT_FIELDS = ("player", "skill_name", "streak", "longest_streak", "last_completed", "calendar_epoch", "calendar")
+HISTORY_EXPORT_FIELDS = ("day", "timestamp", "outcome", "tree", "skill", "difficulty", "xp")
+_FIELDS = {"quests": QUEST_EXPORT_FIELDS, "tracks": TRACK_EXPORT_FIELDS, "history": HISTORY_EXPORT_FIELDS}
+
+
+def iter_quest_records(
+    state: GameState,
+    archive_path: Optional[Path] = None,
+    statuses: Sequence[QuestStatus] = (),
+    tree: Optional[SkillTree] = None,
+    first: Optional[_dt.date] = None,
+    last: Optional[_dt.date] = None,
+) -> Iterator[Dict]:
+    """Yield quest payloads, archived months first when ``archive_path`` is given.
+
+    ``first``/``last`` bound the deadline. An archived quest that is still in
+    the hot ledger is skipped in favour of the hot copy.
+    """
+    if archive_path is not None:
+        first_month = first.strftime("%Y-%m") if first else None
+        last_month = last.strftime("%Y-%m") if last else None
+        for quest in iter_archived_quests(archive_path, first_month, last_month):
+            if state.index.get(quest.id) is None and _matches(quest, statuses, tree, first, last):
+                yield _quest_to_payload(quest)
+    for quest in _hot_quests(state, statuses, first, last):
+        if tree is None or quest.tree == tree:
+            yield _quest_to_payload(quest)
+
+
+def _hot_quests(
+    state: GameState, statuses: Sequence[QuestStatus], first: Optional[_dt.date], last: Optional[_dt.date]
+) -> Iterable[Quest]:
+    if not statuses and first is None and last is None:
+        return state.quests
+    return _by_status(state, statuses or tuple(QuestStatus), first, last)
+
+
+def _by_status(
+    state: GameState, statuses: Sequence[QuestStatus], first: Optional[_dt.date], last: Optional[_dt.date]
+) -> Iterator[Quest]:
+    for status in statuses:
+        if first is None and last is None:
+            yield from state.index.with_status(status)
+        else:
+            yield from state.index.due_between(status, first or _dt.date.min, last or _dt.date.max)
+
+
+def _matches(
+    quest: Quest,
+    statuses: Sequence[QuestStatus],
+    tree: Optional[SkillTree],
+    first: Optional[_dt.date],
+    last: Optional[_dt.date],
+) -> bool:
+    return (
+        (not statuses or quest.status in statuses)
+        and (tree is None or quest.tree == tree)
+        and (first is None or quest.deadline >= first)
+        and (last is None or quest.deadline <= last)
+    )
+
+
+def iter_track_records(state: GameState) -> Iterator[Dict]:
+    """Yield one payload per skill track, tagged with the player's name."""
+    player = state.player
+    for track in player.skill_tracks.values():
+        record = {"player": player.name, "longest_streak": track.longest_streak}
+        record.update(_track_to_payload(track))
+        yield record
+
+
+def iter_history_records(
+    state: GameState,
+    tree: Optional[SkillTree] = None,
+    first: Optional[_dt.date] = None,
+    last: Optional[_dt.date] = None,
+) -> Iterator[Dict]:
+    """Yield outcome history rows with their enum codes spelled out."""
+    history = state.history
+    trees = list(SkillTree)
+    difficulties = list(Difficulty)
+    for day, timestamp, outcome, tree_code, skill, difficulty, xp in history.rows(history.window(first, last)):
+        if tree is not None and trees[tree_code] != tree:
+            continue
+        yield {
+            "day": _dt.date.fromordinal(day).isoformat(),
+            "timestamp": timestamp,
+            "outcome": OUTCOMES[outcome],
+            "tree": trees[tree_code].value,
+            "skill": skill,
+            "difficulty": difficulties[difficulty].value,
+            "xp": xp,
+        }
+
+
+def export_lines(records: Iterable[Dict], fmt: str, fields: Sequence[str]) -> Iterator[str]:
+    """Turn records into JSONL lines, or a CSV header followed by CSV rows."""
+    if fmt == "jsonl":
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        return
+    if fmt != "csv":
+        raise ValueError(f"Unknown export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}.")
+    # csv.writer returns whatever the target's write() returns, so each row comes back as a string.
+    # The terminator stays "\n" so cells holding newlines get quoted; it is cut off each row.
+    writer = csv.writer(_Echo(), lineterminator="\n")
+    yield writer.writerow(fields)[:-1]
+    for record in records:
+        yield writer.writerow([record.get(name) for name in fields])[:-1]
+
+
+class _Echo:
+    def write(self, text: str) -> str:
+        return text
+
+
+def iter_export(
+    state: GameState,
+    kind: str,
+    fmt: str = "jsonl",
+    archive_path: Optional[Path] = None,
+    statuses: Sequence[QuestStatus] = (),
+    tree: Optional[SkillTree] = None,
+    first: Optional[_dt.date] = None,
+    last: Optional[_dt.date] = None,
+) -> Iterator[str]:
+    """Lines of one export. Filters apply where they mean something for ``kind``."""
+    if kind == "quests":
+        records = iter_quest_records(state, archive_path, statuses, tree, first, last)
+    elif kind == "tracks":
+        records = iter_track_records(state)
+    elif kind == "history":
+        records = iter_history_records(state, tree, first, last)
+    else:
+        raise ValueError(f"Unknown export kind {kind!r}; use one of {', '.join(EXPORT_KINDS)}.")
+    return export_lines(records, fmt, _FIELDS[kind])
+
+
+def write_export(lines: Iterable[str], path: Path) -> int:
+    """Stream ``lines`` into ``path`` and return how many were written."""
+    written = 0
+
+    def counted() -> Iterator[str]:
+        nonlocal written
+        for line in lines:
+            written += 1
+            yield line
+
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        write_lines(counted(), fh)
+    return written
+
+
+def export_format_for(path: Optional[Path], fmt: Optional[str]) -> str:
+    """An explicit format wins; otherwise ``.csv`` files get CSV and everything else JSONL."""
+    if fmt:
+        return fmt
+    return "csv" if path is not None and path.suffix.lower() == ".csv" else "jsonl"
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "EXPORT_KINDS",
+    "export_format_for",
+    "export_lines",
+    "iter_export",
+    "iter_history_records",
+    "iter_quest_records",
+    "iter_track_records",
+    "write_export",
+]
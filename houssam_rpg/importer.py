@@ -0,0 +1,117 @@
+"""Streaming import of quest records from JSONL or CSV files.
+
+Rows are parsed one at a time and validated into :class:`Quest` objects with
+the same rules as ``_quest_from_payload``. CSV cells arrive as text, so
+numbers and flags are coerced first and empty cells count as missing.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from .models import Quest
+from .state import _quest_from_payload
+
+IMPORT_FORMATS = ("jsonl", "csv")
+CONFLICT_POLICIES = ("skip", "upsert")
+REQUIRED_FIELDS = ("title", "tree", "skill", "estimated_effort", "xp_reward", "streak_impact", "deadline")
+_INT_FIELDS = ("xp_reward", "streak_impact", "failure_count")
+_TEXT_FIELDS = ("title", "skill", "estimated_effort", "id", "notes")
+_TRUE = frozenset({"true", "1", "yes"})
+_FALSE = frozenset({"false", "0", "no"})
+# (line number, record, error): exactly one of record and error is set.
+ImportRow = Tuple[int, Optional[Dict], Optional[str]]
+
+
+def import_format_for(path: Path, fmt: Optional[str] = None) -> str:
+    """An explicit format wins; otherwise ``.csv`` files are CSV and everything else JSONL."""
+    if fmt:
+        return fmt
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def iter_import_rows(path: Path, fmt: Optional[str] = None) -> Iterator[ImportRow]:
+    """Lazily read ``path`` one record at a time, reporting unparsable lines instead of raising."""
+    fmt = import_format_for(path, fmt)
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        if fmt == "csv":
+            reader = csv.DictReader(fh)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, None, "more cells than header columns"
+                else:
+                    yield reader.line_num, row, None
+            return
+        if fmt != "jsonl":
+            raise ValueError(f"Unknown import format {fmt!r}; use one of {', '.join(IMPORT_FORMATS)}.")
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield lineno, None, f"invalid JSON ({exc.msg})"
+                continue
+            if isinstance(record, dict):
+                yield lineno, record, None
+            else:
+                yield lineno, None, "expected a JSON object"
+
+
+def quest_from_record(record: Dict) -> Quest:
+    """Validate one imported record and build its quest, raising ``ValueError``.
+
+    Records without an id get a fresh one.
+    """
+    payload = {name: value for name, value in record.items() if value is not None and value != ""}
+    for name in REQUIRED_FIELDS:
+        if name not in payload:
+            raise ValueError(f"missing {name}")
+    for name in _TEXT_FIELDS:
+        if name in payload and not isinstance(payload[name], str):
+            raise ValueError(f"{name} must be text")
+    for name in _INT_FIELDS:
+        if name in payload:
+            payload[name] = _as_int(name, payload[name])
+    if "urgency" in payload:
+        payload["urgency"] = _as_bool(payload["urgency"])
+    if "id" not in payload:
+        payload["id"] = uuid.uuid4().hex
+    try:
+        return _quest_from_payload(payload)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(str(exc)) from None
+
+
+def _as_int(name: str, value) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a whole number")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"{name} must be a whole number, not {value!r}")
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in _TRUE | _FALSE:
+        return value.lower() in _TRUE
+    raise ValueError(f"urgency must be true or false, not {value!r}")
+
+
+__all__ = [
+    "CONFLICT_POLICIES",
+    "IMPORT_FORMATS",
+    "REQUIRED_FIELDS",
+    "import_format_for",
+    "iter_import_rows",
+    "quest_from_record",
+]
@@ -0,0 +1,85 @@
+"""Crash-safe file primitives for the append-only mutation journal."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from . import metrics
+
+
+def journal_path(target: Path) -> Path:
+    """Return the journal file that sits next to a snapshot file."""
+    return target.with_name(target.name + ".journal")
+
+
+def atomic_write_bytes(target: Path, data: bytes) -> None:
+    """Write ``data`` to ``target`` via fsync + rename so readers never see a torn file."""
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fh:
+        fh.write(data)
+        metrics.count("bytes_written", len(data))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, target)
+    _fsync_directory(target.parent)
+
+
+def append_record(path: Path, record: Dict[str, Any]) -> int:
+    """Append one compact JSON record and return the resulting journal size."""
+    data = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    metrics.count("bytes_written", len(data))
+    with path.open("ab") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+        return fh.tell()
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield journal records in order, stopping at a torn trailing write."""
+    if not path.exists():
+        return
+    with path.open("rb") as fh:
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                yield json.loads(raw)
+            except ValueError:
+                break
+
+
+def journal_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def discard_journal(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _fsync_directory(directory: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+__all__ = [
+    "journal_path",
+    "atomic_write_bytes",
+    "append_record",
+    "iter_records",
+    "journal_size",
+    "discard_journal",
+]
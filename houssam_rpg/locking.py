@@ -0,0 +1,81 @@
+"""Advisory locking and version stamps guarding state read-modify-write cycles."""
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:  # Windows
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+VERSION_WIDTH = 20
+
+
+class StateConflictError(RuntimeError):
+    """Raised when the state on disk moved on since it was loaded."""
+
+    def __init__(self, expected: int, found: int) -> None:
+        super().__init__(f"State changed on disk (loaded version {expected}, found {found}).")
+        self.expected = expected
+        self.found = found
+
+
+def lock_path(target: Path) -> Path:
+    return target.with_name(target.name + ".lock")
+
+
+def read_version(target: Path) -> Optional[int]:
+    """Return the last committed version without taking the lock.
+
+    The stamp is a fixed-width number rewritten in place with one ``write``,
+    so readers never observe a half-written value. A stamp that cannot be
+    read (missing, unreadable, garbled) counts as unknown.
+    """
+    try:
+        with lock_path(target).open("rb") as fh:
+            raw = fh.read(VERSION_WIDTH)
+        return int(raw) if raw.strip() else None
+    except (OSError, ValueError):
+        return None
+
+
+class StateLock:
+    """Handle for a held lock; lets the holder stamp the committed version."""
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+
+    def write_version(self, version: int) -> None:
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, f"{version:0{VERSION_WIDTH}d}".encode("ascii"))
+
+
+@contextmanager
+def exclusive_lock(target: Path) -> Iterator[StateLock]:
+    """Hold an advisory exclusive lock on ``<target>.lock`` for the block."""
+    fd = os.open(lock_path(target), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield StateLock(fd)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+__all__ = ["StateConflictError", "StateLock", "lock_path", "read_version", "exclusive_lock"]
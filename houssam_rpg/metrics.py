@@ -0,0 +1,102 @@
+"""Lightweight per-command metrics: phase timings, I/O bytes and quest counts."""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Metrics:
+    """Collect wall time per phase plus named counters for one command.
+
+    Phases nest; each phase reports its *exclusive* time, so ``engine``
+    does not double-count the ``save`` it triggers.
+    """
+
+    def __init__(self, track_memory: bool = True) -> None:
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.track_memory = track_memory
+        self.peak_memory: Optional[int] = None
+        self._stack: List[List[Any]] = []
+        self._started = time.perf_counter()
+        self.total: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.phases[name] += elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] += amount
+
+    def start(self) -> None:
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        self.total = time.perf_counter() - self._started
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_s": self.total,
+            "phases_s": dict(self.phases),
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    def summary(self) -> str:
+        lines = ["── profile ──"]
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name:<12} {seconds * 1000:9.2f} ms")
+        if self.total is not None:
+            lines.append(f"  {'total':<12} {self.total * 1000:9.2f} ms")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name:<16} {value}")
+        if self.peak_memory is not None:
+            lines.append(f"  {'peak memory':<16} {self.peak_memory / 1024:.1f} KiB")
+        return "\n".join(lines)
+
+
+_ACTIVE: Optional[Metrics] = None
+
+
+def activate(metrics: Optional[Metrics]) -> None:
+    """Install ``metrics`` as the process-wide collector (``None`` disables it)."""
+    global _ACTIVE
+    _ACTIVE = metrics
+
+
+def active() -> Optional[Metrics]:
+    return _ACTIVE
+
+
+def count(counter: str, amount: int = 1) -> None:
+    """Bump a counter on the active collector; a no-op when profiling is off."""
+    if _ACTIVE is not None:
+        _ACTIVE.counters[counter] += amount
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    if _ACTIVE is None:
+        yield
+    else:
+        with _ACTIVE.phase(name):
+            yield
+
+
+__all__ = ["Metrics", "activate", "active", "count", "phase"]
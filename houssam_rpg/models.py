@@ -1,11 +1,20 @@
 """Data models for the Houssam Ascension Protocol prototype."""
 from __future__ import annotations
 
+import base64
+import bisect
 import datetime as _dt
+import hashlib
+import sys
+import time
 import uuid
-from dataclasses import dataclass, field
+from array import array
+from collections import deque
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import metrics
 
 
 class SkillTree(str, Enum):
@@ -46,12 +55,10 @@ class Difficulty(str, Enum):
     DEMANDING = "Demanding"
     BRUTAL = "Brutal"
 
-    def escalate(self) -> "Difficulty":
+    def escalate(self, steps: int = 1) -> "Difficulty":
         order = [Difficulty.TUTORIAL, Difficulty.EASY, Difficulty.STANDARD, Difficulty.DEMANDING, Difficulty.BRUTAL]
         idx = order.index(self)
-        if idx + 1 < len(order):
-            return order[idx + 1]
-        return self
+        return order[min(idx + steps, len(order) - 1)]
 
 
 class QuestStatus(str, Enum):
@@ -60,8 +67,12 @@ class QuestStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Quest:
+    # Declared first so __init__ sets them before any other field.
+    # display_line memoizes the rendered ledger line as (fields it shows, line).
+    display_line: Optional[Tuple[tuple, str]] = field(default=None, init=False, repr=False, compare=False)
+    _ledger: Optional["QuestIndex"] = field(default=None, init=False, repr=False, compare=False)
     title: str
     tree: SkillTree
     skill: str
@@ -76,27 +87,175 @@ class Quest:
     failure_count: int = 0
     notes: Optional[str] = None
 
-    def escalate_failure(self) -> None:
-        """Apply the doubling rule after a failure."""
-        self.failure_count += 1
+    def __setattr__(self, name: str, value) -> None:
+        ledger = self._ledger if name in _INDEXED_FIELDS else None
+        if ledger is not None:
+            ledger.discard(self)
+            object.__setattr__(self, name, value)
+            ledger.add(self)
+        else:
+            object.__setattr__(self, name, value)
+
+    def escalate_failure(self, times: int = 1) -> None:
+        """Apply the doubling rule after ``times`` consecutive failures.
+
+        Repeated failures are applied in closed form and leave a single
+        consolidated note.
+        """
+        self.failure_count += times
         self.urgency = True
-        self.difficulty = self.difficulty.escalate()
-        self.xp_reward *= 2
+        self.difficulty = self.difficulty.escalate(times)
+        self.xp_reward <<= times
+        entry = f"Failure streak: {self.failure_count}"
+        if times > 1:
+            entry += f" ({times} missed days)"
         if self.notes:
-            self.notes += f" | Failure streak: {self.failure_count}"
+            self.notes += f" | {entry}"
         else:
-            self.notes = f"Failure streak: {self.failure_count}"
+            self.notes = entry
 
     def reset_for_new_day(self, new_deadline: _dt.date) -> None:
         self.status = QuestStatus.PENDING
         self.deadline = new_deadline
 
 
-@dataclass
+_INDEXED_FIELDS = frozenset({"id", "status", "deadline"})
+QUEST_FIELDS = tuple(f.name for f in fields(Quest) if f.init)
+
+
+def restore_quests(count: int, columns: Dict[str, Sequence]) -> List[Quest]:
+    """Build ``count`` quests from one value column per name in ``QUEST_FIELDS``.
+
+    For decoding trusted snapshots in bulk: each column is stored straight
+    into its slot with a C-level ``map``, bypassing ``__init__`` and the
+    index tracking in ``Quest.__setattr__``.
+    """
+    quests = [object.__new__(Quest) for _ in range(count)]
+    unset = [None] * count
+    for name in ("display_line", "_ledger") + QUEST_FIELDS:
+        column = columns[name] if name in columns else unset
+        deque(map(getattr(Quest, name).__set__, quests, column), maxlen=0)
+    return quests
+
+
+class QuestIndex:
+    """Secondary indexes over a quest ledger.
+
+    Quests report ``id``/``status``/``deadline`` changes back through
+    ``Quest.__setattr__`` so the indexes stay consistent with in-place
+    mutations such as ``escalate_failure`` or ``reset_for_new_day``.
+    """
+
+    def __init__(self, quests: Iterable[Quest] = ()) -> None:
+        self._by_id: Dict[str, Quest] = {}
+        self._sorted_ids: List[str] = []
+        self._by_status: Dict[QuestStatus, Dict[str, Quest]] = {status: {} for status in QuestStatus}
+        self._by_deadline: Dict[QuestStatus, List[Tuple[int, int, str]]] = {status: [] for status in QuestStatus}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self.extend(quests)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, quest: Quest) -> None:
+        seq = self._seq.setdefault(quest.id, self._next_seq)
+        if seq == self._next_seq:
+            self._next_seq += 1
+        self._by_id[quest.id] = quest
+        bisect.insort(self._sorted_ids, quest.id)
+        self._by_status[quest.status][quest.id] = quest
+        bisect.insort(self._by_deadline[quest.status], (quest.deadline.toordinal(), seq, quest.id))
+        object.__setattr__(quest, "_ledger", self)
+
+    def extend(self, quests: Iterable[Quest]) -> None:
+        """Index many quests at once, sorting each index once instead of per insert."""
+        for quest in quests:
+            seq = self._seq.setdefault(quest.id, self._next_seq)
+            if seq == self._next_seq:
+                self._next_seq += 1
+            self._by_id[quest.id] = quest
+            self._sorted_ids.append(quest.id)
+            self._by_status[quest.status][quest.id] = quest
+            self._by_deadline[quest.status].append((quest.deadline.toordinal(), seq, quest.id))
+            object.__setattr__(quest, "_ledger", self)
+        self._sorted_ids.sort()
+        for entries in self._by_deadline.values():
+            entries.sort()
+
+    def discard(self, quest: Quest) -> None:
+        if self._by_id.get(quest.id) is not quest:
+            return
+        del self._by_id[quest.id]
+        _remove_sorted(self._sorted_ids, quest.id)
+        del self._by_status[quest.status][quest.id]
+        _remove_sorted(self._by_deadline[quest.status], (quest.deadline.toordinal(), self._seq[quest.id], quest.id))
+
+    def remove(self, quest: Quest) -> None:
+        self.discard(quest)
+        self._seq.pop(quest.id, None)
+        object.__setattr__(quest, "_ledger", None)
+
+    def get(self, quest_id: str) -> Optional[Quest]:
+        return self._by_id.get(quest_id)
+
+    def with_prefix(self, prefix: str) -> List[Quest]:
+        """Return every quest whose id starts with ``prefix``, in id order."""
+        ids = self._sorted_ids
+        start = bisect.bisect_left(ids, prefix)
+        matches = []
+        for quest_id in ids[start:]:
+            if not quest_id.startswith(prefix):
+                break
+            matches.append(self._by_id[quest_id])
+        metrics.count("quests_scanned", len(matches))
+        return matches
+
+    def with_status(self, status: QuestStatus) -> Iterator[Quest]:
+        """Quests with ``status`` in insertion order."""
+        metrics.count("quests_scanned", len(self._by_status[status]))
+        return iter(self._by_status[status].values())
+
+    def count(self, status: QuestStatus) -> int:
+        return len(self._by_status[status])
+
+    def due_between(self, status: QuestStatus, first: _dt.date, last: _dt.date) -> List[Quest]:
+        """Quests with ``status`` whose deadline falls in ``[first, last]``."""
+        entries = self._by_deadline[status]
+        lo = bisect.bisect_left(entries, (first.toordinal(),))
+        hi = bisect.bisect_left(entries, (last.toordinal() + 1,))
+        metrics.count("quests_scanned", hi - lo)
+        return [self._by_id[quest_id] for _, _, quest_id in entries[lo:hi]]
+
+    def due_before(self, status: QuestStatus, day: _dt.date) -> List[Quest]:
+        """Quests with ``status`` whose deadline is strictly before ``day``."""
+        entries = self._by_deadline[status]
+        hi = bisect.bisect_left(entries, (day.toordinal(),))
+        metrics.count("quests_scanned", hi)
+        return [self._by_id[quest_id] for _, _, quest_id in entries[:hi]]
+
+
+def _remove_sorted(items: list, value) -> None:
+    idx = bisect.bisect_left(items, value)
+    if idx < len(items) and items[idx] == value:
+        del items[idx]
+
+
+@dataclass(slots=True)
 class SkillTrackProgress:
+    """Live streak plus a completion calendar that failures never erase.
+
+    ``calendar`` is an int bitset: bit ``i`` is set when the skill had a
+    completion on day ordinal ``calendar_epoch + i``. Range counts and streak
+    lookups are a shift, a mask and ``bit_count``/``bit_length``.
+    """
+
     skill_name: str
     streak: int = 0
     last_completed: Optional[_dt.date] = None
+    calendar_epoch: Optional[int] = None
+    calendar: int = 0
+    longest_streak: int = 0
 
     def register_completion(self, today: _dt.date) -> None:
         if self.last_completed == today - _dt.timedelta(days=1):
@@ -104,13 +263,75 @@ class SkillTrackProgress:
         else:
             self.streak = 1
         self.last_completed = today
+        self.mark_day(today)
 
     def break_streak(self) -> None:
         self.streak = 0
         self.last_completed = None
 
-
-@dataclass
+    def mark_day(self, day: _dt.date) -> None:
+        ordinal = day.toordinal()
+        if self.calendar_epoch is None:
+            self.calendar_epoch = ordinal
+        elif ordinal < self.calendar_epoch:
+            self.calendar <<= self.calendar_epoch - ordinal
+            self.calendar_epoch = ordinal
+        offset = ordinal - self.calendar_epoch
+        self.calendar |= 1 << offset
+        if offset == self.calendar.bit_length() - 1:
+            self.longest_streak = max(self.longest_streak, self.streak_as_of(day))
+        else:  # backfilled day: it may join two runs
+            self.longest_streak = _longest_run(self.calendar)
+
+    def completed_on(self, day: _dt.date) -> bool:
+        offset = self._offset(day)
+        return offset >= 0 and bool(self.calendar >> offset & 1)
+
+    def completions_between(self, first: _dt.date, last: _dt.date) -> int:
+        """Days from ``first`` through ``last`` inclusive with a completion."""
+        return self.window(first, (last - first).days + 1).bit_count()
+
+    def window(self, first: _dt.date, days: int) -> int:
+        """Bitset of the ``days`` days from ``first``; bit ``i`` is ``first + i``."""
+        if days <= 0 or self.calendar_epoch is None:
+            return 0
+        offset = self._offset(first)
+        bits = self.calendar >> offset if offset >= 0 else self.calendar << -offset
+        return bits & ((1 << days) - 1)
+
+    def streak_as_of(self, day: _dt.date) -> int:
+        """Length of the run of completed days ending on ``day``."""
+        offset = self._offset(day)
+        if offset < 0 or not self.calendar >> offset & 1:
+            return 0
+        mask = (1 << (offset + 1)) - 1
+        gaps = ~self.calendar & mask
+        return offset + 1 if not gaps else offset - gaps.bit_length() + 1
+
+    def calendar_bytes(self) -> bytes:
+        return self.calendar.to_bytes((self.calendar.bit_length() + 7) // 8, "little")
+
+    def load_calendar(self, epoch: Optional[int], data: bytes) -> None:
+        self.calendar_epoch = epoch
+        self.calendar = int.from_bytes(data, "little")
+        self.longest_streak = _longest_run(self.calendar)
+
+    def _offset(self, day: _dt.date) -> int:
+        if self.calendar_epoch is None:
+            return -1
+        return day.toordinal() - self.calendar_epoch
+
+
+def _longest_run(bits: int) -> int:
+    # Each step shortens every run of ones by one, so the step count is the longest run.
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+@dataclass(slots=True)
 class PlayerProgress:
     name: str = "Houssam"
     level: int = 1
@@ -119,6 +340,9 @@ class PlayerProgress:
     last_login: Optional[_dt.date] = None
     titles: List[str] = field(default_factory=list)
     skill_tracks: Dict[str, SkillTrackProgress] = field(default_factory=dict)
+    # Unlocked achievement id -> unlock day, and progress toward the locked ones.
+    achievements: Dict[str, _dt.date] = field(default_factory=dict)
+    achievement_counters: Dict[str, int] = field(default_factory=dict)
 
     def ensure_track(self, skill_name: str) -> SkillTrackProgress:
         if skill_name not in self.skill_tracks:
@@ -126,20 +350,346 @@ class PlayerProgress:
         return self.skill_tracks[skill_name]
 
 
+OUTCOMES = ("completed", "failed", "missed")
+_OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+_TREE_CODES = {member: code for code, member in enumerate(SkillTree)}
+_DIFFICULTY_CODES = {member: code for code, member in enumerate(Difficulty)}
+_INT64_MAX = 2**63 - 1
+# column name -> array typecode
+HISTORY_COLUMNS = (
+    ("days", "i"),
+    ("timestamps", "d"),
+    ("outcomes", "B"),
+    ("trees", "B"),
+    ("skills", "I"),
+    ("difficulties", "B"),
+    ("xp", "q"),
+)
+
+
+class EventHistory:
+    """Append-only outcome log stored as one typed array per column.
+
+    Each row is ``(day ordinal, unix timestamp, outcome, tree, skill code,
+    difficulty, xp)``. Rows arrive in game-day order, so ``days`` stays
+    sorted and date windows resolve with bisect.
+    """
+
+    def __init__(self) -> None:
+        self.skill_names: List[str] = []
+        self._skill_codes: Dict[str, int] = {}
+        for name, typecode in HISTORY_COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def record(
+        self,
+        outcome: str,
+        quest: Quest,
+        day: _dt.date,
+        xp: int = 0,
+        timestamp: Optional[float] = None,
+    ) -> List:
+        """Append one outcome and return it as a journal-ready row."""
+        row = [
+            day.toordinal(),
+            time.time() if timestamp is None else timestamp,
+            _OUTCOME_CODES[outcome],
+            _TREE_CODES[quest.tree],
+            quest.skill,
+            _DIFFICULTY_CODES[quest.difficulty],
+            min(xp, _INT64_MAX),
+        ]
+        self.append_rows([row])
+        return row
+
+    def append_rows(self, rows: Iterable[Sequence]) -> None:
+        for day, timestamp, outcome, tree, skill, difficulty, xp in rows:
+            self.days.append(day)
+            self.timestamps.append(timestamp)
+            self.outcomes.append(outcome)
+            self.trees.append(tree)
+            self.skills.append(self.skill_code(skill))
+            self.difficulties.append(difficulty)
+            self.xp.append(xp)
+
+    def drop_last(self, count: int) -> None:
+        """Remove the ``count`` most recent rows (all of them if there are fewer)."""
+        if count > 0:
+            for name, _ in HISTORY_COLUMNS:
+                del getattr(self, name)[-count:]
+            # Codes follow first appearance, so the rows left use a prefix of the skill table.
+            used = max(self.skills, default=-1) + 1
+            for skill in self.skill_names[used:]:
+                del self._skill_codes[skill]
+            del self.skill_names[used:]
+
+    def skill_code(self, skill: str) -> int:
+        code = self._skill_codes.get(skill)
+        if code is None:
+            code = len(self.skill_names)
+            self.skill_names.append(skill)
+            self._skill_codes[skill] = code
+        return code
+
+    def window(self, first: Optional[_dt.date] = None, last: Optional[_dt.date] = None) -> slice:
+        """Row slice covering game days ``first`` through ``last`` inclusive."""
+        lo = bisect.bisect_left(self.days, first.toordinal()) if first else 0
+        hi = bisect.bisect_right(self.days, last.toordinal()) if last else len(self.days)
+        return slice(lo, hi)
+
+    def column_bytes(self) -> Dict[str, bytes]:
+        """Every column as little-endian array bytes, keyed by column name."""
+        columns = {}
+        for name, _ in HISTORY_COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            columns[name] = column.tobytes()
+        return columns
+
+    @classmethod
+    def from_columns(cls, skill_names: Iterable[str], columns: Dict[str, bytes]) -> "EventHistory":
+        """Rebuild a history from :meth:`column_bytes` output."""
+        history = cls()
+        for skill in skill_names:
+            history.skill_code(skill)
+        for name, typecode in HISTORY_COLUMNS:
+            column = array(typecode)
+            column.frombytes(columns.get(name, b""))
+            if sys.byteorder == "big":
+                column.byteswap()
+            setattr(history, name, column)
+        return history
+
+    def to_payload(self) -> Dict:
+        """Encode every column as base64 of its little-endian array bytes."""
+        payload: Dict = {"skill_names": list(self.skill_names)}
+        for name, data in self.column_bytes().items():
+            payload[name] = base64.b64encode(data).decode("ascii")
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Optional[Dict]) -> "EventHistory":
+        if not payload:
+            return cls()
+        columns = {name: base64.b64decode(payload.get(name, "")) for name, _ in HISTORY_COLUMNS}
+        return cls.from_columns(payload.get("skill_names", []), columns)
+
+    def rows(self, window: slice = slice(None)) -> Iterable[List]:
+        """Yield rows in the same shape :meth:`record` returns."""
+        for idx in range(*window.indices(len(self))):
+            yield [
+                self.days[idx],
+                self.timestamps[idx],
+                self.outcomes[idx],
+                self.trees[idx],
+                self.skill_names[self.skills[idx]],
+                self.difficulties[idx],
+                self.xp[idx],
+            ]
+
+
+RECURRENCE_PATTERNS = ("daily", "weekdays", "every")
+
+
+@dataclass(slots=True)
+class RecurrenceRule:
+    """A quest that repeats on a schedule without being stored once per day.
+
+    Occurrences are expanded on demand. Only those that get completed,
+    failed or escalated are stored, as ordinary quests whose id is derived
+    from ``(rule id, date)`` so an occurrence always maps to the same quest.
+    """
+
+    title: str
+    tree: SkillTree
+    skill: str
+    difficulty: Difficulty
+    estimated_effort: str
+    xp_reward: int
+    start: _dt.date
+    pattern: str = "daily"
+    interval: int = 1
+    end: Optional[_dt.date] = None
+    streak_impact: int = 1
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def occurs_on(self, day: _dt.date) -> bool:
+        if day < self.start or (self.end is not None and day > self.end):
+            return False
+        if self.pattern == "weekdays":
+            return day.weekday() < 5
+        return (day - self.start).days % self.interval == 0
+
+    def occurrences(self, first: _dt.date, last: _dt.date) -> Iterator[_dt.date]:
+        """Days from ``first`` through ``last`` inclusive on which the rule fires."""
+        first = max(first, self.start)
+        if self.end is not None:
+            last = min(last, self.end)
+        if first > last:
+            return
+        step = self.interval if self.pattern == "every" else 1
+        # Align to the rule's own cycle so "every N days" never tests each day.
+        lag = (first - self.start).days % step
+        day = first + _dt.timedelta(days=(step - lag) % step)
+        delta = _dt.timedelta(days=step)
+        while day <= last:
+            if self.pattern != "weekdays" or day.weekday() < 5:
+                yield day
+            day += delta
+
+    def occurrence_id(self, day: _dt.date) -> str:
+        return hashlib.sha1(f"{self.id}|{day.toordinal()}".encode("ascii")).hexdigest()[:32]
+
+    def materialize(self, day: _dt.date) -> Quest:
+        return Quest(
+            title=self.title,
+            tree=self.tree,
+            skill=self.skill,
+            difficulty=self.difficulty,
+            estimated_effort=self.estimated_effort,
+            xp_reward=self.xp_reward,
+            streak_impact=self.streak_impact,
+            deadline=day,
+            id=self.occurrence_id(day),
+        )
+
+    def describe(self) -> str:
+        if self.pattern == "every" and self.interval != 1:
+            return f"every {self.interval} days"
+        return "weekdays" if self.pattern == "weekdays" else "daily"
+
+
 @dataclass
 class GameState:
     player: PlayerProgress
     quests: List[Quest]
     current_day: _dt.date
+    # Bumped on every committed save; used to detect concurrent writers.
+    version: int = field(default=0, compare=False)
+    history: EventHistory = field(default_factory=EventHistory, compare=False)
+    rules: List[RecurrenceRule] = field(default_factory=list)
+    # Set on working sets that hold only some of the stored quests.
+    partial: bool = field(default=False, compare=False)
+    index: QuestIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.index = QuestIndex(self.quests)
+
+    def add_quest(self, quest: Quest) -> None:
+        """Append ``quest`` to the ledger; use this rather than ``quests.append``."""
+        self.quests.append(quest)
+        self.index.add(quest)
+
+    def upsert_quest(self, quest: Quest) -> Quest:
+        """Insert ``quest`` or copy its fields onto the existing quest with that id."""
+        existing = self.index.get(quest.id)
+        if existing is None:
+            self.add_quest(quest)
+            return quest
+        for name in QUEST_FIELDS:
+            setattr(existing, name, getattr(quest, name))
+        return existing
+
+    def upsert_quests(self, quests: Iterable[Quest]) -> List[Quest]:
+        """Bulk :meth:`upsert_quest` that indexes in one pass; returns the stored quests.
+
+        Updating an indexed field re-sorts that index entry, so when existing
+        quests change the index is rebuilt once instead of per field.
+        """
+        stored: List[Quest] = []
+        fresh: List[Quest] = []
+        rebuild = False
+        for quest in quests:
+            existing = self.index.get(quest.id)
+            if existing is None:
+                fresh.append(quest)
+                stored.append(quest)
+                continue
+            object.__setattr__(existing, "_ledger", None)
+            for name in QUEST_FIELDS:
+                setattr(existing, name, getattr(quest, name))
+            stored.append(existing)
+            rebuild = True
+        self.quests.extend(fresh)
+        if rebuild:
+            self.index = QuestIndex(self.quests)
+        else:
+            self.index.extend(fresh)
+        return stored
+
+    def remove_quests(self, quest_ids: Iterable[str]) -> None:
+        doomed = set(quest_ids)
+        for quest_id in doomed:
+            quest = self.index.get(quest_id)
+            if quest is not None:
+                self.index.remove(quest)
+        self.quests[:] = [q for q in self.quests if q.id not in doomed]
+
+    def find_quests(self, prefix: str) -> List[Quest]:
+        """Stored quests, plus today's unstored rule occurrences, whose id starts with ``prefix``."""
+        exact = self.index.get(prefix)
+        if exact is not None:
+            return [exact]
+        matches = self.index.with_prefix(prefix)
+        today = self.current_day
+        matches.extend(q for q in self.occurrences(today, today) if q.id.startswith(prefix))
+        return matches
+
+    def upsert_rule(self, rule: RecurrenceRule) -> None:
+        for position, existing in enumerate(self.rules):
+            if existing.id == rule.id:
+                self.rules[position] = rule
+                return
+        self.rules.append(rule)
+
+    def remove_rules(self, rule_ids: Iterable[str]) -> None:
+        doomed = set(rule_ids)
+        self.rules[:] = [rule for rule in self.rules if rule.id not in doomed]
+
+    def find_rules(self, prefix: str) -> List[RecurrenceRule]:
+        return [rule for rule in self.rules if rule.id.startswith(prefix)]
+
+    def occurrences(self, first: _dt.date, last: _dt.date) -> List[Quest]:
+        """Rule occurrences due from ``first`` through ``last`` that are not stored yet.
+
+        They come back as fresh pending quests in day order; pass one to
+        :meth:`add_quest` once it is resolved or escalated.
+        """
+        found = []
+        for rule in self.rules:
+            for day in rule.occurrences(first, last):
+                if self.index.get(rule.occurrence_id(day)) is None:
+                    found.append(rule.materialize(day))
+        found.sort(key=lambda quest: quest.deadline)
+        return found
+
+    def missed_occurrences(self, first: _dt.date, last: _dt.date) -> List[Tuple[Quest, List[_dt.date]]]:
+        """The latest unstored occurrence of each rule due from ``first`` through ``last``.
+
+        Each comes back as a fresh pending quest, in deadline order, with the
+        days of the rule's earlier unstored occurrences it stands in for.
+        """
+        found = []
+        for rule in self.rules:
+            days = [day for day in rule.occurrences(first, last) if self.index.get(rule.occurrence_id(day)) is None]
+            if days:
+                found.append((rule.materialize(days[-1]), days[:-1]))
+        found.sort(key=lambda item: item[0].deadline)
+        return found
 
     def overdue_quests(self, today: _dt.date) -> List[Quest]:
-        return [q for q in self.quests if q.deadline < today and q.status == QuestStatus.PENDING]
+        return self.index.due_before(QuestStatus.PENDING, today)
 
     def quests_due_today(self, today: _dt.date) -> List[Quest]:
-        return [q for q in self.quests if q.deadline == today and q.status == QuestStatus.PENDING]
+        return self.index.due_between(QuestStatus.PENDING, today, today) + self.occurrences(today, today)
 
     def completed_today(self, today: _dt.date) -> List[Quest]:
-        return [q for q in self.quests if q.deadline == today and q.status == QuestStatus.COMPLETED]
+        return self.index.due_between(QuestStatus.COMPLETED, today, today)
 
 
 __all__ = [
@@ -150,7 +700,12 @@ __all__ = [
     "Difficulty",
     "QuestStatus",
     "Quest",
+    "QuestIndex",
     "SkillTrackProgress",
     "PlayerProgress",
+    "OUTCOMES",
+    "EventHistory",
+    "RECURRENCE_PATTERNS",
+    "RecurrenceRule",
     "GameState",
 ]
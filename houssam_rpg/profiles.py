@@ -0,0 +1,175 @@
+"""Per-player state files in a shared directory, and rollovers across all of them."""
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterator, Optional, Tuple
+
+from .catalog import CATALOG_NAMES
+from .engine import GameEngine
+from .locking import StateConflictError
+from .state import backend_suffixes, load_game_state, snapshot_suffixes
+
+PROFILES_DIR = Path("profiles")
+MAX_CONFLICT_RETRIES = 5
+_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+
+def validate_profile_name(name: str) -> str:
+    if not _NAME.fullmatch(name):
+        raise ValueError(f"Invalid profile name {name!r}: use letters, digits, '.', '_' or '-'.")
+    return name
+
+
+def profile_path(name: str, state_dir: Path = PROFILES_DIR) -> Path:
+    """State file for profile ``name``; an existing SQLite file wins over snapshots."""
+    validate_profile_name(name)
+    for suffix in _state_suffixes():
+        candidate = state_dir / f"{name}{suffix}"
+        if candidate.exists():
+            return candidate
+    return state_dir / f"{name}.json"
+
+
+def iter_profiles(state_dir: Path = PROFILES_DIR) -> Iterator[Tuple[str, Path]]:
+    """Yield ``(name, state path)`` for every profile, reading the directory lazily."""
+    if not state_dir.is_dir():
+        return
+    suffixes = _state_suffixes()
+    with os.scandir(state_dir) as entries:
+        for entry in entries:
+            stem, suffix = os.path.splitext(entry.name)
+            if suffix.lower() in suffixes and entry.name not in CATALOG_NAMES and _NAME.fullmatch(stem):
+                if entry.is_file():
+                    yield stem, Path(entry.path)
+
+
+def _state_suffixes() -> Tuple[str, ...]:
+    return backend_suffixes() + snapshot_suffixes()
+
+
+@dataclass(slots=True)
+class ProfileReport:
+    name: str
+    ok: bool
+    level: int = 0
+    rank: str = ""
+    day: str = ""
+    due_today: int = 0
+    overdue: int = 0
+    punished: int = 0
+    text: str = ""
+
+    def summary_line(self) -> str:
+        if not self.ok:
+            return f"  {self.name:<20} ERROR  {self.text}"
+        return (
+            f"  {self.name:<20} L{self.level:<4} {self.rank}-Rank  {self.day}"
+            f"  due {self.due_today:>3}  overdue {self.overdue:>3}  punished {self.punished:>3}"
+        )
+
+
+def process_profile(
+    name: str, path: Path, advance_days: Optional[int] = None, advance_to: Optional[_dt.date] = None
+) -> ProfileReport:
+    """Optionally roll one profile over, then render its briefing.
+
+    With neither ``advance_days`` nor ``advance_to`` only the briefing runs.
+    Conflicting writers are handled like the CLI does: reload and run again.
+    """
+    try:
+        for _ in range(MAX_CONFLICT_RETRIES):
+            engine = GameEngine(load_game_state(path, player_name=name), path=path)
+            state = engine.state
+            parts = []
+            punished = 0
+            target = advance_to
+            if advance_days is not None:
+                target = state.current_day + _dt.timedelta(days=advance_days)
+            try:
+                if target is not None and target > state.current_day:
+                    parts.append(engine.advance_to(target))
+                    punished = engine.escalated
+            except StateConflictError:
+                continue
+            parts.append(engine.morning_briefing())
+            today = state.current_day
+            return ProfileReport(
+                name=name,
+                ok=True,
+                level=state.player.level,
+                rank=state.player.rank,
+                day=today.isoformat(),
+                due_today=len(state.quests_due_today(today)),
+                overdue=len(state.overdue_quests(today)),
+                punished=punished,
+                text="\n".join(parts),
+            )
+        return ProfileReport(name=name, ok=False, text=f"state kept changing; gave up after {MAX_CONFLICT_RETRIES} attempts")
+    except Exception as exc:  # one broken profile must not stop the others
+        return ProfileReport(name=name, ok=False, text=f"{type(exc).__name__}: {exc}")
+
+
+def run_profiles(
+    state_dir: Path = PROFILES_DIR,
+    advance_days: Optional[int] = None,
+    advance_to: Optional[_dt.date] = None,
+    workers: Optional[int] = None,
+) -> Iterator[ProfileReport]:
+    """Process every profile on a process pool and yield reports as they finish.
+
+    Profiles are submitted from a lazy directory scan with at most a couple of
+    tasks per worker in flight, so memory stays bounded by the pool size rather
+    than the number of profiles.
+    """
+    profiles = iter_profiles(state_dir)
+    if workers == 1:
+        for name, path in profiles:
+            yield process_profile(name, path, advance_days, advance_to)
+        return
+    workers = workers or os.cpu_count() or 1
+    in_flight: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, path in profiles:
+            in_flight.append(pool.submit(process_profile, name, path, advance_days, advance_to))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def render_profiles_report(reports: Iterator[ProfileReport], heading: str, full: bool = False) -> Iterator[str]:
+    """Stream one summary line (or the full output) per profile, then the totals."""
+    total = failed = punished = overdue = 0
+    yield heading
+    for report in reports:
+        total += 1
+        if not report.ok:
+            failed += 1
+        punished += report.punished
+        overdue += report.overdue
+        if full and report.ok:
+            yield f"── {report.name} " + "─" * max(0, 68 - len(report.name))
+            yield report.text
+        else:
+            yield report.summary_line()
+    if not total:
+        yield "  — no profiles —"
+    yield f"{total} profiles · {punished} quests punished · {overdue} still overdue · {failed} errors"
+
+
+__all__ = [
+    "PROFILES_DIR",
+    "ProfileReport",
+    "iter_profiles",
+    "process_profile",
+    "profile_path",
+    "render_profiles_report",
+    "run_profiles",
+    "validate_profile_name",
+]
@@ -0,0 +1,72 @@
+"""Helpers for streaming long reports page by page instead of building one string."""
+from __future__ import annotations
+
+import sys
+from typing import IO, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+WRITE_CHUNK_LINES = 256
+
+
+class Pager:
+    """Select one page of items spread over several report sections.
+
+    Sections feed their items through :meth:`take` in order; items before the
+    page are skipped, and :attr:`more` turns true once an item past the page
+    is seen.
+    """
+
+    def __init__(self, limit: Optional[int] = None, page: int = 1) -> None:
+        self.limit = limit or None
+        self.page = max(page, 1)
+        self._skip = (self.page - 1) * self.limit if self.limit else 0
+        self._left = self.limit
+        self.more = False
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.page > 1
+
+    def take(self, items: Iterable[T], total: Optional[int] = None) -> Iterator[T]:
+        """Yield the items of ``items`` that fall on the page.
+
+        ``total``, when known, lets a section that lies wholly before the page
+        be skipped without iterating it.
+        """
+        if self.more:
+            return
+        if total is not None and self._skip >= total:
+            self._skip -= total
+            return
+        for item in items:
+            if self._skip:
+                self._skip -= 1
+                continue
+            if self._left == 0:
+                self.more = True
+                return
+            if self._left is not None:
+                self._left -= 1
+            yield item
+
+    def footer(self) -> Optional[str]:
+        if self.more:
+            return f"… more on the next page (--page {self.page + 1})"
+        return None
+
+
+def write_lines(lines: Iterable[str], stream: Optional[IO[str]] = None) -> None:
+    """Write ``lines`` as they are produced, a chunk of lines per ``write`` call."""
+    out = stream or sys.stdout
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= WRITE_CHUNK_LINES:
+            chunk.append("")
+            out.write("\n".join(chunk))
+            chunk = []
+    chunk.append("")
+    out.write("\n".join(chunk))
+
+
+__all__ = ["Pager", "write_lines"]
@@ -0,0 +1,191 @@
+"""Monte Carlo progression runs for balancing the XP curve, rank gates and doubling rule.
+
+Every simulated player is a real :class:`GameEngine` over an in-memory state
+whose saver discards events, so scheduling, completion, rollover failures and
+``award_xp`` level-ups follow exactly the rules the CLI applies.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import state as progression
+from .engine import DIVIDER, GameEngine
+from .models import Difficulty, GameState, PlayerProgress, QuestStatus
+from .state import _starter_quests, _starter_rules
+
+SIMULATION_START = _dt.date(2025, 1, 1)
+COMPLETION_ODDS = {
+    Difficulty.TUTORIAL: 0.95,
+    Difficulty.EASY: 0.9,
+    Difficulty.STANDARD: 0.8,
+    Difficulty.DEMANDING: 0.65,
+    Difficulty.BRUTAL: 0.5,
+}
+# Resolved quests are dropped after every rollover; a horizon longer than any
+# run keeps the engine from archiving to disk.
+_NO_ARCHIVE_DAYS = 365 * 1000
+
+
+@dataclass(slots=True)
+class SimulationConfig:
+    players: int = 1000
+    days: int = 365
+    seed: int = 1
+    quests_per_day: int = 3
+    completion_odds: Dict[Difficulty, float] = field(default_factory=lambda: dict(COMPLETION_ODDS))
+    templates_path: Optional[Path] = None
+    base_xp: Optional[int] = None
+    xp_growth: Optional[float] = None
+
+
+@dataclass(slots=True)
+class PlayerOutcome:
+    final_level: int
+    rank_days: Dict[str, int]
+    title_days: Dict[str, int]
+    xp_earned: int
+    doubling_xp: int
+    longest_chain: int
+
+
+def _discard_event(state: GameState, path: Optional[Path], event: Dict) -> None:
+    pass
+
+
+def simulate_player(config: SimulationConfig, player_index: int) -> PlayerOutcome:
+    """Play one player for ``config.days`` days and record when milestones landed."""
+    rng = random.Random(config.seed * 1_000_003 + player_index)
+    state = GameState(
+        player=PlayerProgress(last_login=SIMULATION_START),
+        quests=_starter_quests(SIMULATION_START),
+        current_day=SIMULATION_START,
+        rules=_starter_rules(SIMULATION_START),
+    )
+    engine = GameEngine(
+        state,
+        path=None,
+        archive_horizon_days=_NO_ARCHIVE_DAYS,
+        saver=_discard_event,
+        templates_path=config.templates_path,
+        record_undo=False,
+    )
+    catalog = engine.catalog
+    player = state.player
+    rank_days: Dict[str, int] = {player.rank: 0}
+    title_days: Dict[str, int] = {}
+    xp_earned = doubling_xp = longest_chain = 0
+    for day in range(1, config.days + 1):
+        completed = []
+        for quest in state.quests_due_today(state.current_day):
+            if rng.random() < config.completion_odds[quest.difficulty]:
+                completed.append(quest)
+                # Each failure doubled the reward; everything above the base came from the rule.
+                doubling_xp += quest.xp_reward - (quest.xp_reward >> quest.failure_count)
+                longest_chain = max(longest_chain, quest.failure_count)
+                xp_earned += quest.xp_reward
+        titles_before = len(player.titles)
+        if completed:
+            engine.complete_quests(quests=completed)
+        for title in player.titles[titles_before:]:
+            title_days.setdefault(title, day)
+        rank_days.setdefault(player.rank, day)
+        picks = [catalog[rng.randrange(len(catalog))].id for _ in range(config.quests_per_day)]
+        engine.schedule_quests(picks, due_days_from_now=1)
+        engine.advance_day()
+        state.remove_quests([q.id for q in state.index.with_status(QuestStatus.COMPLETED)])
+    return PlayerOutcome(
+        final_level=player.level,
+        rank_days=rank_days,
+        title_days=title_days,
+        xp_earned=xp_earned,
+        doubling_xp=doubling_xp,
+        longest_chain=longest_chain,
+    )
+
+
+def _simulate_chunk(config: SimulationConfig, players: Sequence[int]) -> List[PlayerOutcome]:
+    if config.base_xp is not None or config.xp_growth is not None:
+        progression.configure_progression(base_xp=config.base_xp, xp_growth=config.xp_growth)
+    return [simulate_player(config, index) for index in players]
+
+
+def run_simulation(config: SimulationConfig, workers: Optional[int] = None) -> List[PlayerOutcome]:
+    """Simulate every player, fanning chunks of players out over a process pool."""
+    indices = list(range(config.players))
+    if workers == 1 or config.players < 2:
+        return _simulate_chunk(config, indices)
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker balances load without shipping one task per player.
+    size = max(1, config.players // (workers * 4))
+    chunks = [indices[start : start + size] for start in range(0, len(indices), size)]
+    outcomes: List[PlayerOutcome] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_simulate_chunk, [config] * len(chunks), chunks):
+            outcomes.extend(chunk)
+    return outcomes
+
+
+def _percentiles(values: List[int]) -> Tuple[int, int, int]:
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return tuple(ordered[min(last, int(q * len(ordered)))] for q in (0.1, 0.5, 0.9))
+
+
+def render_report(config: SimulationConfig, outcomes: List[PlayerOutcome]) -> str:
+    total = len(outcomes)
+    lines = [
+        DIVIDER,
+        f"PROGRESSION SIMULATION · {total} players × {config.days} days".center(72),
+        DIVIDER,
+        f"Base XP {progression.BASE_XP if config.base_xp is None else config.base_xp}"
+        f" · growth {progression.XP_GROWTH if config.xp_growth is None else config.xp_growth}"
+        f" · {config.quests_per_day} planned quests/day",
+        "",
+        "Days to reach rank              reached     p10     p50     p90",
+    ]
+    for rank in sorted(progression.RANK_GATES, key=lambda r: progression.RANK_GATES[r][0]):
+        days = [o.rank_days[rank] for o in outcomes if rank in o.rank_days]
+        lines.append(_distribution_line(f"{rank}-Rank", days, total))
+    lines.append("")
+    lines.append("Days to unlock title            reached     p10     p50     p90")
+    for level in sorted(progression.TITLE_UNLOCKS):
+        title = progression.TITLE_UNLOCKS[level]
+        days = [o.title_days[title] for o in outcomes if title in o.title_days]
+        lines.append(_distribution_line(f"{title} (L{level})", days, total))
+    lines.append("")
+    shares = [round(100 * o.doubling_xp / o.xp_earned) for o in outcomes if o.xp_earned]
+    chains = [o.longest_chain for o in outcomes]
+    levels = [o.final_level for o in outcomes]
+    lines.append("Distribution                               p10     p50     p90")
+    if shares:
+        lines.append("  XP from doubling chains (%)       " + _columns(_percentiles(shares)))
+    lines.append("  Longest doubling chain (misses)   " + _columns(_percentiles(chains)))
+    lines.append("  Final level                       " + _columns(_percentiles(levels)))
+    return "\n".join(lines)
+
+
+def _distribution_line(label: str, days: List[int], total: int) -> str:
+    reached = f"{len(days) / total:7.1%}"
+    if not days:
+        return f"  {label:<28} {reached}       —       —       —"
+    return f"  {label:<28} {reached} " + _columns(_percentiles(days))
+
+
+def _columns(values: Tuple[int, int, int]) -> str:
+    return " ".join(f"{value:>7}" for value in values)
+
+
+__all__ = [
+    "COMPLETION_ODDS",
+    "SimulationConfig",
+    "PlayerOutcome",
+    "simulate_player",
+    "run_simulation",
+    "render_report",
+]
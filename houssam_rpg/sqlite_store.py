@@ -0,0 +1,464 @@
+"""SQLite storage backend with indexed quest tables."""
+from __future__ import annotations
+
+import base64
+import datetime as _dt
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import EventHistory, GameState, PlayerProgress, QuestStatus, RecurrenceRule, SkillTrackProgress
+from .state import (
+    _apply_player_header,
+    _apply_track_payload,
+    _game_state_to_payload,
+    _quests_from_payloads,
+    _rule_from_payload,
+    _player_header_to_payload,
+    _seed_achievements,
+    _seed_calendars,
+    register_backend,
+)
+
+# Bumped whenever SCHEMA or _upgrade_tables change the table layout.
+LAYOUT_VERSION = 1
+_INT64_MAX = 2**63 - 1
+# TEXT columns holding the exact decimal of an integer that outgrew 64 bits.
+_OVERFLOW_COLUMNS = (("quests", "xp_overflow"), ("player", "xp_overflow"), ("achievement_counters", "value_overflow"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player (
+    slot INTEGER PRIMARY KEY CHECK (slot = 0),
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    xp INTEGER NOT NULL,
+    rank TEXT NOT NULL,
+    last_login TEXT,
+    xp_overflow TEXT
+);
+CREATE TABLE IF NOT EXISTS titles (
+    position INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    id TEXT PRIMARY KEY,
+    unlocked TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS achievement_counters (
+    id TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    value_overflow TEXT
+);
+CREATE TABLE IF NOT EXISTS skill_tracks (
+    skill_name TEXT PRIMARY KEY,
+    streak INTEGER NOT NULL,
+    last_completed TEXT,
+    calendar_epoch INTEGER,
+    calendar BLOB NOT NULL DEFAULT x''
+);
+CREATE TABLE IF NOT EXISTS quests (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    tree TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    estimated_effort TEXT NOT NULL,
+    xp_reward INTEGER NOT NULL,
+    streak_impact INTEGER NOT NULL,
+    deadline TEXT NOT NULL,
+    status TEXT NOT NULL,
+    urgency INTEGER NOT NULL,
+    failure_count INTEGER NOT NULL,
+    notes TEXT,
+    xp_overflow TEXT
+);
+CREATE INDEX IF NOT EXISTS quests_status_deadline ON quests (status, deadline);
+CREATE TABLE IF NOT EXISTS history (
+    day INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    outcome INTEGER NOT NULL,
+    tree INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    xp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_day ON history (day);
+CREATE TABLE IF NOT EXISTS rules (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    tree TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    estimated_effort TEXT NOT NULL,
+    xp_reward INTEGER NOT NULL,
+    streak_impact INTEGER NOT NULL,
+    pattern TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    start_day TEXT NOT NULL,
+    end_day TEXT
+);
+"""
+
+QUEST_COLUMNS = (
+    "id",
+    "title",
+    "tree",
+    "skill",
+    "difficulty",
+    "estimated_effort",
+    "xp_reward",
+    "streak_impact",
+    "deadline",
+    "status",
+    "urgency",
+    "failure_count",
+    "notes",
+    # Decimal xp_reward for rewards escalated past 64 bits; xp_reward then holds the clamp.
+    "xp_overflow",
+)
+_UPSERT_QUEST = (
+    f"INSERT INTO quests ({', '.join(QUEST_COLUMNS)}) VALUES ({', '.join('?' for _ in QUEST_COLUMNS)})"
+    " ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{col} = excluded.{col}" for col in QUEST_COLUMNS if col != "id")
+)
+_SELECT_QUESTS = f"SELECT {', '.join(QUEST_COLUMNS)} FROM quests"
+# rule payload key -> column
+RULE_COLUMNS = (
+    ("id", "id"),
+    ("title", "title"),
+    ("tree", "tree"),
+    ("skill", "skill"),
+    ("difficulty", "difficulty"),
+    ("estimated_effort", "estimated_effort"),
+    ("xp_reward", "xp_reward"),
+    ("streak_impact", "streak_impact"),
+    ("pattern", "pattern"),
+    ("interval", "interval"),
+    ("start", "start_day"),
+    ("end", "end_day"),
+)
+_UPSERT_RULE = (
+    f"INSERT INTO rules ({', '.join(col for _, col in RULE_COLUMNS)})"
+    f" VALUES ({', '.join('?' for _ in RULE_COLUMNS)}) ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{col} = excluded.{col}" for _, col in RULE_COLUMNS if col != "id")
+)
+
+
+class SqliteStorage:
+    """Store the game state in SQLite so single-quest updates touch single rows."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def exists(self) -> bool:
+        if not self.path.exists():
+            return False
+        with self._connect() as conn:
+            return _has_state(conn)
+
+    def load(self) -> GameState:
+        with self._connect() as conn:
+            state = self._read_state(conn, _SELECT_QUESTS + " ORDER BY seq", (), _read_rules(conn))
+            state.history.append_rows(conn.execute("SELECT * FROM history ORDER BY rowid"))
+            return state
+
+    def load_working_set(self, id_prefixes: Sequence[str] = ()) -> GameState:
+        """Load player data plus only the quests a command needs.
+
+        Without ``id_prefixes`` the pending quests due on or before the current
+        day are loaded (the morning view), plus today's stored rule
+        occurrences so resolved ones are not shown again; with them, the
+        quests whose id starts with any of the prefixes. The outcome history
+        is not loaded either. The result must only be persisted through event
+        saves.
+        """
+        with self._connect() as conn:
+            rules = _read_rules(conn)
+            if id_prefixes:
+                ranges = " OR ".join(["(id >= ? AND id < ?)"] * len(id_prefixes))
+                params = [bound for prefix in id_prefixes for bound in (prefix, _prefix_upper_bound(prefix))]
+                state = self._read_state(conn, _SELECT_QUESTS + f" WHERE {ranges} ORDER BY seq", params, rules)
+            else:
+                current_day = _meta(conn, "current_day")
+                today = _dt.date.fromisoformat(current_day)
+                occurrence_ids = [rule.occurrence_id(day) for rule in rules for day in rule.occurrences(today, today)]
+                query = _SELECT_QUESTS + " WHERE (status = ? AND deadline <= ?)"
+                if occurrence_ids:
+                    query += f" OR id IN ({', '.join('?' for _ in occurrence_ids)})"
+                params = [QuestStatus.PENDING.value, current_day, *occurrence_ids]
+                state = self._read_state(conn, query + " ORDER BY seq", params, rules)
+        state.partial = True
+        return state
+
+    def save(self, state: GameState, event: Dict | None = None) -> None:
+        with self._connect() as conn:
+            if event is None or not _has_state(conn):
+                self._write_payload(conn, _game_state_to_payload(state))
+            else:
+                self._apply_event(conn, event)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection whose block runs as a single transaction.
+
+        The schema is created or upgraded only when the database's layout
+        stamp is missing or older than :data:`LAYOUT_VERSION`.
+        """
+        with closing(sqlite3.connect(self.path)) as conn:
+            if _layout_version(conn) < LAYOUT_VERSION:
+                tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                conn.executescript(SCHEMA)
+                with conn:
+                    _upgrade_tables(conn, tables)
+                    _set_meta(conn, "layout", LAYOUT_VERSION)
+            with conn:
+                yield conn
+
+    def _read_state(
+        self, conn: sqlite3.Connection, query: str, params: Sequence, rules: List[RecurrenceRule]
+    ) -> GameState:
+        player = PlayerProgress()
+        row = conn.execute("SELECT name, level, xp, xp_overflow, rank, last_login FROM player").fetchone()
+        if row:
+            _apply_player_header(
+                player,
+                {
+                    "name": row[0],
+                    "level": row[1],
+                    "xp": _unclamp(row[2], row[3]),
+                    "rank": row[4],
+                    "last_login": row[5],
+                },
+            )
+        player.titles = [r[0] for r in conn.execute("SELECT title FROM titles ORDER BY position")]
+        player.achievements = {
+            r[0]: _dt.date.fromisoformat(r[1]) for r in conn.execute("SELECT id, unlocked FROM achievements ORDER BY rowid")
+        }
+        player.achievement_counters = {
+            i: _unclamp(value, overflow)
+            for i, value, overflow in conn.execute("SELECT id, value, value_overflow FROM achievement_counters")
+        }
+        for name, streak, last_completed, epoch, calendar in conn.execute(
+            "SELECT skill_name, streak, last_completed, calendar_epoch, calendar FROM skill_tracks ORDER BY rowid"
+        ):
+            track = player.ensure_track(name)
+            _apply_track_payload(track, {"streak": streak, "last_completed": last_completed})
+            track.load_calendar(epoch, calendar)
+        quests = _quests_from_payloads(map(_quest_payload_from_row, conn.execute(query, params)))
+        current_day = _dt.date.fromisoformat(_meta(conn, "current_day"))
+        version = int(_meta(conn, "version", "0"))
+        return GameState(player=player, quests=quests, current_day=current_day, version=version, rules=rules)
+
+    def _write_payload(self, conn: sqlite3.Connection, payload: Dict) -> None:
+        conn.execute("DELETE FROM quests")
+        conn.execute("DELETE FROM skill_tracks")
+        conn.execute("DELETE FROM history")
+        conn.execute("DELETE FROM rules")
+        conn.execute("DELETE FROM achievement_counters")
+        self._write_header(conn, payload["current_day"], payload["player"])
+        self._write_counters(conn, payload["player"].get("achievement_counters", {}))
+        _set_meta(conn, "version", payload.get("version", 0))
+        self._write_tracks(conn, payload["player"].get("skill_tracks", {}).values())
+        self._write_quests(conn, payload.get("quests", []))
+        self._write_history(conn, EventHistory.from_payload(payload.get("history")).rows())
+        self._write_rules(conn, payload.get("rules", []))
+
+    def _apply_event(self, conn: sqlite3.Connection, event: Dict) -> None:
+        _set_meta(conn, "current_day", event["day"])
+        if "version" in event:
+            _set_meta(conn, "version", event["version"])
+        if "player" in event:
+            self._write_header(conn, event["day"], event["player"])
+        self._write_tracks(conn, event.get("tracks", {}).values())
+        conn.executemany("DELETE FROM skill_tracks WHERE skill_name = ?", ((n,) for n in event.get("removed_tracks", [])))
+        self._write_counters(conn, event.get("counters", {}))
+        self._write_quests(conn, event.get("quests", []))
+        conn.executemany("DELETE FROM quests WHERE id = ?", ((i,) for i in event.get("removed", [])))
+        if event.get("history_drop"):
+            conn.execute(
+                "DELETE FROM history WHERE rowid IN (SELECT rowid FROM history ORDER BY rowid DESC LIMIT ?)",
+                (event["history_drop"],),
+            )
+        self._write_history(conn, event.get("history", []))
+        self._write_rules(conn, event.get("rules", []))
+        conn.executemany("DELETE FROM rules WHERE id = ?", ((i,) for i in event.get("removed_rules", [])))
+
+    def _write_header(self, conn: sqlite3.Connection, current_day: str, player: Dict) -> None:
+        _set_meta(conn, "current_day", current_day)
+        conn.execute(
+            "INSERT OR REPLACE INTO player (slot, name, level, xp, xp_overflow, rank, last_login)"
+            " VALUES (0, ?, ?, ?, ?, ?, ?)",
+            (player["name"], player["level"], *_clamp(player["xp"]), player["rank"], player.get("last_login")),
+        )
+        conn.execute("DELETE FROM titles")
+        conn.executemany(
+            "INSERT INTO titles (position, title) VALUES (?, ?)", enumerate(player.get("titles", []))
+        )
+        conn.execute("DELETE FROM achievements")
+        conn.executemany("INSERT INTO achievements (id, unlocked) VALUES (?, ?)", player.get("achievements", {}).items())
+
+    def _write_counters(self, conn: sqlite3.Connection, counters: Dict[str, Optional[int]]) -> None:
+        # ``None`` marks a counter dropped because its achievement unlocked.
+        conn.executemany(
+            "DELETE FROM achievement_counters WHERE id = ?", ((i,) for i, value in counters.items() if value is None)
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO achievement_counters (id, value, value_overflow) VALUES (?, ?, ?)",
+            ((i, *_clamp(value)) for i, value in counters.items() if value is not None),
+        )
+
+    def _write_tracks(self, conn: sqlite3.Connection, tracks: Iterable[Dict]) -> None:
+        conn.executemany(
+            "INSERT INTO skill_tracks (skill_name, streak, last_completed, calendar_epoch, calendar)"
+            " VALUES (?, ?, ?, ?, ?) ON CONFLICT(skill_name) DO UPDATE SET"
+            " streak = excluded.streak, last_completed = excluded.last_completed,"
+            " calendar_epoch = excluded.calendar_epoch, calendar = excluded.calendar",
+            (
+                (
+                    t["skill_name"],
+                    t["streak"],
+                    t.get("last_completed"),
+                    t.get("calendar_epoch"),
+                    base64.b64decode(t.get("calendar", "")),
+                )
+                for t in tracks
+            ),
+        )
+
+    def _write_history(self, conn: sqlite3.Connection, rows: Iterable) -> None:
+        # The in-memory history already caps xp at 64 bits; rows from older journals may not.
+        conn.executemany(
+            "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((*row[:6], min(row[6], _INT64_MAX)) for row in rows),
+        )
+
+    def _write_rules(self, conn: sqlite3.Connection, rules: Iterable[Dict]) -> None:
+        conn.executemany(_UPSERT_RULE, (tuple(rule.get(key) for key, _ in RULE_COLUMNS) for rule in rules))
+
+    def _write_quests(self, conn: sqlite3.Connection, quests: Iterable[Dict]) -> None:
+        conn.executemany(
+            _UPSERT_QUEST, (tuple(_quest_row_value(q, col) for col in QUEST_COLUMNS) for q in quests)
+        )
+
+
+def _upgrade_tables(conn: sqlite3.Connection, tables: Iterable[str]) -> None:
+    """Add columns and tables introduced after a database was created.
+
+    ``tables`` lists the tables that existed before ``SCHEMA`` ran.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(skill_tracks)")}
+    if "calendar" not in columns:
+        _add_calendars(conn)
+    for table, column in _OVERFLOW_COLUMNS:
+        if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+    if "player" in tables and "achievements" not in tables and _has_state(conn):
+        _add_achievements(conn)
+
+
+def _add_calendars(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE skill_tracks ADD COLUMN calendar_epoch INTEGER")
+    conn.execute("ALTER TABLE skill_tracks ADD COLUMN calendar BLOB NOT NULL DEFAULT x''")
+    # Those databases kept only live streaks; rebuild calendars from the history.
+    tracks = {}
+    for name, streak, last_completed in conn.execute("SELECT skill_name, streak, last_completed FROM skill_tracks"):
+        tracks[name] = SkillTrackProgress(skill_name=name)
+        _apply_track_payload(tracks[name], {"streak": streak, "last_completed": last_completed})
+    history = EventHistory()
+    history.append_rows(conn.execute("SELECT * FROM history ORDER BY rowid"))
+    _seed_calendars(tracks, history)
+    conn.executemany(
+        "UPDATE skill_tracks SET calendar_epoch = ?, calendar = ? WHERE skill_name = ?",
+        ((t.calendar_epoch, t.calendar_bytes(), name) for name, t in tracks.items()),
+    )
+
+
+def _add_achievements(conn: sqlite3.Connection) -> None:
+    # Those databases had level titles only; start achievement progress from the history.
+    player = PlayerProgress(titles=[r[0] for r in conn.execute("SELECT title FROM titles ORDER BY position")])
+    history = EventHistory()
+    history.append_rows(conn.execute("SELECT * FROM history ORDER BY rowid"))
+    _seed_achievements(player, history)
+    payload = _player_header_to_payload(player)
+    conn.execute("DELETE FROM titles")
+    conn.executemany("INSERT INTO titles (position, title) VALUES (?, ?)", enumerate(payload["titles"]))
+    conn.executemany("INSERT INTO achievements (id, unlocked) VALUES (?, ?)", payload["achievements"].items())
+    conn.executemany("INSERT INTO achievement_counters (id, value) VALUES (?, ?)", player.achievement_counters.items())
+
+
+def _read_rules(conn: sqlite3.Connection) -> List[RecurrenceRule]:
+    query = f"SELECT {', '.join(col for _, col in RULE_COLUMNS)} FROM rules ORDER BY seq"
+    return [_rule_from_payload(dict(zip((key for key, _ in RULE_COLUMNS), row))) for row in conn.execute(query)]
+
+
+def _layout_version(conn: sqlite3.Connection) -> int:
+    try:
+        return int(_meta(conn, "layout", "0"))
+    except sqlite3.OperationalError:  # no meta table yet
+        return 0
+
+
+def _has_state(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM meta WHERE key = 'current_day'").fetchone() is not None
+
+
+def _meta(conn: sqlite3.Connection, key: str, default: Optional[str] = None) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        if default is None:
+            raise KeyError(key)
+        return default
+    return row[0]
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _clamp(value: int) -> Tuple[int, Optional[str]]:
+    """Split ``value`` into what fits an INTEGER column and, if it does not, its exact decimal."""
+    if -_INT64_MAX <= value <= _INT64_MAX:
+        return value, None
+    return max(-_INT64_MAX, min(value, _INT64_MAX)), str(value)
+
+
+def _unclamp(value: int, overflow: Optional[str]) -> int:
+    return value if overflow is None else int(overflow)
+
+
+def _quest_row_value(payload: Dict, column: str):
+    if column in ("xp_reward", "xp_overflow"):
+        return _clamp(payload["xp_reward"])[column == "xp_overflow"]
+    value = payload.get(column)
+    if column == "urgency":
+        return int(bool(value))
+    return value
+
+
+def _quest_payload_from_row(row: tuple) -> Dict:
+    payload = dict(zip(QUEST_COLUMNS, row))
+    payload["urgency"] = bool(payload["urgency"])
+    payload["xp_reward"] = _unclamp(payload["xp_reward"], payload.pop("xp_overflow"))
+    return payload
+
+
+register_backend(".db", SqliteStorage)
+register_backend(".sqlite", SqliteStorage)
+register_backend(".sqlite3", SqliteStorage)
+
+
+__all__ = ["SqliteStorage"]
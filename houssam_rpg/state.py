@@ -1,24 +1,51 @@
 """Persistence helpers and progression math for the Houssam RPG."""
 from __future__ import annotations
 
+import base64
+import bisect
 import datetime as _dt
 import json
+import sys
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import accumulate
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
-
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import metrics
+from .achievements import BOOK
+from .journal import (
+    append_record,
+    atomic_write_bytes,
+    discard_journal,
+    iter_records,
+    journal_path,
+    journal_size,
+)
+from .locking import StateConflictError, exclusive_lock, read_version
 from .models import (
+    OUTCOMES,
     BodySkill,
     DevSkill,
     Difficulty,
+    EventHistory,
     FaithSkill,
     GameState,
     PlayerProgress,
+    QUEST_FIELDS,
     Quest,
     QuestStatus,
+    RecurrenceRule,
+    SkillTrackProgress,
     SkillTree,
+    restore_quests,
 )
 
 STATE_PATH = Path("game_state.json")
+JOURNAL_COMPACT_BYTES = 256 * 1024
+# Bumped whenever the snapshot payload changes shape; older payloads are
+# brought forward by the hooks registered with register_migration.
+SCHEMA_VERSION = 5
 BASE_XP = 120
 XP_GROWTH = 1.45
 RANK_GATES = {
@@ -51,106 +78,488 @@ def _xp_table(up_to_level: int = 120) -> Dict[int, int]:
     return xp_requirements
 
 
+def _cumulative(table: Dict[int, int]) -> List[int]:
+    return list(accumulate((table[level] for level in range(1, len(table) + 1)), initial=0))
+
+
 XP_TABLE = _xp_table()
+# XP_CUMULATIVE[n] is the total XP needed to climb from level 1 to level n + 1.
+XP_CUMULATIVE = _cumulative(XP_TABLE)
+_TITLE_LEVELS = sorted(TITLE_UNLOCKS)
+_RANK_BOUNDS = sorted((start, end, rank) for rank, (start, end) in RANK_GATES.items())
+_RANK_STARTS = [start for start, _, _ in _RANK_BOUNDS]
+
+
+def _extend_xp_table(level: int) -> None:
+    """Continue the curve past the precomputed levels up to ``level``.
+
+    Past 120 the requirements no longer fit a float, so the growth factor is
+    applied as an exact fraction with the same round-to-5 rule.
+    """
+    growth = Fraction(str(XP_GROWTH))
+    unit = growth.denominator * 5
+    top = len(XP_CUMULATIVE) - 1
+    current = XP_TABLE[top]
+    while top < level:
+        top += 1
+        steps, rest = divmod(current * growth.numerator, unit)
+        current = (steps + (2 * rest >= unit)) * 5
+        XP_TABLE[top] = current
+        XP_CUMULATIVE.append(XP_CUMULATIVE[-1] + current)
 
 
 def xp_for_next_level(level: int) -> int:
-    return XP_TABLE.get(level, XP_TABLE[max(XP_TABLE)])
+    if level >= len(XP_CUMULATIVE):
+        _extend_xp_table(level)
+    return XP_TABLE[level]
 
 
 def rank_for_level(level: int) -> str:
-    for rank, (start, end) in RANK_GATES.items():
-        if start <= level <= end:
+    slot = bisect.bisect_right(_RANK_STARTS, level) - 1
+    if slot >= 0:
+        _, end, rank = _RANK_BOUNDS[slot]
+        if level <= end:
             return rank
     if level > 70:
         return "S"
     return "E"
 
 
-def load_game_state(path: Path | None = None) -> GameState:
-    target = path or STATE_PATH
-    if target.exists():
-        with target.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-        return _game_state_from_payload(payload)
-    return _bootstrap_state()
+def configure_progression(
+    base_xp: int | None = None,
+    xp_growth: float | None = None,
+    rank_gates: Dict[str, Tuple[int, int]] | None = None,
+    title_unlocks: Dict[int, str] | None = None,
+) -> None:
+    """Swap progression constants (for balancing runs) and rebuild the derived tables."""
+    global BASE_XP, XP_GROWTH, RANK_GATES, TITLE_UNLOCKS, XP_TABLE, XP_CUMULATIVE
+    global _TITLE_LEVELS, _RANK_BOUNDS, _RANK_STARTS
+    if base_xp is not None:
+        BASE_XP = base_xp
+    if xp_growth is not None:
+        XP_GROWTH = xp_growth
+    if rank_gates is not None:
+        RANK_GATES = dict(rank_gates)
+    if title_unlocks is not None:
+        TITLE_UNLOCKS = dict(title_unlocks)
+    XP_TABLE = _xp_table()
+    XP_CUMULATIVE = _cumulative(XP_TABLE)
+    _TITLE_LEVELS = sorted(TITLE_UNLOCKS)
+    _RANK_BOUNDS = sorted((start, end, rank) for rank, (start, end) in RANK_GATES.items())
+    _RANK_STARTS = [start for start, _, _ in _RANK_BOUNDS]
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotFormat:
+    """How a full snapshot is laid out on disk.
+
+    ``magic`` identifies the format on load; ``suffixes`` pick it for new
+    files. The format with an empty ``magic`` is the fallback.
+    """
+
+    name: str
+    magic: bytes
+    suffixes: Tuple[str, ...]
+    encode: Callable[[GameState], bytes]
+    decode: Callable[[bytes], GameState]
+
+
+_SNAPSHOT_FORMATS: Dict[str, SnapshotFormat] = {}
+
+
+def register_snapshot_format(fmt: SnapshotFormat) -> None:
+    _SNAPSHOT_FORMATS[fmt.name] = fmt
+
+
+def snapshot_formats() -> Tuple[str, ...]:
+    return tuple(_SNAPSHOT_FORMATS)
+
+
+def snapshot_suffixes() -> Tuple[str, ...]:
+    return tuple(suffix for fmt in _SNAPSHOT_FORMATS.values() for suffix in fmt.suffixes)
+
+
+def detect_snapshot_format(head: bytes) -> SnapshotFormat:
+    """Pick the format whose magic ``head`` starts with; JSON otherwise."""
+    for fmt in _SNAPSHOT_FORMATS.values():
+        if fmt.magic and head.startswith(fmt.magic):
+            return fmt
+    return _SNAPSHOT_FORMATS["json"]
+
+
+class JsonStorage:
+    """Default backend: a full snapshot plus an append-only JSON journal.
+
+    The snapshot is JSON or any registered :class:`SnapshotFormat`; an
+    existing file keeps its format, new files follow the path suffix, and
+    ``snapshot_format`` overrides both.
+    """
+
+    def __init__(self, path: Path, snapshot_format: Optional[str] = None) -> None:
+        self.path = path
+        self.journal = journal_path(path)
+        self.snapshot_format = snapshot_format
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> GameState:
+        """Load the last snapshot and replay the journaled mutations made after it.
+
+        Records stamped with a version the snapshot already has are skipped,
+        see :meth:`compact`.
+        """
+        with self.path.open("rb") as fh:
+            raw = fh.read()
+        metrics.count("bytes_read", len(raw))
+        state = detect_snapshot_format(raw).decode(raw)
+        snapshot_version = state.version
+        metrics.count("bytes_read", journal_size(self.journal))
+        for event in iter_records(self.journal):
+            if event.get("version", snapshot_version + 1) > snapshot_version:
+                apply_event(state, event)
+        return state
+
+    def save(self, state: GameState, event: Dict | None = None) -> None:
+        """Append ``event`` to the journal, or write a snapshot when there is none.
+
+        The journal is folded into a fresh snapshot once it grows past
+        ``JOURNAL_COMPACT_BYTES``.
+        """
+        if event is not None and self.path.exists():
+            if append_record(self.journal, event) < JOURNAL_COMPACT_BYTES:
+                return
+        self.compact(state)
 
+    def compact(self, state: GameState) -> None:
+        """Write a full snapshot atomically and drop the journal it supersedes.
 
-def save_game_state(state: GameState, path: Path | None = None) -> None:
+        Replaying a record twice is not harmless: history rows would be
+        appended again and ``history_drop`` would remove the wrong rows. If we
+        crash between the two steps, the old journal survives next to a
+        snapshot that already contains it; :meth:`load` then skips every
+        record whose version is not newer than the snapshot's.
+        """
+        atomic_write_bytes(self.path, self._format().encode(state))
+        discard_journal(self.journal)
+
+    def _format(self) -> SnapshotFormat:
+        if self.snapshot_format:
+            try:
+                return _SNAPSHOT_FORMATS[self.snapshot_format]
+            except KeyError:
+                known = ", ".join(_SNAPSHOT_FORMATS)
+                raise ValueError(f"Unknown snapshot format {self.snapshot_format!r} (known: {known}).") from None
+        try:
+            with self.path.open("rb") as fh:
+                head = fh.read(16)
+        except FileNotFoundError:
+            head = b""
+        if head:
+            return detect_snapshot_format(head)
+        suffix = self.path.suffix.lower()
+        for fmt in _SNAPSHOT_FORMATS.values():
+            if suffix in fmt.suffixes:
+                return fmt
+        return _SNAPSHOT_FORMATS["json"]
+
+
+_BACKENDS: Dict[str, Callable[[Path], Any]] = {}
+
+
+def register_backend(suffix: str, factory: Callable[[Path], Any]) -> None:
+    """Route state paths ending in ``suffix`` to a custom storage backend."""
+    _BACKENDS[suffix.lower()] = factory
+
+
+def backend_suffixes() -> Tuple[str, ...]:
+    return tuple(_BACKENDS)
+
+
+_SAVE_HOOKS: List[Callable[[GameState, Path], None]] = []
+
+
+def register_save_hook(hook: Callable[[GameState, Path], None]) -> None:
+    """Call ``hook(state, path)`` after every committed save, while the lock is still held."""
+    _SAVE_HOOKS.append(hook)
+
+
+def storage_for(path: Path | None = None) -> Any:
+    target = path or STATE_PATH
+    factory = _BACKENDS.get(target.suffix.lower(), JsonStorage)
+    return factory(target)
+
+
+def load_game_state(path: Path | None = None, player_name: str | None = None) -> GameState:
+    """Load the state at ``path``, or a fresh one whose player is ``player_name``."""
+    storage = storage_for(path)
+    with metrics.phase("load"):
+        if storage.exists():
+            return storage.load()
+        return _bootstrap_state(player_name)
+
+
+def save_game_state(
+    state: GameState,
+    path: Path | None = None,
+    event: Dict | None = None,
+    check_version: bool = True,
+    snapshot_format: str | None = None,
+) -> None:
+    """Persist ``state`` through the backend selected by the path suffix.
+
+    ``event`` is the record built by :func:`make_event`; backends use it to
+    write only what changed. The write runs under an exclusive advisory lock
+    and raises :class:`StateConflictError` if another writer committed since
+    ``state`` was loaded. ``snapshot_format`` rewrites a snapshot+journal
+    state in full in that format.
+    """
+    target = path or STATE_PATH
+    with metrics.phase("save"), exclusive_lock(target) as lock:
+        on_disk = read_version(target)
+        if check_version and on_disk is not None and on_disk != state.version:
+            raise StateConflictError(state.version, on_disk)
+        previous = state.version
+        state.version = max(previous, on_disk or 0) + 1
+        if event is not None:
+            event["version"] = state.version
+        storage = storage_for(target)
+        if snapshot_format is not None:
+            if not isinstance(storage, JsonStorage):
+                raise ValueError(f"{target} is not a snapshot+journal state; only those can be converted.")
+            storage.snapshot_format = snapshot_format
+            event = None
+        try:
+            storage.save(state, event)
+        except BaseException:
+            state.version = previous
+            raise
+        lock.write_version(state.version)
+        for hook in _SAVE_HOOKS:
+            hook(state, target)
+
+
+def compact_game_state(state: GameState, path: Path | None = None) -> None:
+    """Fold the journal into a fresh snapshot without committing a new version.
+
+    ``state`` must be the state last committed to ``path``; the rewrite runs
+    under the writer lock and raises :class:`StateConflictError` otherwise.
+    Backends without a journal are left untouched.
+    """
     target = path or STATE_PATH
-    payload = _game_state_to_payload(state)
-    with target.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2, ensure_ascii=False)
+    with metrics.phase("save"), exclusive_lock(target):
+        on_disk = read_version(target)
+        if on_disk is not None and on_disk != state.version:
+            raise StateConflictError(state.version, on_disk)
+        storage = storage_for(target)
+        if isinstance(storage, JsonStorage) and storage.exists():
+            storage.compact(state)
+
+
+def make_event(
+    kind: str,
+    state: GameState,
+    quests: Sequence[Quest] = (),
+    tracks: Sequence[SkillTrackProgress] = (),
+    player: bool = False,
+    removed: Sequence[str] = (),
+    history: Sequence[List] = (),
+    rules: Sequence[RecurrenceRule] = (),
+    counters: Iterable[str] = (),
+) -> Dict:
+    """Build a journal record holding the post-mutation image of what changed.
+
+    ``history`` holds the outcome rows the mutation appended to
+    ``state.history``; ``rules`` the recurrence rules added or changed;
+    ``counters`` the ids of achievement counters that moved.
+    """
+    event: Dict[str, Any] = {"event": kind, "day": state.current_day.isoformat()}
+    if player:
+        event["player"] = _player_header_to_payload(state.player)
+    if tracks:
+        event["tracks"] = {track.skill_name: _track_to_payload(track) for track in tracks}
+    if quests:
+        event["quests"] = [_quest_to_payload(q) for q in quests]
+    if removed:
+        event["removed"] = list(removed)
+    if history:
+        event["history"] = list(history)
+    if rules:
+        event["rules"] = [_rule_to_payload(rule) for rule in rules]
+    if counters:
+        # ``None`` drops a counter whose achievement unlocked.
+        values = state.player.achievement_counters
+        event["counters"] = {achievement_id: values.get(achievement_id) for achievement_id in counters}
+    return event
+
+
+def merge_events(events: Sequence[Dict]) -> Dict:
+    """Fold consecutive events into one record with the same replay result."""
+    merged: Dict[str, Any] = {"event": "batch", "day": events[-1]["day"]}
+    if "version" in events[-1]:
+        merged["version"] = events[-1]["version"]
+    quests: Dict[str, Dict] = {}
+    tracks: Dict[str, Dict] = {}
+    removed: Dict[str, None] = {}
+    removed_tracks: Dict[str, None] = {}
+    removed_rules: Dict[str, None] = {}
+    history: List[List] = []
+    # Rows to drop from the history before ``history`` is appended.
+    history_drop = 0
+    rules: Dict[str, Dict] = {}
+    counters: Dict[str, Optional[int]] = {}
+    for event in events:
+        counters.update(event.get("counters", {}))
+        drop = event.get("history_drop", 0)
+        if drop:
+            history_drop += max(0, drop - len(history))
+            del history[max(0, len(history) - drop) :]
+        history.extend(event.get("history", []))
+        for rule in event.get("rules", []):
+            removed_rules.pop(rule["id"], None)
+            rules[rule["id"]] = rule
+        for rule_id in event.get("removed_rules", []):
+            rules.pop(rule_id, None)
+            removed_rules[rule_id] = None
+        if "player" in event:
+            merged["player"] = event["player"]
+        for name, track in event.get("tracks", {}).items():
+            removed_tracks.pop(name, None)
+            tracks[name] = track
+        for name in event.get("removed_tracks", []):
+            tracks.pop(name, None)
+            removed_tracks[name] = None
+        for quest_payload in event.get("quests", []):
+            removed.pop(quest_payload["id"], None)
+            quests[quest_payload["id"]] = quest_payload
+        for quest_id in event.get("removed", []):
+            quests.pop(quest_id, None)
+            removed[quest_id] = None
+    if tracks:
+        merged["tracks"] = tracks
+    if removed_tracks:
+        merged["removed_tracks"] = list(removed_tracks)
+    if quests:
+        merged["quests"] = list(quests.values())
+    if removed:
+        merged["removed"] = list(removed)
+    if history_drop:
+        merged["history_drop"] = history_drop
+    if history:
+        merged["history"] = history
+    if rules:
+        merged["rules"] = list(rules.values())
+    if removed_rules:
+        merged["removed_rules"] = list(removed_rules)
+    if counters:
+        merged["counters"] = counters
+    return merged
+
+
+def apply_event(state: GameState, event: Dict) -> None:
+    """Replay a journal record produced by :func:`make_event` or :mod:`.undo`."""
+    state.current_day = _dt.date.fromisoformat(event["day"])
+    state.version = event.get("version", state.version)
+    if "player" in event:
+        _apply_player_header(state.player, event["player"])
+    for name, track_payload in event.get("tracks", {}).items():
+        _apply_track_payload(state.player.ensure_track(name), track_payload)
+    for name in event.get("removed_tracks", []):
+        state.player.skill_tracks.pop(name, None)
+    _apply_counters(state.player, event.get("counters", {}))
+    for quest_payload in event.get("quests", []):
+        state.upsert_quest(_quest_from_payload(quest_payload))
+    if "removed" in event:
+        state.remove_quests(event["removed"])
+    state.history.drop_last(event.get("history_drop", 0))
+    state.history.append_rows(event.get("history", []))
+    for rule_payload in event.get("rules", []):
+        state.upsert_rule(_rule_from_payload(rule_payload))
+    if "removed_rules" in event:
+        state.remove_rules(event["removed_rules"])
 
 
 def award_xp(state: GameState, xp: int) -> List[str]:
-    """Grant XP and return any unlocked titles."""
+    """Grant XP and return any unlocked titles.
+
+    The new level is found with one bisect over the cumulative XP table, so a
+    grant worth hundreds of levels costs the same as a single level-up.
+    """
     player = state.player
     player.xp += xp
+    if player.xp < xp_for_next_level(player.level):
+        return []
+    total = XP_CUMULATIVE[player.level - 1] + player.xp
+    while XP_CUMULATIVE[-1] <= total:
+        _extend_xp_table(len(XP_CUMULATIVE) + 63)
+    previous = player.level
+    player.level = bisect.bisect_right(XP_CUMULATIVE, total)
+    player.xp = total - XP_CUMULATIVE[player.level - 1]
+    player.rank = rank_for_level(player.level)
     titles_unlocked: List[str] = []
-    while True:
-        threshold = xp_for_next_level(player.level)
-        if player.xp < threshold:
-            break
-        player.xp -= threshold
-        player.level += 1
-        player.rank = rank_for_level(player.level)
-        maybe_title = TITLE_UNLOCKS.get(player.level)
-        if maybe_title and maybe_title not in player.titles:
-            player.titles.append(maybe_title)
-            titles_unlocked.append(maybe_title)
+    first = bisect.bisect_right(_TITLE_LEVELS, previous)
+    last = bisect.bisect_right(_TITLE_LEVELS, player.level)
+    for level in _TITLE_LEVELS[first:last]:
+        title = TITLE_UNLOCKS[level]
+        if title not in player.titles:
+            player.titles.append(title)
+            titles_unlocked.append(title)
     return titles_unlocked
 
 
-def _bootstrap_state() -> GameState:
+def _bootstrap_state(player_name: str | None = None) -> GameState:
     today = _dt.date.today()
     starter_quests = _starter_quests(today)
     player = PlayerProgress(last_login=today)
-    return GameState(player=player, quests=starter_quests, current_day=today)
+    if player_name:
+        player.name = player_name
+    return GameState(player=player, quests=starter_quests, current_day=today, rules=_starter_rules(today))
 
 
-def _starter_quests(today: _dt.date) -> List[Quest]:
+def _starter_rules(today: _dt.date) -> List[RecurrenceRule]:
+    """The daily habits every new player starts with."""
     return [
-        Quest(
+        RecurrenceRule(
             title="Pray all 5 obligatory prayers",
             tree=SkillTree.FAITH,
             skill=FaithSkill.PRAYER_CONSISTENCY.value,
             difficulty=Difficulty.TUTORIAL,
             estimated_effort="5 checkpoints",
             xp_reward=40,
-            streak_impact=1,
-            deadline=today,
+            start=today,
         ),
-        Quest(
+        RecurrenceRule(
             title="Recite Qur'an for 5 minutes",
             tree=SkillTree.FAITH,
             skill=FaithSkill.QURAN_RECITATION.value,
             difficulty=Difficulty.TUTORIAL,
             estimated_effort="5 minutes",
             xp_reward=25,
-            streak_impact=1,
-            deadline=today,
+            start=today,
         ),
-        Quest(
+        RecurrenceRule(
             title="Perform 3 sets of 2 push-ups",
             tree=SkillTree.BODY,
             skill=BodySkill.STRENGTH.value,
             difficulty=Difficulty.TUTORIAL,
             estimated_effort="3 sets",
             xp_reward=30,
-            streak_impact=1,
-            deadline=today,
+            start=today,
         ),
-        Quest(
+        RecurrenceRule(
             title="Walk outdoors for 5 minutes",
             tree=SkillTree.BODY,
             skill=BodySkill.ENDURANCE.value,
             difficulty=Difficulty.TUTORIAL,
             estimated_effort="5 minutes",
             xp_reward=20,
-            streak_impact=1,
-            deadline=today,
+            start=today,
         ),
+    ]
+
+
+def _starter_quests(today: _dt.date) -> List[Quest]:
+    return [
         Quest(
             title="Count 1→20 and log it",
             tree=SkillTree.DEV,
@@ -193,25 +602,103 @@ def _quest_to_payload(quest: Quest) -> Dict:
     return data
 
 
+def _quest_values(payload: Dict) -> Tuple:
+    """Decode one quest payload into its field values, in ``QUEST_FIELDS`` order."""
+    # Titles, skills and effort labels repeat across thousands of quests;
+    # interning lets every copy share one string object.
+    return (
+        sys.intern(payload["title"]),
+        SkillTree(payload["tree"]),
+        sys.intern(payload["skill"]),
+        Difficulty(payload.get("difficulty", Difficulty.TUTORIAL.value)),
+        sys.intern(payload["estimated_effort"]),
+        payload["xp_reward"],
+        payload["streak_impact"],
+        _dt.date.fromisoformat(payload["deadline"]),
+        QuestStatus(payload.get("status", QuestStatus.PENDING.value)),
+        payload.get("id"),
+        payload.get("urgency", False),
+        payload.get("failure_count", 0),
+        payload.get("notes"),
+    )
+
+
 def _quest_from_payload(payload: Dict) -> Quest:
-    return Quest(
+    return Quest(*_quest_values(payload))
+
+
+def _quests_from_payloads(payloads: Iterable[Dict]) -> List[Quest]:
+    """Decode a whole ledger at once through ``restore_quests``."""
+    rows = [_quest_values(payload) for payload in payloads]
+    return restore_quests(len(rows), dict(zip(QUEST_FIELDS, zip(*rows))))
+
+
+def _rule_to_payload(rule: RecurrenceRule) -> Dict:
+    return {
+        "id": rule.id,
+        "title": rule.title,
+        "tree": rule.tree.value,
+        "skill": rule.skill,
+        "difficulty": rule.difficulty.value,
+        "estimated_effort": rule.estimated_effort,
+        "xp_reward": rule.xp_reward,
+        "streak_impact": rule.streak_impact,
+        "pattern": rule.pattern,
+        "interval": rule.interval,
+        "start": rule.start.isoformat(),
+        "end": rule.end.isoformat() if rule.end else None,
+    }
+
+
+def _rule_from_payload(payload: Dict) -> RecurrenceRule:
+    return RecurrenceRule(
+        id=payload["id"],
         title=payload["title"],
         tree=SkillTree(payload["tree"]),
         skill=payload["skill"],
-        difficulty=Difficulty(payload.get("difficulty", Difficulty.TUTORIAL.value)),
+        difficulty=Difficulty(payload["difficulty"]),
         estimated_effort=payload["estimated_effort"],
         xp_reward=payload["xp_reward"],
-        streak_impact=payload["streak_impact"],
-        deadline=_dt.date.fromisoformat(payload["deadline"]),
-        status=QuestStatus(payload.get("status", QuestStatus.PENDING.value)),
-        id=payload.get("id"),
-        urgency=payload.get("urgency", False),
-        failure_count=payload.get("failure_count", 0),
-        notes=payload.get("notes"),
+        streak_impact=payload.get("streak_impact", 1),
+        pattern=payload.get("pattern", "daily"),
+        interval=payload.get("interval", 1),
+        start=_dt.date.fromisoformat(payload["start"]),
+        end=_dt.date.fromisoformat(payload["end"]) if payload.get("end") else None,
     )
 
 
-def _player_to_payload(player: PlayerProgress) -> Dict:
+def _track_to_payload(track: SkillTrackProgress) -> Dict:
+    return {
+        "skill_name": track.skill_name,
+        "streak": track.streak,
+        "last_completed": track.last_completed.isoformat() if track.last_completed else None,
+        "calendar_epoch": track.calendar_epoch,
+        "calendar": base64.b64encode(track.calendar_bytes()).decode("ascii"),
+    }
+
+
+def _apply_track_payload(track: SkillTrackProgress, payload: Dict) -> None:
+    track.streak = payload.get("streak", 0)
+    last_completed = payload.get("last_completed")
+    track.last_completed = _dt.date.fromisoformat(last_completed) if last_completed else None
+    if "calendar" in payload:
+        track.load_calendar(payload.get("calendar_epoch"), base64.b64decode(payload["calendar"]))
+
+
+def _seed_calendars(tracks: Dict[str, SkillTrackProgress], history: EventHistory) -> None:
+    """Rebuild completion calendars from the outcome history and each live streak."""
+    completed = OUTCOMES.index("completed")
+    for ordinal, outcome, skill in zip(history.days, history.outcomes, history.skills):
+        track = tracks.get(history.skill_names[skill]) if outcome == completed else None
+        if track is not None:
+            track.mark_day(_dt.date.fromordinal(ordinal))
+    for track in tracks.values():
+        if track.last_completed is not None:
+            for back in range(track.streak - 1, -1, -1):
+                track.mark_day(track.last_completed - _dt.timedelta(days=back))
+
+
+def _player_header_to_payload(player: PlayerProgress) -> Dict:
     return {
         "name": player.name,
         "level": player.level,
@@ -219,17 +706,41 @@ def _player_to_payload(player: PlayerProgress) -> Dict:
         "rank": player.rank,
         "last_login": player.last_login.isoformat() if player.last_login else None,
         "titles": list(player.titles),
-        "skill_tracks": {
-            name: {
-                "skill_name": track.skill_name,
-                "streak": track.streak,
-                "last_completed": track.last_completed.isoformat() if track.last_completed else None,
-            }
-            for name, track in player.skill_tracks.items()
-        },
+        "achievements": {achievement_id: day.isoformat() for achievement_id, day in player.achievements.items()},
     }
 
 
+def _apply_player_header(player: PlayerProgress, payload: Dict) -> None:
+    player.name = payload.get("name", player.name)
+    player.level = payload.get("level", player.level)
+    player.xp = payload.get("xp", player.xp)
+    player.rank = payload.get("rank", player.rank)
+    last_login = payload.get("last_login")
+    player.last_login = _dt.date.fromisoformat(last_login) if last_login else None
+    player.titles = list(payload.get("titles", player.titles))
+    if "achievements" in payload:
+        player.achievements = {
+            achievement_id: _dt.date.fromisoformat(day) for achievement_id, day in payload["achievements"].items()
+        }
+
+
+def _apply_counters(player: PlayerProgress, counters: Dict[str, Optional[int]]) -> None:
+    for achievement_id, value in counters.items():
+        if value is None:
+            player.achievement_counters.pop(achievement_id, None)
+        else:
+            player.achievement_counters[achievement_id] = value
+
+
+def _player_to_payload(player: PlayerProgress) -> Dict:
+    payload = _player_header_to_payload(player)
+    payload["skill_tracks"] = {
+        name: _track_to_payload(track) for name, track in player.skill_tracks.items()
+    }
+    payload["achievement_counters"] = dict(player.achievement_counters)
+    return payload
+
+
 def _player_from_payload(payload: Dict) -> PlayerProgress:
     player = PlayerProgress(
         name=payload.get("name", "Houssam"),
@@ -238,28 +749,135 @@ def _player_from_payload(payload: Dict) -> PlayerProgress:
         rank=payload.get("rank", "E"),
         last_login=_dt.date.fromisoformat(payload["last_login"]) if payload.get("last_login") else None,
         titles=payload.get("titles", []),
+        achievements={
+            achievement_id: _dt.date.fromisoformat(day)
+            for achievement_id, day in payload.get("achievements", {}).items()
+        },
+        achievement_counters=dict(payload.get("achievement_counters", {})),
     )
     for name, track_payload in payload.get("skill_tracks", {}).items():
-        track = player.ensure_track(name)
-        track.streak = track_payload.get("streak", 0)
-        last_completed = track_payload.get("last_completed")
-        track.last_completed = _dt.date.fromisoformat(last_completed) if last_completed else None
+        _apply_track_payload(player.ensure_track(name), track_payload)
     return player
 
 
 def _game_state_to_payload(state: GameState) -> Dict:
     return {
+        "schema": SCHEMA_VERSION,
+        "version": state.version,
         "player": _player_to_payload(state.player),
         "quests": [_quest_to_payload(q) for q in state.quests],
         "current_day": state.current_day.isoformat(),
+        "history": state.history.to_payload(),
+        "rules": [_rule_to_payload(rule) for rule in state.rules],
     }
 
 
 def _game_state_from_payload(payload: Dict) -> GameState:
+    payload = upgrade_payload(payload)
     player = _player_from_payload(payload["player"])
-    quests = [_quest_from_payload(q) for q in payload.get("quests", [])]
+    quests = _quests_from_payloads(payload.get("quests", []))
+    metrics.count("quests_decoded", len(quests))
     current_day = _dt.date.fromisoformat(payload["current_day"])
-    return GameState(player=player, quests=quests, current_day=current_day)
+    return GameState(
+        player=player,
+        quests=quests,
+        current_day=current_day,
+        version=payload.get("version", 0),
+        history=EventHistory.from_payload(payload.get("history")),
+        rules=[_rule_from_payload(rule) for rule in payload["rules"]],
+    )
+
+
+_MIGRATIONS: Dict[int, Callable[[Dict], Dict]] = {}
+
+
+def register_migration(from_schema: int, upgrade: Callable[[Dict], Dict]) -> None:
+    """Register ``upgrade`` to turn a ``from_schema`` payload into the next schema."""
+    _MIGRATIONS[from_schema] = upgrade
+
+
+def upgrade_payload(payload: Dict) -> Dict:
+    """Run the registered migrations until ``payload`` is at ``SCHEMA_VERSION``.
+
+    Payloads without a ``schema`` key predate schema stamps and count as 1.
+    """
+    schema = payload.get("schema", 1)
+    if schema > SCHEMA_VERSION:
+        raise ValueError(f"State schema {schema} is newer than this version supports ({SCHEMA_VERSION}).")
+    while schema < SCHEMA_VERSION:
+        payload = _MIGRATIONS[schema](payload)
+        schema += 1
+        payload["schema"] = schema
+    return payload
+
+
+def _upgrade_unstamped(payload: Dict) -> Dict:
+    # Files from before version stamps and the outcome history.
+    payload.setdefault("version", 0)
+    payload.setdefault("history", None)
+    return payload
+
+
+register_migration(1, _upgrade_unstamped)
+
+
+def _add_calendars(payload: Dict) -> Dict:
+    # Schema 2 tracks kept only the live streak.
+    track_payloads = payload["player"].get("skill_tracks", {})
+    tracks = {}
+    for name, track_payload in track_payloads.items():
+        tracks[name] = SkillTrackProgress(skill_name=name)
+        _apply_track_payload(tracks[name], track_payload)
+    _seed_calendars(tracks, EventHistory.from_payload(payload.get("history")))
+    for name, track in tracks.items():
+        track_payloads[name] = _track_to_payload(track)
+    return payload
+
+
+register_migration(2, _add_calendars)
+
+
+def _add_rules(payload: Dict) -> Dict:
+    # Schema 3 had no recurrence rules; habits were stored as plain quests.
+    payload.setdefault("rules", [])
+    return payload
+
+
+register_migration(3, _add_rules)
+
+
+def _seed_achievements(player: PlayerProgress, history: EventHistory) -> None:
+    """Start achievement progress for a player who predates achievements."""
+    player.achievements = {}
+    player.achievement_counters = {}
+    BOOK.replay_history(player, history)
+
+
+def _add_achievements(payload: Dict) -> Dict:
+    # Schema 4 players had level titles only.
+    player_payload = payload["player"]
+    player = PlayerProgress(titles=list(player_payload.get("titles", [])))
+    _seed_achievements(player, EventHistory.from_payload(payload.get("history")))
+    player_payload["titles"] = player.titles
+    player_payload.update(
+        achievements=_player_header_to_payload(player)["achievements"],
+        achievement_counters=player.achievement_counters,
+    )
+    return payload
+
+
+register_migration(4, _add_achievements)
+
+
+def _encode_json(state: GameState) -> bytes:
+    return json.dumps(_game_state_to_payload(state), indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json(raw: bytes) -> GameState:
+    return _game_state_from_payload(json.loads(raw))
+
+
+register_snapshot_format(SnapshotFormat("json", b"", (".json",), _encode_json, _decode_json))
 
 
 def quest_templates() -> Iterable[Dict[str, Any]]:
@@ -310,8 +928,29 @@ def quest_templates() -> Iterable[Dict[str, Any]]:
 
 __all__ = [
     "STATE_PATH",
+    "JOURNAL_COMPACT_BYTES",
+    "SCHEMA_VERSION",
+    "JsonStorage",
+    "SnapshotFormat",
+    "detect_snapshot_format",
+    "register_snapshot_format",
+    "register_migration",
+    "snapshot_formats",
+    "snapshot_suffixes",
+    "upgrade_payload",
+    "register_backend",
+    "backend_suffixes",
+    "register_save_hook",
+    "storage_for",
     "load_game_state",
     "save_game_state",
+    "compact_game_state",
+    "make_event",
+    "merge_events",
+    "apply_event",
     "award_xp",
+    "configure_progression",
+    "rank_for_level",
+    "xp_for_next_level",
     "quest_templates",
 ]
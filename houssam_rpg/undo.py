@@ -0,0 +1,246 @@
+"""Bounded undo/redo history stored as per-operation deltas.
+
+Each operation the engine commits becomes one step: the before-images of the
+quests, tracks, rules and achievement counters it touched (plus the player
+header and day), and the journal event holding their after-images. Untouched
+objects are never copied, so a step costs what the operation changed and the
+last ``UNDO_DEPTH`` steps together cost the sum of their changes.
+
+Steps live in ``<state>.undo/`` as one ``<seq>.json`` file each, next to a
+small ``HEAD`` file with both stacks and the state version they belong to.
+A history whose version does not match the state (another tool rewrote the
+file, or the state was started over) is dropped rather than replayed.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .models import GameState, Quest, RecurrenceRule
+from .state import (
+    _player_header_to_payload,
+    _quest_to_payload,
+    _rule_to_payload,
+    _track_to_payload,
+    register_save_hook,
+)
+
+UNDO_DEPTH = 100
+UNDO_STACKS = ("undo", "redo")
+
+
+def undo_dir(target: Path) -> Path:
+    return target.with_name(target.name + ".undo")
+
+
+class UndoRecorder:
+    """Before-images of what the current operation touches, taken on first touch."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.day: Optional[_dt.date] = None
+        self.player: Dict = {}
+        self.counters: Dict[str, int] = {}
+        # id/name -> payload before the operation, or None if it did not exist.
+        self.quests: Dict[str, Optional[Dict]] = {}
+        self.tracks: Dict[str, Optional[Dict]] = {}
+        self.rules: Dict[str, Optional[Dict]] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.day is not None
+
+    def begin(self, state: GameState) -> None:
+        """Remember the day and player header; later calls in the same operation are no-ops."""
+        if self.day is None:
+            self.day = state.current_day
+            self.player = _player_header_to_payload(state.player)
+            self.counters = dict(state.player.achievement_counters)
+
+    def quest(self, state: GameState, quest: Quest) -> None:
+        self.begin(state)
+        if quest.id not in self.quests:
+            stored = state.index.get(quest.id)
+            self.quests[quest.id] = _quest_to_payload(stored) if stored is not None else None
+
+    def track(self, state: GameState, skill: str) -> None:
+        self.begin(state)
+        if skill not in self.tracks:
+            track = state.player.skill_tracks.get(skill)
+            self.tracks[skill] = _track_to_payload(track) if track is not None else None
+
+    def rule(self, state: GameState, rule: RecurrenceRule) -> None:
+        self.begin(state)
+        if rule.id not in self.rules:
+            stored = next((existing for existing in state.rules if existing.id == rule.id), None)
+            self.rules[rule.id] = _rule_to_payload(stored) if stored is not None else None
+
+    def undo_event(self, forward: Dict) -> Dict:
+        """The event that puts back everything ``forward`` changed.
+
+        Quests that ``forward`` moved to the archive stay there.
+        """
+        event: Dict = {"event": "undo", "day": self.day.isoformat()}
+        if "player" in forward:
+            event["player"] = self.player
+        _split(event, "tracks", "removed_tracks", self.tracks, keyed=True)
+        _split(event, "quests", "removed", self.quests)
+        _split(event, "rules", "removed_rules", self.rules)
+        if "history" in forward:
+            event["history_drop"] = len(forward["history"])
+        if "counters" in forward:
+            event["counters"] = {key: self.counters.get(key) for key in forward["counters"]}
+        return event
+
+
+def _split(event: Dict, restore: str, remove: str, images: Dict[str, Optional[Dict]], keyed: bool = False) -> None:
+    kept = {key: payload for key, payload in images.items() if payload is not None}
+    gone = [key for key, payload in images.items() if payload is None]
+    if kept:
+        event[restore] = kept if keyed else list(kept.values())
+    if gone:
+        event[remove] = gone
+
+
+@dataclass(slots=True)
+class _Pending:
+    """Stack changes made since the last save of one state file."""
+
+    head: Dict
+    steps: Dict[int, str] = field(default_factory=dict)
+    doomed: Set[int] = field(default_factory=set)
+
+
+_PENDING: Dict[Path, _Pending] = {}
+
+
+def _read_head(target: Path) -> Optional[Dict]:
+    try:
+        return json.loads((undo_dir(target) / "HEAD").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _pending(target: Path, version: int) -> _Pending:
+    pending = _PENDING.get(target)
+    if pending is None:
+        head = _read_head(target)
+        if head is None or head.get("version") != version:
+            # Out of step with the state: start over, deleting the old steps on the next save.
+            stale = set(head["undo"] + head["redo"]) if head else set()
+            head = {"version": version, "next": head["next"] if head else 0, "undo": [], "redo": []}
+            pending = _Pending(head, doomed=stale)
+        else:
+            pending = _Pending(head)
+        _PENDING[target] = pending
+    return pending
+
+
+def record_step(target: Path, version: int, label: str, undo: Dict, redo: Dict) -> None:
+    """Push a new step for the operation about to be committed on top of ``version``."""
+    pending = _pending(target, version)
+    head = pending.head
+    seq = head["next"]
+    head["next"] = seq + 1
+    redo = {key: value for key, value in redo.items() if key != "version"}
+    pending.steps[seq] = json.dumps({"label": label, "undo": undo, "redo": redo}, ensure_ascii=False)
+    head["undo"].append(seq)
+    for dropped in head["redo"] + head["undo"][:-UNDO_DEPTH]:
+        pending.steps.pop(dropped, None)
+        pending.doomed.add(dropped)
+    head["redo"] = []
+    head["undo"] = head["undo"][-UNDO_DEPTH:]
+
+
+def record_sync(target: Path, version: int) -> None:
+    """Keep the history valid across a commit that has nothing to undo."""
+    _pending(target, version)
+
+
+def peek_step(target: Path, version: int, stack: str) -> Dict | str:
+    """The step ``undo``/``redo`` would replay next, or a message saying why there is none."""
+    pending = _PENDING.get(target)
+    head = pending.head if pending is not None else _read_head(target)
+    if head is None or (pending is None and head.get("version") != version) or not head[stack]:
+        return f"Nothing to {stack}."
+    seq = head[stack][-1]
+    raw = pending.steps.get(seq) if pending is not None else None
+    try:
+        step = json.loads(raw if raw is not None else (undo_dir(target) / f"{seq}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return f"Nothing to {stack}: step {seq} is missing from {undo_dir(target)}."
+    step["seq"] = seq
+    return step
+
+
+def record_move(target: Path, version: int, stack: str) -> None:
+    """Move the top step of ``stack`` onto the other stack once it has been replayed."""
+    head = _pending(target, version).head
+    other = UNDO_STACKS[1 - UNDO_STACKS.index(stack)]
+    head[other].append(head[stack].pop())
+
+
+def discard_pending(target: Path) -> None:
+    """Forget stack changes whose commit failed."""
+    _PENDING.pop(target, None)
+
+
+def write_pending(state: GameState, target: Path) -> None:
+    """Save hook: persist the steps and stacks staged for ``target`` at the committed version.
+
+    Like the briefing artifact, the history is a convenience: files are
+    renamed into place without an fsync and write errors leave it stale,
+    which the version check then catches.
+    """
+    pending = _PENDING.pop(target, None)
+    if pending is None:
+        return
+    directory = undo_dir(target)
+    pending.head["version"] = state.version
+    try:
+        directory.mkdir(exist_ok=True)
+        for seq, data in pending.steps.items():
+            _write_file(directory / f"{seq}.json", data)
+        _write_file(directory / "HEAD", json.dumps(pending.head))
+        for seq in pending.doomed:
+            (directory / f"{seq}.json").unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _write_file(path: Path, data: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def undo_depth(target: Path, version: int) -> Dict[str, int]:
+    """How many steps each stack holds, as far as the state at ``version`` is concerned."""
+    pending = _PENDING.get(target)
+    head = pending.head if pending is not None else _read_head(target)
+    if head is None or (pending is None and head.get("version") != version):
+        return {stack: 0 for stack in UNDO_STACKS}
+    return {stack: len(head[stack]) for stack in UNDO_STACKS}
+
+
+register_save_hook(write_pending)
+
+
+__all__ = [
+    "UNDO_DEPTH",
+    "UndoRecorder",
+    "discard_pending",
+    "peek_step",
+    "record_move",
+    "record_step",
+    "record_sync",
+    "undo_depth",
+    "undo_dir",
+    "write_pending",
+]
@@ -0,0 +1,266 @@
+"""Resident watch mode: sleep until the next deadline, reminder or midnight, then redraw.
+
+Upcoming wake-ups live in a heap, and the loop sleeps until the earliest
+one:
+
+- midnight rolls the game day over to the wall-clock day;
+- reminders and deadline warnings add a line to the footer;
+- a periodic sync compares the on-disk version stamp (a 20-byte read) so
+  commands run from other terminals show up.
+
+Each redraw rewrites only the screen lines that differ from the last frame,
+and quest lines come from the memoized ``display_line``, so an idle watcher
+costs close to nothing.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import heapq
+import itertools
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, List, Optional, Sequence
+
+from .engine import DIVIDER, GameEngine
+from .locking import StateConflictError, read_version
+from .models import QuestStatus
+from .state import STATE_PATH, load_game_state
+
+WARN_BEFORE = _dt.timedelta(hours=2)
+CHECK_EVERY = _dt.timedelta(seconds=60)
+DEADLINE_LOOKAHEAD_DAYS = 7
+MAX_CONFLICT_RETRIES = 5
+
+
+@dataclass(order=True, slots=True)
+class Wakeup:
+    when: _dt.datetime
+    seq: int
+    kind: str = field(compare=False)
+    # Deadline wake-ups are rebuilt whenever the ledger changes; older generations are skipped.
+    generation: int = field(default=0, compare=False)
+    day: Optional[_dt.date] = field(default=None, compare=False)
+
+
+class Scheduler:
+    """Min-heap of wake-ups ordered by time, ties broken by insertion order."""
+
+    def __init__(self) -> None:
+        self._heap: List[Wakeup] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, when: _dt.datetime, kind: str, generation: int = 0, day: Optional[_dt.date] = None) -> None:
+        heapq.heappush(self._heap, Wakeup(when, next(self._seq), kind, generation, day))
+
+    def next_time(self) -> Optional[_dt.datetime]:
+        return self._heap[0].when if self._heap else None
+
+    def pop_due(self, now: _dt.datetime) -> List[Wakeup]:
+        due = []
+        while self._heap and self._heap[0].when <= now:
+            due.append(heapq.heappop(self._heap))
+        return due
+
+
+class Screen:
+    """Redraw a frame of lines, touching only the lines that changed.
+
+    On a terminal, changed lines are rewritten in place with cursor
+    addressing. Elsewhere (logs, pipes) the first frame is printed whole and
+    later frames only print their added (``+``) and removed (``-``) lines.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        self.stream = stream or sys.stdout
+        self.tty = self.stream.isatty()
+        self.lines: List[str] = []
+        self.drawn = False
+
+    def draw(self, lines: Sequence[str]) -> int:
+        """Show ``lines`` and return how many lines were written."""
+        old = self.lines
+        out = []
+        if self.tty:
+            if not self.drawn:
+                out.append("\x1b[2J")
+            for row, line in enumerate(lines):
+                if not self.drawn or row >= len(old) or old[row] != line:
+                    out.append(f"\x1b[{row + 1};1H\x1b[2K{line}")
+            if len(lines) < len(old):
+                out.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+            written = len(out) - (0 if self.drawn else 1)
+        elif not self.drawn:
+            out = [line + "\n" for line in lines]
+            written = len(out)
+        else:
+            before, after = set(old), set(lines)
+            out = [f"- {line}\n" for line in old if line not in after]
+            out += [f"+ {line}\n" for line in lines if line not in before]
+            written = len(out)
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        self.lines = list(lines)
+        self.drawn = True
+        return written
+
+
+class Watcher:
+    """Keep one state file's briefing on screen and roll it over at midnight."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        reminders: Sequence[_dt.time] = (),
+        warn_before: _dt.timedelta = WARN_BEFORE,
+        check_every: _dt.timedelta = CHECK_EVERY,
+        player_name: Optional[str] = None,
+        clock: Callable[[], _dt.datetime] = _dt.datetime.now,
+        sleep: Callable[[float], None] = time.sleep,
+        stream: Optional[IO[str]] = None,
+    ) -> None:
+        self.path = path or STATE_PATH
+        self.reminders = sorted(reminders)
+        self.warn_before = warn_before
+        self.check_every = check_every
+        self.player_name = player_name
+        self.clock = clock
+        self.sleep = sleep
+        self.screen = Screen(stream)
+        self.scheduler = Scheduler()
+        self.engine: Optional[GameEngine] = None
+        self.notice = ""
+        self._generation = 0
+
+    def run(self, max_wakeups: Optional[int] = None) -> None:
+        """Loop until interrupted (or after ``max_wakeups`` wake-ups)."""
+        now = self.clock()
+        self._load()
+        self._roll_over(now)
+        self.scheduler.push(now + self.check_every, "sync")
+        for reminder in self.reminders:
+            self.scheduler.push(_next_at(now, reminder), "reminder")
+        self._schedule_deadlines(now)
+        self._redraw()
+        wakeups = 0
+        while max_wakeups is None or wakeups < max_wakeups:
+            wake_at = self.scheduler.next_time()
+            if wake_at is None:
+                return
+            delay = (wake_at - self.clock()).total_seconds()
+            if delay > 0:
+                self.sleep(delay)
+            now = self.clock()
+            for wakeup in self.scheduler.pop_due(now):
+                self._handle(wakeup, now)
+            wakeups += 1
+            self._redraw()
+
+    # ------------------------------------------------------------------
+    # Wake-up handlers
+    # ------------------------------------------------------------------
+    def _handle(self, wakeup: Wakeup, now: _dt.datetime) -> None:
+        if wakeup.kind == "midnight":
+            self._roll_over(now)
+            self._schedule_deadlines(now)
+        elif wakeup.kind == "sync":
+            on_disk = read_version(self.path)
+            if on_disk is not None and on_disk != self.engine.state.version:
+                self._load()
+                self._schedule_deadlines(now)
+            self.scheduler.push(now + self.check_every, "sync")
+        elif wakeup.kind == "reminder":
+            due = len(self.engine.state.quests_due_today(self.engine.state.current_day))
+            self.notice = f"⏰ {now:%H:%M} reminder · {due} quests still due today"
+            self.scheduler.push(_next_at(now, wakeup.when.time()), "reminder")
+        elif wakeup.kind == "deadline" and wakeup.generation == self._generation:
+            left = self.engine.state.quests_due_today(wakeup.day)
+            if left:
+                self.notice = f"⚠ {len(left)} quests due {wakeup.day.isoformat()} expire at midnight"
+
+    def _roll_over(self, now: _dt.datetime) -> None:
+        """Advance the game day to today, then queue the next midnight.
+
+        A conflicting writer triggers a reload and another attempt; if the
+        state keeps changing, the rollover is retried after ``check_every``.
+        """
+        today = now.date()
+        for _ in range(MAX_CONFLICT_RETRIES):
+            if self.engine.state.current_day >= today:
+                break
+            try:
+                self.engine.advance_to(today)
+            except StateConflictError:
+                self._load()
+                continue
+            self.notice = f"🌙 Rolled over to {today.isoformat()} · {self.engine.escalated} quests escalated"
+            break
+        else:
+            self.notice = (
+                f"⚠ Rollover to {today.isoformat()} gave up after {MAX_CONFLICT_RETRIES} conflicting writes;"
+                f" retrying at {now + self.check_every:%H:%M:%S}"
+            )
+            self.scheduler.push(now + self.check_every, "midnight")
+            return
+        self.scheduler.push(_midnight_after(today), "midnight")
+
+    def _schedule_deadlines(self, now: _dt.datetime) -> None:
+        """Queue a warning ``warn_before`` each upcoming deadline day ends."""
+        self._generation += 1
+        state = self.engine.state
+        today = state.current_day
+        last = today + _dt.timedelta(days=DEADLINE_LOOKAHEAD_DAYS)
+        days = {quest.deadline for quest in state.index.due_between(QuestStatus.PENDING, today, last)}
+        days.update(quest.deadline for quest in state.occurrences(today, last))
+        for day in days:
+            when = _midnight_after(day) - self.warn_before
+            if when > now:
+                self.scheduler.push(when, "deadline", self._generation, day)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        self.engine = GameEngine(load_game_state(self.path, player_name=self.player_name), path=self.path)
+
+    def _redraw(self) -> None:
+        lines = list(self.engine.iter_morning())
+        lines.append(DIVIDER)
+        footer = f"watching {self.path} · rollover at midnight"
+        if self.reminders:
+            footer += " · reminders " + ", ".join(f"{at:%H:%M}" for at in self.reminders)
+        lines.append(footer)
+        if self.notice:
+            lines.append(self.notice)
+        self.screen.draw(lines)
+
+
+def _midnight_after(day: _dt.date) -> _dt.datetime:
+    return _dt.datetime.combine(day + _dt.timedelta(days=1), _dt.time.min)
+
+
+def _next_at(now: _dt.datetime, at: _dt.time) -> _dt.datetime:
+    when = _dt.datetime.combine(now.date(), at)
+    return when if when > now else when + _dt.timedelta(days=1)
+
+
+def watch(
+    path: Path | None = None,
+    reminders: Sequence[_dt.time] = (),
+    warn_before: _dt.timedelta = WARN_BEFORE,
+    check_every: _dt.timedelta = CHECK_EVERY,
+    player_name: Optional[str] = None,
+) -> None:
+    """Run the watcher until Ctrl+C."""
+    try:
+        Watcher(path, reminders, warn_before, check_every, player_name).run()
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["Scheduler", "Screen", "Watcher", "Wakeup", "watch"]
@@ -1,68 +1,628 @@
 """Command-line driver for the Houssam Ascension prototype."""
 from __future__ import annotations
 
+import sys
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+
+def _cached_morning(argv: list[str]) -> str | None:
+    """The saved briefing for ``[--state PATH] morning --cached``, read before the package is imported.
+
+    Mirrors ``houssam_rpg.briefing.read_briefing``; anything else (other
+    options, a missing or stale artifact) returns ``None`` and the command
+    runs normally.
+    """
+    state = "game_state.json"
+    if len(argv) == 4 and argv[0] == "--state":
+        state, argv = argv[1], argv[2:]
+    if argv != ["morning", "--cached"]:
+        return None
+    try:
+        with open(state + ".briefing", encoding="utf-8") as fh:
+            head = fh.readline().split()
+            body = fh.read()
+        with open(state + ".lock", "rb") as fh:
+            stamp = fh.read(20).decode("ascii")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if len(head) != 3 or head[0] != "HRPG-BRIEFING" or head[1] != stamp:
+        return None
+    return body
+
+
+if __name__ == "__main__":
+    _CACHED = _cached_morning(sys.argv[1:])
+    if _CACHED is not None:
+        sys.stdout.write(_CACHED)
+        raise SystemExit(0)
+
 import argparse
+import contextlib
+import cProfile
+import datetime as _dt
+import io
+import json
+import shlex
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from houssam_rpg import (
+    GameEngine,
+    daemon,
+    load_game_state,
+    metrics,
+    profiles,
+    save_game_state,
+    simulator,
+    storage_for,
+    watch,
+)
+from houssam_rpg.briefing import read_briefing, refresh_briefing
+from houssam_rpg.export import EXPORT_FORMATS, EXPORT_KINDS, export_format_for, write_export
+from houssam_rpg.importer import CONFLICT_POLICIES, IMPORT_FORMATS
+from houssam_rpg.locking import StateConflictError
+from houssam_rpg.models import Difficulty, GameState, QuestStatus, SkillTree
+from houssam_rpg.render import write_lines
+from houssam_rpg.state import SCHEMA_VERSION, STATE_PATH, snapshot_formats
 
-from houssam_rpg import GameEngine, load_game_state
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+# Commands that only render; their engine call is reported as the render phase.
+READ_ONLY_COMMANDS = {"morning", "status", "templates", "history", "stats", "achievements", "export"}
+MAX_CONFLICT_RETRIES = 5
+Output = Union[str, Iterable[str]]
+BATCH_COMMANDS = {"complete", "fail", "plan", "advance", "archive"}
+# Parsed arguments holding file paths, resolved against the caller's directory by a daemon.
+PATH_ARGUMENTS = ("state", "state_dir", "templates", "output", "file", "destination")
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Command interface for the Houssam life-RPG."
     )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=None,
+        help="State file to use (.json, or .db/.sqlite for the SQLite backend)",
+    )
+    parser.add_argument(
+        "--player",
+        metavar="NAME",
+        help="Use this player's profile in the state directory (created on first use)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=profiles.PROFILES_DIR,
+        help="Directory holding one state file per player profile (default: profiles)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time per phase, I/O bytes, quest counts and peak memory to stderr",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        metavar="FILE",
+        help="Write the profile metrics as JSON to FILE ('-' for stdout)",
+    )
+    parser.add_argument("--cprofile", metavar="FILE", help="Dump cProfile stats for the whole command")
+    parser.add_argument(
+        "--templates",
+        type=Path,
+        default=None,
+        help="Quest blueprint catalog (.json or .jsonl; default: quest_templates.jsonl beside the state)",
+    )
     sub = parser.add_subparsers(dest="command")
 
-    sub.add_parser("morning", help="Show the dawn mission briefing")
-    sub.add_parser("status", help="Display current progression state")
+    morning = sub.add_parser("morning", help="Show the dawn mission briefing")
+    morning.add_argument(
+        "--cached", action="store_true", help="Print the briefing saved at the last change while it is still current"
+    )
+    _add_page_options(morning)
+    status = sub.add_parser("status", help="Display current progression state")
+    status.add_argument("--all", action="store_true", help="Include quests moved to the archive")
+    status.add_argument(
+        "--status",
+        dest="statuses",
+        type=QuestStatus,
+        action="append",
+        metavar="{" + ",".join(s.value for s in QuestStatus) + "}",
+        help="Only quests with this status (repeatable)",
+    )
+    status.add_argument("--summary", action="store_true", help="Show counts per status instead of quests")
+    _add_page_options(status)
 
     plan = sub.add_parser("plan", help="List quest blueprints for night planning")
-    plan.add_argument("index", type=int, nargs="?", help="Template index to schedule")
+    plan.add_argument("template_ids", nargs="*", help="Blueprint ids to schedule (prefix ok)")
     plan.add_argument("--due", type=int, default=1, help="Days from now for the deadline")
+    _add_template_filters(plan)
+
+    complete = sub.add_parser("complete", help="Mark quests as complete")
+    complete.add_argument("quest_ids", nargs="*", help="Quest identifiers (prefix ok)")
+    _add_quest_selectors(complete)
+
+    fail = sub.add_parser("fail", help="Mark quests as failed")
+    fail.add_argument("quest_ids", nargs="*", help="Quest identifiers (prefix ok)")
+    _add_quest_selectors(fail)
+
+    batch = sub.add_parser("batch", help="Apply complete/fail/plan/advance/archive lines from a script at once")
+    batch.add_argument("script_file", nargs="?", default="-", help="Script file ('-' or omitted for stdin)")
+    batch.add_argument("--script", help=argparse.SUPPRESS)
+
+    recur = sub.add_parser("recur", help="Repeat a blueprint on a schedule, or list and stop recurring quests")
+    recur.add_argument("template_id", nargs="?", help="Blueprint to repeat (omit to list recurring quests)")
+    every = recur.add_mutually_exclusive_group()
+    every.add_argument("--weekdays", action="store_true", help="Monday to Friday only")
+    every.add_argument("--every", type=int, metavar="N", help="Every N days (default: daily)")
+    recur.add_argument("--start", type=_dt.date.fromisoformat, help="First day (default: today)")
+    recur.add_argument("--stop", metavar="RULE_ID", help="End a recurring quest after today")
+
+    templates = sub.add_parser("templates", help="List quest blueprint catalog")
+    _add_template_filters(templates)
+    advance = sub.add_parser("advance", help="Trigger midnight rollover")
+    jump = advance.add_mutually_exclusive_group()
+    jump.add_argument("--days", type=int, default=1, help="Number of midnights to roll over at once")
+    jump.add_argument("--to", type=_dt.date.fromisoformat, help="Catch up to this day (YYYY-MM-DD)")
+
+    sub.add_parser("undo", help="Revert the last operation (up to 100 are kept)")
+    sub.add_parser("redo", help="Re-apply the last undone operation")
+
+    archive = sub.add_parser("archive", help="Move old resolved quests to compressed archive segments")
+    archive.add_argument("--older-than", type=int, default=None, help="Horizon in days (default 30)")
 
-    complete = sub.add_parser("complete", help="Mark a quest as complete")
-    complete.add_argument("quest_id", help="Quest identifier (prefix ok)")
+    history = sub.add_parser("history", help="List archived quests")
+    history.add_argument("--from", dest="first_month", help="First month to include (YYYY-MM)")
+    history.add_argument("--to", dest="last_month", help="Last month to include (YYYY-MM)")
 
-    fail = sub.add_parser("fail", help="Mark a quest as failed")
-    fail.add_argument("quest_id", help="Quest identifier (prefix ok)")
+    stats = sub.add_parser("stats", help="Completion rates, XP per week and failure heatmap")
+    stats.add_argument("--days", type=int, default=90, help="Window length in days")
+    stats.add_argument("--by", choices=("skill", "tree"), default="skill", help="Grouping")
 
-    sub.add_parser("templates", help="List quest blueprint catalog")
-    sub.add_parser("advance", help="Trigger midnight rollover")
+    sub.add_parser("achievements", help="List achievements with unlock days and progress")
+
+    migrate = sub.add_parser("migrate", help="Copy the current state into another storage file")
+    migrate.add_argument("destination", type=Path, help="Target file (.json, .hrpg, .db or .sqlite)")
+
+    convert = sub.add_parser("convert", help="Rewrite the state snapshot in place as JSON or binary")
+    convert.add_argument("format", choices=snapshot_formats(), help="Snapshot format to write")
+
+    export = sub.add_parser("export", help="Stream quests, skill tracks or the outcome history as JSONL or CSV")
+    export.add_argument(
+        "kind", nargs="?", choices=EXPORT_KINDS, default="quests", help="What to export (default: quests)"
+    )
+    export.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output, else jsonl)")
+    export.add_argument("--output", "-o", type=Path, help="Write to this file instead of stdout")
+    export.add_argument(
+        "--status",
+        dest="statuses",
+        type=QuestStatus,
+        action="append",
+        metavar="{" + ",".join(s.value for s in QuestStatus) + "}",
+        help="Only quests with this status (repeatable)",
+    )
+    export.add_argument(
+        "--tree", type=SkillTree, metavar="{" + ",".join(t.value for t in SkillTree) + "}", help="Only this skill tree"
+    )
+    export.add_argument("--from", dest="first", type=_dt.date.fromisoformat, help="First deadline/day (YYYY-MM-DD)")
+    export.add_argument("--to", dest="last", type=_dt.date.fromisoformat, help="Last deadline/day (YYYY-MM-DD)")
+    export.add_argument("--all", action="store_true", help="Include quests moved to the archive")
+
+    import_cmd = sub.add_parser("import", help="Bulk-load quest records from a JSONL or CSV file in one save")
+    import_cmd.add_argument("file", type=Path, help="Quest records (.jsonl or .csv)")
+    import_cmd.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from the file suffix)")
+    import_cmd.add_argument(
+        "--on-conflict",
+        choices=CONFLICT_POLICIES,
+        default="skip",
+        help="What to do with ids already in the ledger (default: skip)",
+    )
+
+    sub.add_parser("serve", help="Keep the state resident and serve commands over a Unix socket")
+
+    watch_cmd = sub.add_parser("watch", help="Stay resident: live briefing, reminders and automatic midnight rollover")
+    watch_cmd.add_argument(
+        "--remind", action="append", type=_dt.time.fromisoformat, default=[], metavar="HH:MM",
+        help="Daily reminder time (repeatable)",
+    )
+    watch_cmd.add_argument(
+        "--warn-before", type=int, default=120, metavar="MINUTES", help="Warn this long before a deadline day ends"
+    )
+    watch_cmd.add_argument(
+        "--check-every", type=int, default=60, metavar="SECONDS", help="How often to look for changes made elsewhere"
+    )
+
+    advance_all = sub.add_parser("advance-all", help="Roll over every profile in the state directory")
+    jump_all = advance_all.add_mutually_exclusive_group()
+    jump_all.add_argument("--days", type=int, default=1, help="Midnights to roll over per profile")
+    jump_all.add_argument("--to", type=_dt.date.fromisoformat, help="Catch every profile up to this day")
+    _add_all_profiles_options(advance_all)
+    morning_all = sub.add_parser("morning-all", help="Briefing summary for every profile in the state directory")
+    _add_all_profiles_options(morning_all)
+
+    simulate = sub.add_parser("simulate", help="Play out many synthetic players to balance the XP curve")
+    simulate.add_argument("--players", type=int, default=1000, help="Simulated players")
+    simulate.add_argument("--years", type=float, default=1.0, help="Simulated years per player")
+    simulate.add_argument("--quests-per-day", type=int, default=3, help="Blueprints planned each night")
+    simulate.add_argument("--seed", type=int, default=1, help="Random seed")
+    simulate.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    simulate.add_argument("--base-xp", type=int, default=None, help="Override BASE_XP")
+    simulate.add_argument("--xp-growth", type=float, default=None, help="Override XP_GROWTH")
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
-    state = load_game_state()
-    engine = GameEngine(state)
+def _add_all_profiles_options(command: argparse.ArgumentParser) -> None:
+    command.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    command.add_argument("--full", action="store_true", help="Print each profile's full output, not one line")
+
+
+def _resolve_profile(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Point ``args.state`` at the selected profile's state file."""
+    if args.player is None:
+        return
+    if args.state is not None:
+        parser.error("--player and --state are mutually exclusive")
+    try:
+        args.state = profiles.profile_path(args.player, args.state_dir)
+    except ValueError as exc:
+        parser.error(str(exc))
+    args.state_dir.mkdir(parents=True, exist_ok=True)
+
+
+def _all_profiles(args: argparse.Namespace) -> Iterable[str]:
+    if args.command == "advance-all":
+        days = None if args.to else args.days
+        reports = profiles.run_profiles(args.state_dir, advance_days=days, advance_to=args.to, workers=args.workers)
+        heading = f"ROLLOVER · all profiles in {args.state_dir}"
+    else:
+        reports = profiles.run_profiles(args.state_dir, workers=args.workers)
+        heading = f"DAWN REPORT · all profiles in {args.state_dir}"
+    return profiles.render_profiles_report(reports, heading, full=args.full)
+
+
+def _add_page_options(command: argparse.ArgumentParser) -> None:
+    command.add_argument(
+        "--tree", type=SkillTree, metavar="{" + ",".join(t.value for t in SkillTree) + "}", help="Only this skill tree"
+    )
+    command.add_argument("--limit", type=int, default=None, help="Quests per page")
+    command.add_argument("--page", type=int, default=1, help="Page to show (with --limit)")
 
+
+def _whole_briefing(args: argparse.Namespace) -> bool:
+    return args.tree is None and not args.limit and args.page == 1
+
+
+def _due_selector(text: str) -> str:
+    if text not in ("today", "tomorrow", "overdue"):
+        _dt.date.fromisoformat(text)
+    return text
+
+
+def _add_quest_selectors(command: argparse.ArgumentParser) -> None:
+    command.add_argument(
+        "--tree", type=SkillTree, metavar="{" + ",".join(t.value for t in SkillTree) + "}", help="Pending quests in this tree"
+    )
+    command.add_argument("--skill", help="Pending quests for this skill")
+    command.add_argument(
+        "--due", type=_due_selector, metavar="{today,tomorrow,overdue,YYYY-MM-DD}", help="Pending quests due then"
+    )
+
+
+def _due_window(selector: str | None, today: _dt.date) -> Tuple[_dt.date | None, _dt.date | None]:
+    if selector is None:
+        return None, None
+    if selector == "overdue":
+        return None, today - _dt.timedelta(days=1)
+    if selector == "today":
+        return today, today
+    if selector == "tomorrow":
+        day = today + _dt.timedelta(days=1)
+        return day, day
+    day = _dt.date.fromisoformat(selector)
+    return day, day
+
+
+def _add_template_filters(command: argparse.ArgumentParser) -> None:
+    command.add_argument(
+        "--tree", type=SkillTree, metavar="{" + ",".join(t.value for t in SkillTree) + "}", help="Only this skill tree"
+    )
+    command.add_argument("--skill", help="Only this skill")
+    command.add_argument(
+        "--difficulty",
+        type=Difficulty,
+        metavar="{" + ",".join(d.value for d in Difficulty) + "}",
+        help="Only this difficulty",
+    )
+    command.add_argument("--max-effort", type=int, metavar="MINUTES", help="Only blueprints up to this effort")
+    command.add_argument("--search", help="Keywords that must all appear (prefixes ok)")
+    command.add_argument("--limit", type=int, default=50, help="Blueprints to show (0 for all)")
+
+
+def _load_state(args: argparse.Namespace) -> GameState:
+    """Load only the rows a command needs when the backend supports it."""
+    storage = storage_for(args.state)
+    if hasattr(storage, "load_working_set") and storage.exists():
+        if args.command == "morning":
+            return storage.load_working_set()
+        if args.command in ("complete", "fail") and args.quest_ids and not _has_selectors(args):
+            return storage.load_working_set(id_prefixes=args.quest_ids)
+    return load_game_state(args.state, player_name=args.player)
+
+
+def _has_selectors(args: argparse.Namespace) -> bool:
+    return bool(args.tree or args.skill or args.due)
+
+
+def run_command(engine: GameEngine, args: argparse.Namespace) -> Tuple[int, Output]:
+    """Execute a parsed command against ``engine`` and return (exit code, output).
+
+    Long reports come back as line iterators so they can be streamed.
+    """
+    state = engine.state
+    # Resident daemon engines serve many invocations; follow each one's catalog choice.
+    engine.templates_path = args.templates
     if args.command == "morning":
-        print(engine.morning_briefing())
-        return 0
+        if args.cached and _whole_briefing(args):
+            refresh_briefing(state, args.state or STATE_PATH)
+        return 0, engine.iter_morning(tree=args.tree, limit=args.limit, page=args.page)
     if args.command == "status":
-        print(engine.status_overview())
-        return 0
-    if args.command == "templates":
-        print(engine.list_templates())
-        return 0
+        return 0, engine.iter_status(
+            include_archive=args.all,
+            statuses=args.statuses or (),
+            tree=args.tree,
+            limit=args.limit,
+            page=args.page,
+            summary=args.summary,
+        )
+    if args.command == "templates" or (args.command == "plan" and not args.template_ids):
+        return 0, engine.list_templates(
+            tree=args.tree,
+            skill=args.skill,
+            difficulty=args.difficulty,
+            max_effort=args.max_effort,
+            search=args.search,
+            limit=args.limit,
+        )
     if args.command == "plan":
-        if args.index is None:
-            print(engine.list_templates())
-        else:
-            print(engine.schedule_quest(args.index, due_days_from_now=args.due))
+        if len(args.template_ids) == 1:
+            return 0, engine.schedule_quest(args.template_ids[0], due_days_from_now=args.due)
+        return 0, engine.schedule_quests(args.template_ids, due_days_from_now=args.due)
+    if args.command in ("complete", "fail"):
+        return _resolve_command(engine, args)
+    if args.command == "recur":
+        if args.stop:
+            return 0, engine.stop_rule(args.stop)
+        if not args.template_id:
+            return 0, engine.list_rules()
+        if args.weekdays:
+            return 0, engine.add_rule(args.template_id, pattern="weekdays", start=args.start)
+        if args.every:
+            return 0, engine.add_rule(args.template_id, pattern="every", interval=args.every, start=args.start)
+        return 0, engine.add_rule(args.template_id, start=args.start)
+    if args.command == "batch":
+        return _run_batch(engine, args)
+    if args.command == "advance":
+        target = args.to or state.current_day + _dt.timedelta(days=args.days)
+        return 0, engine.advance_to(target)
+    if args.command == "undo":
+        return 0, engine.undo()
+    if args.command == "redo":
+        return 0, engine.redo()
+    if args.command == "archive":
+        return 0, engine.archive_resolved(args.older_than)
+    if args.command == "history":
+        return 0, engine.archive_history(args.first_month, args.last_month)
+    if args.command == "stats":
+        return 0, engine.stats_report(window_days=args.days, by=args.by)
+    if args.command == "achievements":
+        return 0, engine.iter_achievements()
+    if args.command == "export":
+        return _export_command(engine, args)
+    if args.command == "import":
+        try:
+            return 0, engine.import_quests(args.file, fmt=args.format, on_conflict=args.on_conflict)
+        except OSError as exc:
+            return 1, f"Cannot read {args.file}: {exc.strerror}"
+    if args.command == "migrate":
+        save_game_state(state, args.destination, check_version=False)
+        return 0, f"Migrated {len(state.quests)} quests → {args.destination}"
+    if args.command == "convert":
+        try:
+            save_game_state(state, engine.path, snapshot_format=args.format)
+        except ValueError as exc:
+            return 1, str(exc)
+        return 0, f"Rewrote {len(state.quests)} quests as a {args.format} snapshot (schema {SCHEMA_VERSION})"
+    return 1, ""
+
+
+def _export_command(engine: GameEngine, args: argparse.Namespace) -> Tuple[int, Output]:
+    fmt = export_format_for(args.output, args.format)
+    lines = engine.iter_export(
+        args.kind,
+        fmt,
+        include_archive=args.all,
+        statuses=args.statuses or (),
+        tree=args.tree,
+        first=args.first,
+        last=args.last,
+    )
+    if args.output is None:
+        return 0, lines
+    records = write_export(lines, args.output) - (1 if fmt == "csv" else 0)
+    return 0, f"Exported {records} {args.kind.removesuffix('s')} records ({fmt}) → {args.output}"
+
+
+def _resolve_command(engine: GameEngine, args: argparse.Namespace) -> Tuple[int, str]:
+    if not args.quest_ids and not _has_selectors(args):
+        return 2, "Name quest ids or select them with --tree/--skill/--due."
+    if len(args.quest_ids) == 1 and not _has_selectors(args):
+        single = engine.complete_quest if args.command == "complete" else engine.fail_quest
+        return 0, single(args.quest_ids[0])
+    selected = []
+    if _has_selectors(args):
+        first, last = _due_window(args.due, engine.state.current_day)
+        selected = engine.select_quests(tree=args.tree, skill=args.skill, first=first, last=last)
+        if not selected and not args.quest_ids:
+            return 0, "No pending quests match the selection."
+    bulk = engine.complete_quests if args.command == "complete" else engine.fail_quests
+    return 0, bulk(args.quest_ids, quests=selected)
+
+
+def _run_batch(engine: GameEngine, args: argparse.Namespace) -> Tuple[int, str]:
+    """Parse every script line up front, then apply them as one transaction."""
+    parser = build_parser()
+    operations = []
+    for lineno, line in enumerate((args.script or "").splitlines(), 1):
+        words = shlex.split(line, comments=True)
+        if not words:
+            continue
+        captured = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(captured):
+                parsed = parser.parse_args(words)
+        except SystemExit:
+            return 2, f"batch line {lineno}: {captured.getvalue().strip().splitlines()[-1]}"
+        if parsed.command not in BATCH_COMMANDS:
+            return 2, f"batch line {lineno}: '{parsed.command}' cannot run in a batch."
+        parsed.templates = args.templates
+        operations.append(lambda engine, parsed=parsed: _as_text(run_command(engine, parsed)[1]))
+    if not operations:
+        return 0, "Empty batch."
+    return 0, engine.run_batch(operations)
+
+
+def execute(args: argparse.Namespace) -> Tuple[int, Output]:
+    """Load, run and save, re-running the command on a fresh load after a conflict."""
+    for _ in range(MAX_CONFLICT_RETRIES):
+        with metrics.phase("load"):
+            state = _load_state(args)
+        engine = GameEngine(state, path=args.state)
+        try:
+            with metrics.phase("render" if args.command in READ_ONLY_COMMANDS else "engine"):
+                return run_command(engine, args)
+        except StateConflictError:
+            metrics.count("conflict_retries")
+    return 1, f"State kept changing underneath us; gave up after {MAX_CONFLICT_RETRIES} attempts."
+
+
+def _daemon_handler(engine: GameEngine, argv: List[str], cwd: Path) -> Tuple[int, Output]:
+    """Run a forwarded command line against the daemon's resident engine.
+
+    Relative paths are resolved against ``cwd``, the caller's working
+    directory, not the daemon's.
+    """
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+            args = build_parser().parse_args(argv)
+    except SystemExit as exc:
+        return int(exc.code or 0), captured.getvalue().rstrip()
+    if args.command in (None, "serve", "watch"):
+        return 1, "The daemon cannot run this command."
+    for name in PATH_ARGUMENTS:
+        value = getattr(args, name, None)
+        if value is not None and not value.is_absolute():
+            setattr(args, name, cwd / value)
+    if args.command in ("convert", "migrate") and isinstance(engine.saver, daemon.CoalescingSaver):
+        # They write the state outside the saver; queued changes must be on disk first.
+        engine.saver.flush()
+        if engine.saver.failure is not None:
+            return 1, f"daemon error: changes not saved yet: {engine.saver.failure}"
+    return run_command(engine, args)
+
+
+def _as_text(output: Output) -> str:
+    return output if isinstance(output, str) else "\n".join(output)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    raw_argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(raw_argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    _resolve_profile(parser, args)
+    if args.command == "morning" and args.cached and _whole_briefing(args):
+        cached = read_briefing(args.state or STATE_PATH)
+        if cached is not None:
+            sys.stdout.write(cached)
+            return 0
+    if args.command == "serve":
+        daemon.serve(args.state, _daemon_handler, player_name=args.player)
         return 0
-    if args.command == "complete":
-        print(engine.complete_quest(args.quest_id))
+    if args.command == "watch":
+        watch.watch(
+            args.state,
+            reminders=args.remind,
+            warn_before=_dt.timedelta(minutes=args.warn_before),
+            check_every=_dt.timedelta(seconds=args.check_every),
+            player_name=args.player,
+        )
         return 0
-    if args.command == "fail":
-        print(engine.fail_quest(args.quest_id))
+    if args.command in ("advance-all", "morning-all"):
+        write_lines(_all_profiles(args))
         return 0
-    if args.command == "advance":
-        print(engine.advance_day())
+    if args.command == "simulate":
+        config = simulator.SimulationConfig(
+            players=args.players,
+            days=round(args.years * 365),
+            seed=args.seed,
+            quests_per_day=args.quests_per_day,
+            templates_path=args.templates,
+            base_xp=args.base_xp,
+            xp_growth=args.xp_growth,
+        )
+        print(simulator.render_report(config, simulator.run_simulation(config, workers=args.workers)))
         return 0
+    if args.command == "batch" and args.script is None:
+        # Read the script here so a daemon receives it instead of its own stdin.
+        args.script = sys.stdin.read() if args.script_file == "-" else Path(args.script_file).read_text(encoding="utf-8")
+        raw_argv = raw_argv + ["--script", args.script]
+    if not (args.profile or args.metrics_json or args.cprofile):
+        code = daemon.forward(args.state, raw_argv)
+        if code is not None:
+            return code
 
-    parser.print_help()
-    return 1
+    collector = None
+    if args.profile or args.metrics_json:
+        collector = metrics.Metrics()
+        collector.phases["import"] = _IMPORT_SECONDS
+        collector.start()
+        metrics.activate(collector)
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    try:
+        code, output = execute(args)
+        with metrics.phase("render"):
+            if isinstance(output, str):
+                print(output)
+            else:
+                write_lines(output)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+        if collector:
+            metrics.activate(None)
+            collector.stop()
+            _report_metrics(collector, args)
+    return code
+
+
+def _report_metrics(collector: metrics.Metrics, args: argparse.Namespace) -> None:
+    if args.profile:
+        print(collector.summary(), file=sys.stderr)
+    if args.metrics_json:
+        payload = dict(collector.to_dict(), command=args.command)
+        text = json.dumps(payload, indent=2)
+        if args.metrics_json == "-":
+            print(text)
+        else:
+            Path(args.metrics_json).write_text(text + "\n", encoding="utf-8")
 
 
 if __name__ == "__main__":
@@ -5,4 +5,4 @@ set "SCRIPT_DIR=%~dp0.."
 set "PYTHON=%VENV_PYTHON%"
 if "%PYTHON%"=="" set "PYTHON=python"
 cd /d "%SCRIPT_DIR%"
-%PYTHON% main.py morning
+%PYTHON% main.py morning --cached
@@ -4,4 +4,16 @@
 PYTHON=${PYTHON:-python3}
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$SCRIPT_DIR"
-$PYTHON main.py morning
+# Every save leaves the rendered briefing in game_state.json.briefing, headed
+# "HRPG-BRIEFING <version> <day>". While that version matches the stamp in
+# game_state.json.lock it is current, so print it without starting Python.
+STATE=game_state.json
+if [ -r "$STATE.briefing" ] && [ -r "$STATE.lock" ]; then
+    read -r magic version _ < "$STATE.briefing"
+    stamp=$(head -c 20 "$STATE.lock")
+    if [ "$magic" = "HRPG-BRIEFING" ] && [ -n "$stamp" ] && [ "$version" = "$stamp" ]; then
+        tail -n +2 "$STATE.briefing"
+        exit 0
+    fi
+fi
+$PYTHON main.py morning --cached
@@ -0,0 +1,52 @@
+"""Achievement counters driven by engine events."""
+from __future__ import annotations
+
+import datetime as _dt
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, SkillTree
+
+START = _dt.date(2026, 1, 1)
+
+
+def _engine(quests=()) -> GameEngine:
+    state = GameState(player=PlayerProgress(), quests=list(quests), current_day=START)
+    return GameEngine(state, path=None, saver=lambda state, path, event: None, record_undo=False)
+
+
+def _quest(deadline: _dt.date) -> Quest:
+    return Quest(
+        title="Read",
+        tree=SkillTree.FAITH,
+        skill="Tafsir",
+        difficulty=Difficulty.EASY,
+        estimated_effort="10 minutes",
+        xp_reward=10,
+        streak_impact=1,
+        deadline=deadline,
+    )
+
+
+def test_clean_rollover_unlocks_discipline():
+    engine = _engine()
+    engine.advance_to(START + _dt.timedelta(days=30))
+    assert "clean-30" in engine.state.player.achievements
+
+
+def test_catch_up_with_daily_misses_is_not_clean():
+    engine = _engine([_quest(START)])
+    output = engine.advance_to(START + _dt.timedelta(days=70))
+    player = engine.state.player
+    assert "clean-30" not in player.achievements
+    assert "Unbroken Discipline" not in output
+    assert player.achievement_counters.get("clean-30", 0) == 0
+
+
+def test_clean_midnights_before_the_first_miss_count():
+    engine = _engine([_quest(START + _dt.timedelta(days=10))])
+    engine.advance_to(START + _dt.timedelta(days=11))
+    # Ten clean midnights, then the miss at the end of day 10 resets the run.
+    assert engine.state.player.achievement_counters.get("clean-30", 0) == 0
+    engine.state.quests[0].status = QuestStatus.COMPLETED
+    engine.advance_to(START + _dt.timedelta(days=16))
+    assert engine.state.player.achievement_counters["clean-30"] == 5
@@ -0,0 +1,54 @@
+"""Progress analytics over the outcome history."""
+from __future__ import annotations
+
+import datetime as _dt
+
+import pytest
+
+from houssam_rpg import analytics
+from houssam_rpg.models import Difficulty, EventHistory, Quest, SkillTree
+
+MONDAY = _dt.date(2026, 1, 5)
+
+
+def _history(xp_values) -> EventHistory:
+    quest = Quest(
+        title="Deadlift",
+        tree=SkillTree.BODY,
+        skill="Strength",
+        difficulty=Difficulty.BRUTAL,
+        estimated_effort="1 hour",
+        xp_reward=0,
+        streak_impact=1,
+        deadline=MONDAY,
+    )
+    history = EventHistory()
+    for n, xp in enumerate(xp_values):
+        history.record("completed", quest, MONDAY + _dt.timedelta(days=n // 2), xp=xp, timestamp=0.0)
+        history.record("missed", quest, MONDAY + _dt.timedelta(days=n // 2), timestamp=0.0)
+    return history
+
+
+def _answers(history: EventHistory):
+    return analytics.xp_per_week(history), analytics.xp_curve(history), analytics.completion_rates(history)
+
+
+@pytest.mark.parametrize(
+    "xp_values",
+    [
+        [2**53 + 1] * 6,  # exact in int64, not in float64
+        [2**62, 2**62, 2**63 - 1, 7, 2**62, 3, 2**61, 2**62, 1],  # daily and weekly totals past int64
+    ],
+)
+def test_xp_totals_are_exact_and_agree_without_numpy(monkeypatch, xp_values):
+    history = _history(xp_values)
+    weekly, curve, rates = _answers(history)
+
+    assert sum(total for _, total in weekly) == sum(xp_values) == curve[-1][1]
+    assert weekly[0] == (MONDAY, sum(xp_values[:14]))
+    day_two = [total for day, total in curve if day == MONDAY + _dt.timedelta(days=1)]
+    assert day_two == [sum(xp_values[:4])]
+    assert rates == [("Strength", len(xp_values), len(xp_values), 0.5)]
+
+    monkeypatch.setattr(analytics, "np", None)
+    assert _answers(history) == (weekly, curve, rates)
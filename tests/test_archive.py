@@ -0,0 +1,58 @@
+"""Archiving resolved quests into monthly segments."""
+from __future__ import annotations
+
+import datetime as _dt
+
+from houssam_rpg.archive import archived_months, iter_archived_quests
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, SkillTree
+from houssam_rpg.state import _quest_to_payload, load_game_state, save_game_state
+
+TODAY = _dt.date(2026, 3, 15)
+
+
+def _quest(quest_id: str, deadline: _dt.date, status: QuestStatus) -> Quest:
+    return Quest(
+        title=f"Quest {quest_id} — «ünïcode»",
+        tree=SkillTree.BODY,
+        skill="Strength",
+        difficulty=Difficulty.DEMANDING,
+        estimated_effort="45 minutes",
+        xp_reward=2**70,
+        streak_impact=2,
+        deadline=deadline,
+        status=status,
+        id=quest_id,
+        urgency=True,
+        failure_count=3,
+        notes="Failure streak: 3",
+    )
+
+
+def test_archived_quests_round_trip_and_leave_the_hot_state(tmp_path):
+    path = tmp_path / "state.json"
+    old = [
+        _quest("jan-done", _dt.date(2026, 1, 5), QuestStatus.COMPLETED),
+        _quest("jan-failed", _dt.date(2026, 1, 20), QuestStatus.FAILED),
+        _quest("feb-done", _dt.date(2026, 2, 1), QuestStatus.COMPLETED),
+    ]
+    kept = [
+        _quest("old-pending", _dt.date(2026, 1, 2), QuestStatus.PENDING),
+        _quest("recent-done", TODAY - _dt.timedelta(days=3), QuestStatus.COMPLETED),
+    ]
+    save_game_state(GameState(player=PlayerProgress(), quests=old + kept, current_day=TODAY), path)
+
+    GameEngine(load_game_state(path), path=path).archive_resolved()
+
+    assert sorted(q.id for q in load_game_state(path).quests) == ["old-pending", "recent-done"]
+    assert archived_months(path) == ["2026-01", "2026-02"]
+    archived = [_quest_to_payload(q) for q in iter_archived_quests(path)]
+    assert archived == [_quest_to_payload(q) for q in old]
+    assert [q.id for q in iter_archived_quests(path, first_month="2026-02")] == ["feb-done"]
+
+    # A later run appends a second gzip member to an existing segment.
+    engine = GameEngine(load_game_state(path), path=path)
+    engine.state.index.get("old-pending").status = QuestStatus.FAILED
+    engine.archive_resolved()
+    assert [q.id for q in iter_archived_quests(path, last_month="2026-01")] == ["jan-done", "jan-failed", "old-pending"]
+    assert [q.id for q in load_game_state(path).quests] == ["recent-done"]
@@ -0,0 +1,26 @@
+"""The synthetic-state generator and benchmark harness."""
+from __future__ import annotations
+
+import json
+
+from benchmarks import generate_state
+from benchmarks.harness import OPERATIONS, main
+from houssam_rpg.models import QuestStatus
+from houssam_rpg.state import _game_state_to_payload
+
+
+def test_generator_is_deterministic_per_seed():
+    state = generate_state(300, tracks=4, days=30)
+    assert len(state.quests) == len(state.index) == 300
+    assert state.index.count(QuestStatus.PENDING) > 0
+    assert _game_state_to_payload(generate_state(300, tracks=4, days=30)) == _game_state_to_payload(state)
+    assert _game_state_to_payload(generate_state(300, tracks=4, days=30, seed=8)) != _game_state_to_payload(state)
+
+
+def test_harness_times_every_operation(tmp_path):
+    output = tmp_path / "bench.json"
+    assert main(["--sizes", "200", "--repeat", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    measured = {result["op"] for result in report["results"]}
+    assert measured == set(OPERATIONS) | {"save_game_state", "load_game_state", "save_binary", "load_binary"}
+    assert all(result["size"] == 200 and result["best_s"] >= 0 for result in report["results"])
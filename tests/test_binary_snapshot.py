@@ -0,0 +1,73 @@
+"""The compact binary snapshot format."""
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from benchmarks import generate_state
+from houssam_rpg.binary_snapshot import BINARY_SCHEMA, MAGIC, decode_state, encode_state
+from houssam_rpg.models import Difficulty, Quest, SkillTree
+from houssam_rpg.state import _game_state_to_payload, _starter_rules, load_game_state, save_game_state
+
+
+def _rich_state():
+    state = generate_state(400, tracks=5, days=60)
+    odd = Quest(
+        title="Réviser «Al-Fatiha» 📖",
+        tree=SkillTree.FAITH,
+        skill="Tafsir",
+        difficulty=Difficulty.BRUTAL,
+        estimated_effort="1h",
+        xp_reward=2**80,
+        streak_impact=-1,
+        deadline=state.current_day,
+        id="not-a-uuid",
+        urgency=True,
+        failure_count=70,
+        notes="Failure streak: 70 (70 missed days)",
+    )
+    state.add_quest(odd)
+    state.rules.extend(_starter_rules(state.current_day))
+    for quest in state.quests[:50]:
+        state.history.record("completed", quest, state.current_day, xp=quest.xp_reward, timestamp=1.5)
+    state.player.achievements["first-blood"] = state.current_day
+    state.version = 12
+    return state
+
+
+def test_binary_snapshots_round_trip_and_are_smaller_than_json(tmp_path):
+    state = _rich_state()
+    raw = encode_state(state)
+    assert raw.startswith(MAGIC)
+    decoded = decode_state(raw)
+    assert _game_state_to_payload(decoded) == _game_state_to_payload(state)
+    assert decoded.version == 12
+    assert decoded.index.get("not-a-uuid").xp_reward == 2**80
+
+    json_path, binary_path = tmp_path / "state.json", tmp_path / "state.hrpg"
+    save_game_state(state, json_path, check_version=False)
+    save_game_state(state, binary_path, check_version=False)
+    assert binary_path.read_bytes().startswith(MAGIC)
+    assert binary_path.stat().st_size < json_path.stat().st_size
+    from_binary, from_json = (_game_state_to_payload(load_game_state(p)) for p in (binary_path, json_path))
+    assert from_binary.pop("version") == from_json.pop("version") + 1  # each save bumps the version
+    assert from_binary == from_json
+
+
+def test_converting_a_json_snapshot_in_place_keeps_its_content(tmp_path):
+    path = tmp_path / "state.json"
+    save_game_state(_rich_state(), path, check_version=False)
+    before = _game_state_to_payload(load_game_state(path))
+    save_game_state(load_game_state(path), path, snapshot_format="binary")
+    assert path.read_bytes().startswith(MAGIC)
+    after = _game_state_to_payload(load_game_state(path))
+    assert after.pop("version") == before.pop("version") + 1
+    assert after == before
+
+
+def test_snapshots_from_a_newer_schema_are_refused():
+    raw = bytearray(encode_state(_rich_state()))
+    struct.pack_into("<H", raw, len(MAGIC), BINARY_SCHEMA + 1)
+    with pytest.raises(ValueError, match="not supported"):
+        decode_state(bytes(raw))
@@ -0,0 +1,54 @@
+"""The pre-rendered morning briefing artifact."""
+from __future__ import annotations
+
+import datetime as _dt
+
+import main
+from houssam_rpg.briefing import briefing_path, read_briefing, render_briefing
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.state import load_game_state, save_game_state
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _quest(quest_id: str) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.DEV,
+        skill="Python",
+        difficulty=Difficulty.EASY,
+        estimated_effort="20 minutes",
+        xp_reward=30,
+        streak_impact=1,
+        deadline=TODAY,
+        id=quest_id,
+    )
+
+
+def _cached(path):
+    return main._cached_morning(["--state", str(path), "morning", "--cached"])
+
+
+def test_briefing_follows_every_commit_and_goes_stale_otherwise(tmp_path, capsys):
+    path = tmp_path / "state.json"
+    save_game_state(GameState(player=PlayerProgress(), quests=[_quest("a"), _quest("b")], current_day=TODAY), path)
+    assert read_briefing(path) == _cached(path) == render_briefing(load_game_state(path)) + "\n"
+
+    GameEngine(load_game_state(path), path=path).complete_quest("a")
+    fresh = read_briefing(path)
+    assert fresh == _cached(path) == render_briefing(load_game_state(path)) + "\n"
+    assert "[a" not in fresh and "[b" in fresh
+
+    # A commit that skips the hook (a partial working set) leaves the artifact behind.
+    state = load_game_state(path)
+    state.partial = True
+    GameEngine(state, path=path).complete_quest("b")
+    assert read_briefing(path) is None and _cached(path) is None
+    assert briefing_path(path).read_text(encoding="utf-8").count("[b") == 1
+
+    # The next cached read renders from the state and refreshes the artifact.
+    assert main.main(["--state", str(path), "morning", "--cached"]) == 0
+    shown = capsys.readouterr().out
+    assert "[b" not in shown
+    assert read_briefing(path) == shown == _cached(path)
@@ -0,0 +1,52 @@
+"""Per-skill completion calendars kept as bitsets."""
+from __future__ import annotations
+
+import datetime as _dt
+import random
+
+from houssam_rpg.models import SkillTrackProgress
+
+EPOCH = _dt.date(2026, 1, 1)
+
+
+def _day(n: int) -> _dt.date:
+    return EPOCH + _dt.timedelta(days=n)
+
+
+def _run_ending(days: set, n: int) -> int:
+    run = 0
+    while n - run in days:
+        run += 1
+    return run
+
+
+def test_calendar_queries_match_a_set_of_days():
+    rng = random.Random(11)
+    track = SkillTrackProgress("Strength")
+    days: set = set()
+    # Mostly forward, with backfills before the epoch and inside gaps.
+    for n in [rng.randrange(40, 200) for _ in range(120)] + [rng.randrange(-30, 250) for _ in range(40)]:
+        track.mark_day(_day(n))
+        days.add(n)
+        assert track.longest_streak == max(_run_ending(days, d) for d in days)
+
+    for n in range(-40, 260):
+        assert track.completed_on(_day(n)) == (n in days)
+        assert track.streak_as_of(_day(n)) == _run_ending(days, n)
+    for first, last in [(-40, 260), (0, 0), (45, 90), (100, 99), (240, 300)]:
+        assert track.completions_between(_day(first), _day(last)) == sum(first <= d <= last for d in days)
+
+    restored = SkillTrackProgress("Strength")
+    restored.load_calendar(track.calendar_epoch, track.calendar_bytes())
+    assert (restored.calendar, restored.longest_streak) == (track.calendar, track.longest_streak)
+
+
+def test_failures_reset_the_live_streak_but_keep_the_calendar():
+    track = SkillTrackProgress("Tafsir")
+    for n in range(5):
+        track.register_completion(_day(n))
+    assert track.streak == track.longest_streak == 5
+    track.break_streak()
+    track.register_completion(_day(7))
+    assert track.streak == 1 and track.longest_streak == 5
+    assert track.completions_between(_day(0), _day(7)) == 6
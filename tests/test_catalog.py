@@ -0,0 +1,51 @@
+"""The template catalog and its on-disk cache."""
+from __future__ import annotations
+
+import json
+
+from houssam_rpg import catalog as catalog_module
+from houssam_rpg.catalog import TemplateCatalog, cache_path, load_catalog
+from houssam_rpg.models import Difficulty, SkillTree
+
+ENTRIES = [
+    {"title": "Morning run", "tree": "Body", "skill": "Running", "xp_reward": 40, "estimated_effort": "30 minutes"},
+    {"title": "Read Tafsir", "tree": "Faith", "skill": "Tafsir", "xp_reward": 25, "difficulty": "Brutal"},
+    {"id": "py-1", "title": "Ship a parser", "tree": "Dev", "skill": "Python", "xp_reward": 2**62,
+     "estimated_effort": "1h 30m"},
+]
+
+
+def _write_catalog(tmp_path):
+    path = tmp_path / "quest_templates.jsonl"
+    path.write_text("\n".join(json.dumps(entry) for entry in ENTRIES), encoding="utf-8")
+    return path
+
+
+def _answers(catalog: TemplateCatalog):
+    return (
+        list(catalog),
+        catalog.select(tree=SkillTree.FAITH, difficulty=Difficulty.BRUTAL),
+        catalog.select(max_effort=60),
+        catalog.search("run"),
+        catalog.find("py"),
+    )
+
+
+def test_cache_is_json_and_answers_like_a_fresh_parse(tmp_path, monkeypatch):
+    path = _write_catalog(tmp_path)
+    monkeypatch.setattr(catalog_module, "_LOADED", {})
+    parsed = load_catalog(path)
+    cache = json.loads(cache_path(path).read_text(encoding="utf-8"))
+    assert cache["format"] == catalog_module.CACHE_FORMAT
+
+    monkeypatch.setattr(catalog_module, "_LOADED", {})
+    monkeypatch.setattr(TemplateCatalog, "from_file", None)  # must come from the cache
+    assert _answers(load_catalog(path)) == _answers(parsed)
+
+
+def test_unreadable_cache_is_rebuilt(tmp_path, monkeypatch):
+    path = _write_catalog(tmp_path)
+    cache_path(path).write_bytes(b"\x80\x05garbage")
+    monkeypatch.setattr(catalog_module, "_LOADED", {})
+    assert len(load_catalog(path)) == len(ENTRIES)
+    assert json.loads(cache_path(path).read_text(encoding="utf-8"))["catalog"]["ids"][2] == "py-1"
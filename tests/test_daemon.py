@@ -0,0 +1,146 @@
+"""The resident daemon and its coalescing saver."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as _dt
+import io
+
+import main
+from houssam_rpg.daemon import STREAM_CHUNK_LINES, CoalescingSaver, _serve, forward, socket_path
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.state import load_game_state, save_game_state
+
+TODAY = _dt.date.today()
+
+
+def _quest(quest_id: str, xp: int) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.DEV,
+        skill="Python",
+        difficulty=Difficulty.EASY,
+        estimated_effort="20 minutes",
+        xp_reward=xp,
+        streak_impact=1,
+        deadline=TODAY,
+        id=quest_id,
+    )
+
+
+def _complete(engine: GameEngine, argv, cwd):
+    return 0, engine.complete_quest(argv[0])
+
+
+def _setup(tmp_path):
+    path = tmp_path / "state.json"
+    state = GameState(player=PlayerProgress(), quests=[_quest("a", 40), _quest("b", 45)], current_day=TODAY)
+    save_game_state(state, path)
+    loop = asyncio.new_event_loop()
+    saver = CoalescingSaver(loop, handler=_complete)
+    saver.engine = GameEngine(load_game_state(path), path=path, saver=saver)
+    return path, loop, saver
+
+
+def test_conflicting_flush_reruns_commands_on_top_of_the_other_writer(tmp_path):
+    path, loop, saver = _setup(tmp_path)
+    try:
+        assert saver.run(["b"], tmp_path)[0] == 0
+        GameEngine(load_game_state(path), path=path).complete_quest("a")
+        saver.flush()
+    finally:
+        loop.close()
+    assert saver.failure is None
+    state = load_game_state(path)
+    assert state.player.xp == sum(state.history.xp) == 85
+    assert saver.engine.state.player.xp == 85
+    assert state.version == saver.engine.state.version
+
+
+def test_commands_see_commits_made_since_the_last_one(tmp_path):
+    path, loop, saver = _setup(tmp_path)
+    try:
+        GameEngine(load_game_state(path), path=path).complete_quest("a")
+        saver.run(["b"], tmp_path)
+        assert saver.engine.state.player.xp == 85
+        saver.flush()
+    finally:
+        loop.close()
+    assert load_game_state(path).player.xp == 85
+
+
+def test_failed_flush_keeps_changes_and_reports_them(tmp_path, monkeypatch):
+    path, loop, saver = _setup(tmp_path)
+
+    def broken(*args, **kwargs):
+        raise OSError("disk full")
+
+    try:
+        saver.run(["b"], tmp_path)
+        monkeypatch.setattr("houssam_rpg.daemon.save_game_state", broken)
+        saver.flush()
+        assert saver.failure == "disk full"
+        code, output = saver.run(["a"], tmp_path)
+        assert code == 1 and "not saved yet: disk full" in "\n".join(output)
+        monkeypatch.undo()
+        saver.flush()
+    finally:
+        loop.close()
+    assert saver.failure is None
+    assert load_game_state(path).player.xp == 85
+
+
+def _served(path, handler, *requests):
+    """Start a daemon on ``path``, forward each argv in turn, then shut it down."""
+
+    async def scenario():
+        server = asyncio.create_task(_serve(path, handler, None))
+        while not socket_path(path).exists():
+            await asyncio.sleep(0.01)
+        replies = []
+        for argv in requests:
+            out = io.StringIO()
+            code = await asyncio.get_running_loop().run_in_executor(None, forward, path, argv, out)
+            replies.append((code, out.getvalue()))
+        server.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await server
+        return replies
+
+    return asyncio.run(scenario())
+
+
+def test_forwarded_commands_are_answered_and_saved_on_shutdown(tmp_path):
+    path, loop, _ = _setup(tmp_path)
+    loop.close()
+    assert forward(path, ["a"]) is None  # nobody listening
+
+    [(code, output)] = _served(path, _complete, ["a"])
+    assert code == 0 and "a" in output
+    assert not socket_path(path).exists()
+    assert load_game_state(path).player.xp == 40
+
+
+def test_long_output_streams_back_in_chunks(tmp_path):
+    path, loop, _ = _setup(tmp_path)
+    loop.close()
+    sent = STREAM_CHUNK_LINES * 2 + 1
+
+    def report(engine, argv, cwd):
+        return 0, (f"line {n}" for n in range(sent))
+
+    [(code, output)] = _served(path, report, ["status"])
+    assert code == 0
+    assert output.splitlines() == [f"line {n}" for n in range(sent)]
+
+
+def test_relative_paths_resolve_against_the_callers_directory(tmp_path):
+    caller = tmp_path / "caller"
+    caller.mkdir()
+    path, loop, saver = _setup(tmp_path)
+    loop.close()
+    code, _ = main._daemon_handler(saver.engine, ["export", "quests", "-o", "quests.jsonl"], caller)
+    assert code == 0
+    assert len((caller / "quests.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+    assert not (tmp_path / "quests.jsonl").exists()
@@ -0,0 +1,114 @@
+"""Engine transactions and rollovers."""
+from __future__ import annotations
+
+import datetime as _dt
+
+import pytest
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, RecurrenceRule, SkillTree
+from houssam_rpg.state import _game_state_to_payload
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _quest(quest_id: str) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.DEV,
+        skill="Python",
+        difficulty=Difficulty.EASY,
+        estimated_effort="20 minutes",
+        xp_reward=30,
+        streak_impact=1,
+        deadline=TODAY,
+        id=quest_id,
+    )
+
+
+@pytest.mark.parametrize("record_undo", [False, True])
+def test_failed_transaction_restores_the_state(tmp_path, record_undo):
+    saved = []
+    state = GameState(player=PlayerProgress(), quests=[_quest("a"), _quest("b")], current_day=TODAY)
+    engine = GameEngine(
+        state, path=tmp_path / "state.json", saver=lambda *args: saved.append(args), record_undo=record_undo
+    )
+    before = _game_state_to_payload(engine.state)
+
+    with pytest.raises(KeyError), engine.transaction():
+        engine.complete_quest("a")
+        engine.fail_quest("b")
+        engine.advance_to(TODAY + _dt.timedelta(days=3))
+        raise KeyError("boom")
+
+    assert saved == []
+    assert _game_state_to_payload(engine.state) == before
+    assert engine.state.index.get("a").status == QuestStatus.PENDING
+    # The engine still commits normally afterwards.
+    engine.complete_quest("a")
+    assert engine.state.player.xp > 0 and len(saved) == 1
+
+
+def test_missed_rule_occurrences_collapse_into_the_latest():
+    rule = RecurrenceRule(
+        title="Stretch",
+        tree=SkillTree.BODY,
+        skill="Mobility",
+        difficulty=Difficulty.EASY,
+        estimated_effort="10 minutes",
+        xp_reward=20,
+        start=TODAY,
+    )
+    state = GameState(player=PlayerProgress(), quests=[], current_day=TODAY, rules=[rule])
+    engine = GameEngine(state, saver=lambda *args: None, record_undo=False)
+
+    output = engine.advance_to(TODAY + _dt.timedelta(days=365))
+
+    stored = list(engine.state.quests)
+    assert [quest.id for quest in stored] == [rule.occurrence_id(TODAY + _dt.timedelta(days=364))]
+    assert stored[0].xp_reward == 40 and stored[0].failure_count == 1
+    assert len(engine.state.history) == 365
+    assert "missed 365×" in output
+
+
+def test_memoized_ledger_lines_follow_in_place_edits():
+    quest = _quest("a")
+    engine = GameEngine(
+        GameState(player=PlayerProgress(), quests=[quest], current_day=TODAY), saver=lambda *args: None
+    )
+    line = engine._format_quest_line(quest)
+    assert engine._format_quest_line(quest) is line
+
+    quest.escalate_failure()
+    assert engine._format_quest_line(quest).endswith("— 60 XP — due 2026-01-01 !!")
+    quest.reset_for_new_day(TODAY + _dt.timedelta(days=1))
+    assert engine.state.index.get("a") is quest
+    assert "due 2026-01-02" in engine._format_quest_line(quest)
+
+
+def test_catch_up_rollover_matches_advancing_one_day_at_a_time():
+    def engine() -> GameEngine:
+        quests = [_quest("a"), _quest("b"), _quest("c")]
+        quests[1].deadline = TODAY + _dt.timedelta(days=2)
+        quests[2].status = QuestStatus.COMPLETED
+        state = GameState(player=PlayerProgress(), quests=quests, current_day=TODAY)
+        return GameEngine(state, saver=lambda *args: None, record_undo=False)
+
+    stepped = engine()
+    for _ in range(5):
+        stepped.advance_day()
+    caught_up = engine()
+    output = caught_up.advance_to(TODAY + _dt.timedelta(days=5))
+
+    assert "CATCH-UP ROLLOVER" in output
+    # Only the failure notes (one consolidated entry) and history timestamps differ.
+    expected, actual = _game_state_to_payload(stepped.state), _game_state_to_payload(caught_up.state)
+    for payload in (expected, actual):
+        for quest in payload["quests"]:
+            quest.pop("notes")
+    assert actual["quests"] == expected["quests"]
+    assert actual["player"] == expected["player"]
+    assert actual["current_day"] == expected["current_day"] == (TODAY + _dt.timedelta(days=5)).isoformat()
+    assert caught_up.state.history.days == stepped.state.history.days
+    assert caught_up.state.index.get("a").xp_reward == 30 << 5
+    assert caught_up.state.index.get("a").notes == "Failure streak: 5 (5 missed days)"
@@ -0,0 +1,75 @@
+"""Streaming JSONL/CSV export."""
+from __future__ import annotations
+
+import csv
+import datetime as _dt
+import io
+import json
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.export import QUEST_EXPORT_FIELDS, write_export
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, SkillTree
+from houssam_rpg.state import _quest_to_payload, load_game_state, save_game_state
+
+TODAY = _dt.date(2026, 3, 1)
+
+
+def _quest(quest_id: str, tree: SkillTree, days_ago: int, status: QuestStatus) -> Quest:
+    return Quest(
+        title=f"Quest, \"{quest_id}\"",
+        tree=tree,
+        skill="Mixed",
+        difficulty=Difficulty.STANDARD,
+        estimated_effort="30 minutes",
+        xp_reward=2**70 if quest_id == "big" else 40,
+        streak_impact=1,
+        deadline=TODAY - _dt.timedelta(days=days_ago),
+        status=status,
+        id=quest_id,
+        notes="line one\nline two" if quest_id == "old" else None,
+    )
+
+
+def _engine(tmp_path) -> GameEngine:
+    path = tmp_path / "state.json"
+    quests = [
+        _quest("old", SkillTree.DEV, 60, QuestStatus.COMPLETED),
+        _quest("big", SkillTree.BODY, 0, QuestStatus.PENDING),
+        _quest("done", SkillTree.DEV, 0, QuestStatus.PENDING),
+    ]
+    save_game_state(GameState(player=PlayerProgress(), quests=quests, current_day=TODAY), path)
+    GameEngine(load_game_state(path), path=path).archive_resolved()
+    engine = GameEngine(load_game_state(path), path=path)
+    engine.complete_quest("done")
+    return engine
+
+
+def test_quest_export_includes_the_archive_on_request(tmp_path):
+    engine = _engine(tmp_path)
+    hot = [json.loads(line) for line in engine.iter_export("quests")]
+    assert [record["id"] for record in hot] == ["big", "done"]
+    everything = [json.loads(line) for line in engine.iter_export("quests", include_archive=True)]
+    assert [record["id"] for record in everything] == ["old", "big", "done"]
+    assert everything[0]["notes"] == "line one\nline two"
+    assert everything[1:] == [_quest_to_payload(q) for q in engine.state.quests]
+
+    pending_body = engine.iter_export("quests", statuses=[QuestStatus.PENDING], tree=SkillTree.BODY)
+    assert [json.loads(line)["id"] for line in pending_body] == ["big"]
+
+
+def test_csv_exports_parse_back_into_the_same_rows(tmp_path):
+    engine = _engine(tmp_path)
+    target = tmp_path / "quests.csv"
+    assert write_export(engine.iter_export("quests", "csv", include_archive=True), target) == 4
+
+    with target.open(encoding="utf-8", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert list(rows[0]) == list(QUEST_EXPORT_FIELDS)
+    assert [row["id"] for row in rows] == ["old", "big", "done"]
+    assert rows[0]["title"] == 'Quest, "old"' and rows[0]["notes"] == "line one\nline two"
+    assert int(rows[1]["xp_reward"]) == 2**70
+
+    history = list(csv.DictReader(io.StringIO("\n".join(engine.iter_export("history", "csv")))))
+    assert [(row["outcome"], row["skill"], row["xp"]) for row in history] == [("completed", "Mixed", "40")]
+    tracks = [json.loads(line) for line in engine.iter_export("tracks")]
+    assert [(t["skill_name"], t["streak"]) for t in tracks if t["skill_name"] == "Mixed"] == [("Mixed", 1)]
@@ -0,0 +1,79 @@
+"""Bulk quest import with id-based dedupe."""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+
+import pytest
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.export import write_export
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, SkillTree
+from houssam_rpg.state import _quest_to_payload, load_game_state, save_game_state
+
+TODAY = _dt.date(2026, 3, 1)
+
+
+def _quests():
+    return [
+        Quest(
+            title=f"Quest, \"{n}\" — ñ",
+            tree=list(SkillTree)[n % 3],
+            skill="Mixed",
+            difficulty=list(Difficulty)[n % 5],
+            estimated_effort="30 minutes",
+            xp_reward=2**70 if n == 0 else 10 * n,
+            streak_impact=n % 2,
+            deadline=TODAY + _dt.timedelta(days=n),
+            status=list(QuestStatus)[n % 3],
+            id=f"q{n}",
+            urgency=bool(n % 2),
+            failure_count=n,
+            notes="line one\nline two" if n == 1 else None,
+        )
+        for n in range(6)
+    ]
+
+
+def _engine(path) -> GameEngine:
+    return GameEngine(load_game_state(path), path=path)
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_exported_quests_import_back_unchanged(tmp_path, fmt):
+    source = tmp_path / "source.json"
+    save_game_state(GameState(player=PlayerProgress(), quests=_quests(), current_day=TODAY), source)
+    dump = tmp_path / f"quests.{fmt}"
+    write_export(_engine(source).iter_export("quests", fmt), dump)
+
+    target = tmp_path / "target.json"
+    save_game_state(GameState(player=PlayerProgress(), quests=[], current_day=TODAY), target)
+    assert _engine(target).import_quests(dump).startswith("Imported 6 new quests · 0 updated · 0 skipped")
+    assert [_quest_to_payload(q) for q in load_game_state(target).quests] == [_quest_to_payload(q) for q in _quests()]
+
+    assert "Imported 0 new quests · 0 updated · 6 skipped" in _engine(target).import_quests(dump)
+
+
+def test_duplicates_and_invalid_rows_follow_the_conflict_policy(tmp_path):
+    path = tmp_path / "state.json"
+    save_game_state(GameState(player=PlayerProgress(), quests=_quests()[:1], current_day=TODAY), path)
+    base = {k: v for k, v in _quest_to_payload(_quests()[2]).items() if v is not None}
+    rows = [
+        dict(base, id="q0", title="replaces q0"),
+        dict(base, id="new", title="first"),
+        dict(base, id="new", title="second"),
+        dict(base, xp_reward="lots"),
+        {"title": "no tree"},
+    ]
+    dump = tmp_path / "rows.jsonl"
+    dump.write_text("\n".join(json.dumps(row) for row in rows) + "\n{broken\n", encoding="utf-8")
+
+    report = _engine(path).import_quests(dump, on_conflict="upsert")
+    assert report.splitlines()[0] == (
+        "Imported 1 new quests · 1 updated · 0 skipped (already present) · 1 duplicate rows · 3 invalid rows"
+    )
+    assert "line 4: xp_reward must be a whole number, not 'lots'" in report
+    assert "line 6: invalid JSON" in report
+    state = load_game_state(path)
+    assert [(q.id, q.title) for q in state.quests] == [("q0", "replaces q0"), ("new", "second")]
+    assert [q.id for q in state.index.with_status(QuestStatus.FAILED)] == ["q0", "new"]
@@ -0,0 +1,72 @@
+"""The quest indexes kept on GameState."""
+from __future__ import annotations
+
+import datetime as _dt
+import random
+
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, QuestStatus, SkillTree
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _quest(quest_id: str, days: int) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.DEV,
+        skill="Python",
+        difficulty=Difficulty.EASY,
+        estimated_effort="20 minutes",
+        xp_reward=30,
+        streak_impact=1,
+        deadline=TODAY + _dt.timedelta(days=days),
+        id=quest_id,
+    )
+
+
+def _assert_matches_a_scan(state: GameState) -> None:
+    index = state.index
+    assert len(index) == len(state.quests)
+    for quest in state.quests:
+        assert index.get(quest.id) is quest
+    for prefix in ("a", "b1", "c2", "zz"):
+        expected = sorted((q for q in state.quests if q.id.startswith(prefix)), key=lambda q: q.id)
+        assert index.with_prefix(prefix) == expected
+    first, last = TODAY + _dt.timedelta(days=2), TODAY + _dt.timedelta(days=5)
+    for status in QuestStatus:
+        with_status = [q for q in state.quests if q.status == status]
+        assert sorted(q.id for q in index.with_status(status)) == sorted(q.id for q in with_status)
+        assert index.count(status) == len(with_status)
+        between = [q.id for q in index.due_between(status, first, last)]
+        assert sorted(between) == sorted(q.id for q in with_status if first <= q.deadline <= last)
+        assert [index.get(i).deadline for i in between] == sorted(index.get(i).deadline for i in between)
+        before = [q.id for q in index.due_before(status, first)]
+        assert sorted(before) == sorted(q.id for q in with_status if q.deadline < first)
+
+
+def test_indexes_follow_in_place_mutations_adds_and_removals():
+    rng = random.Random(7)
+    state = GameState(
+        player=PlayerProgress(),
+        quests=[_quest(f"{rng.choice('abc')}{n}", rng.randrange(8)) for n in range(60)],
+        current_day=TODAY,
+    )
+    _assert_matches_a_scan(state)
+    for step in range(300):
+        quest = rng.choice(state.quests)
+        action = rng.randrange(5)
+        if action == 0:
+            quest.status = rng.choice(list(QuestStatus))
+        elif action == 1:
+            quest.reset_for_new_day(TODAY + _dt.timedelta(days=rng.randrange(8)))
+        elif action == 2:
+            quest.escalate_failure()
+        elif action == 3:
+            state.add_quest(_quest(f"{rng.choice('abc')}x{step}", rng.randrange(8)))
+        else:
+            state.remove_quests([quest.id])
+    _assert_matches_a_scan(state)
+
+    replacement = _quest(state.quests[0].id, 6)
+    replacement.status = QuestStatus.FAILED
+    state.upsert_quests([replacement, _quest("b-new", 3)])
+    _assert_matches_a_scan(state)
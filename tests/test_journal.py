@@ -0,0 +1,85 @@
+"""The snapshot+journal backend."""
+from __future__ import annotations
+
+import datetime as _dt
+
+import pytest
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.journal import journal_path
+from houssam_rpg.locking import StateConflictError
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.state import (
+    _game_state_to_payload,
+    compact_game_state,
+    load_game_state,
+    save_game_state,
+    storage_for,
+)
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _quest(quest_id: str) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.FAITH,
+        skill="Tafsir",
+        difficulty=Difficulty.EASY,
+        estimated_effort="15 minutes",
+        xp_reward=20,
+        streak_impact=1,
+        deadline=TODAY,
+        id=quest_id,
+    )
+
+
+def _journaled_state(path):
+    save_game_state(GameState(player=PlayerProgress(), quests=[_quest("a"), _quest("b")], current_day=TODAY), path)
+    GameEngine(load_game_state(path), path=path).complete_quest("a")
+    GameEngine(load_game_state(path), path=path).fail_quest("b")
+    engine = GameEngine(load_game_state(path), path=path)
+    engine.undo()  # a history_drop record
+    return engine
+
+
+@pytest.mark.parametrize("suffix", [".json", ".hrpg"])
+def test_journal_left_behind_by_a_crashed_compaction_is_not_replayed_twice(tmp_path, suffix):
+    path = tmp_path / f"state{suffix}"
+    _journaled_state(path)
+    journal = journal_path(path).read_bytes()
+    expected = _game_state_to_payload(load_game_state(path))
+    assert len(load_game_state(path).history) == 1
+
+    storage_for(path).compact(load_game_state(path))
+    # Crash between the snapshot rename and the journal unlink.
+    journal_path(path).write_bytes(journal)
+
+    assert _game_state_to_payload(load_game_state(path)) == expected
+
+
+@pytest.mark.parametrize("suffix", [".json", ".hrpg"])
+def test_commands_append_to_the_journal_until_compaction_folds_it_in(tmp_path, suffix):
+    path = tmp_path / f"state{suffix}"
+    _journaled_state(path)
+    snapshot = path.read_bytes()
+    assert journal_path(path).stat().st_size > 0
+    state = load_game_state(path)
+    expected = _game_state_to_payload(state)
+
+    compact_game_state(state, path)
+
+    assert not journal_path(path).exists()
+    assert path.read_bytes() != snapshot
+    assert _game_state_to_payload(load_game_state(path)) == expected
+
+
+def test_compacting_a_stale_state_is_refused(tmp_path):
+    path = tmp_path / "state.json"
+    _journaled_state(path)
+    stale = load_game_state(path)
+    GameEngine(load_game_state(path), path=path).redo()
+
+    with pytest.raises(StateConflictError):
+        compact_game_state(stale, path)
+    assert journal_path(path).stat().st_size > 0
@@ -0,0 +1,41 @@
+"""Per-command metrics and the --profile/--metrics-json surface."""
+from __future__ import annotations
+
+import json
+import time
+
+import main
+from houssam_rpg import metrics
+from houssam_rpg.state import load_game_state, save_game_state
+
+
+def test_nested_phases_report_exclusive_time():
+    collector = metrics.Metrics(track_memory=False)
+    metrics.activate(collector)
+    try:
+        with metrics.phase("engine"):
+            with metrics.phase("save"):
+                time.sleep(0.02)
+            metrics.count("quests_scanned", 3)
+        metrics.count("quests_scanned")
+    finally:
+        metrics.activate(None)
+    metrics.count("quests_scanned")  # no collector: ignored
+    assert collector.phases["save"] >= 0.02
+    assert collector.phases["engine"] < collector.phases["save"]
+    assert collector.counters == {"quests_scanned": 4}
+
+
+def test_metrics_json_reports_phases_and_counters(tmp_path, capsys):
+    path = tmp_path / "state.json"
+    save_game_state(load_game_state(path), path)
+    report = tmp_path / "metrics.json"
+
+    assert main.main(["--state", str(path), "--metrics-json", str(report), "status"]) == 0
+
+    payload = json.loads(report.read_text(encoding="utf-8"))
+    assert payload["command"] == "status"
+    assert {"import", "load", "render"} <= set(payload["phases_s"])
+    assert payload["total_s"] > 0 and payload["peak_memory_bytes"] > 0
+    assert payload["counters"]["bytes_read"] == path.stat().st_size
+    assert "Level" in capsys.readouterr().out
@@ -0,0 +1,19 @@
+"""What importing the package pulls in."""
+from __future__ import annotations
+
+import subprocess
+import sys
+
+PROBE = """
+import sys
+import houssam_rpg
+eager = [name for name in ("asyncio", "concurrent.futures", "houssam_rpg.daemon", "houssam_rpg.watch") if name in sys.modules]
+assert not eager, eager
+assert houssam_rpg.watch.Watcher and houssam_rpg.daemon.forward
+from houssam_rpg import profiles, simulator
+assert "houssam_rpg.simulator" in sys.modules
+"""
+
+
+def test_optional_modules_load_on_first_access():
+    subprocess.run([sys.executable, "-c", PROBE], check=True)
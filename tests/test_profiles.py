@@ -0,0 +1,64 @@
+"""Player profiles and rollovers across a state directory."""
+from __future__ import annotations
+
+import datetime as _dt
+
+import pytest
+
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, RecurrenceRule, SkillTree
+from houssam_rpg.profiles import iter_profiles, profile_path, render_profiles_report, run_profiles
+from houssam_rpg.state import load_game_state, save_game_state
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _state(quests: int, with_rule: bool) -> GameState:
+    ledger = [
+        Quest(
+            title=f"Quest {n}",
+            tree=SkillTree.DEV,
+            skill="Algorithms",
+            difficulty=Difficulty.STANDARD,
+            estimated_effort="30 minutes",
+            xp_reward=50,
+            streak_impact=1,
+            deadline=TODAY,
+            id=f"q{n}",
+        )
+        for n in range(quests)
+    ]
+    rules = []
+    if with_rule:
+        rules.append(
+            RecurrenceRule(
+                title="Stretch",
+                tree=SkillTree.BODY,
+                skill="Mobility",
+                difficulty=Difficulty.EASY,
+                estimated_effort="10 minutes",
+                xp_reward=20,
+                start=TODAY,
+            )
+        )
+    return GameState(player=PlayerProgress(), quests=ledger, current_day=TODAY, rules=rules)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rollover_reports_every_escalated_quest(tmp_path, workers):
+    save_game_state(_state(2, with_rule=True), tmp_path / "amina.json")
+    save_game_state(_state(3, with_rule=False), tmp_path / "bilal.db")
+    (tmp_path / "notes.txt").write_text("not a profile", encoding="utf-8")
+
+    assert sorted(name for name, _ in iter_profiles(tmp_path)) == ["amina", "bilal"]
+    assert profile_path("bilal", tmp_path) == tmp_path / "bilal.db"
+
+    reports = {r.name: r for r in run_profiles(tmp_path, advance_days=3, workers=workers)}
+    # Two stored quests plus the rule's three missed days collapsed into one quest.
+    assert reports["amina"].punished == 3
+    assert reports["bilal"].punished == 3
+    for name, report in reports.items():
+        assert report.ok and report.day == (TODAY + _dt.timedelta(days=3)).isoformat()
+        assert load_game_state(profile_path(name, tmp_path)).current_day == TODAY + _dt.timedelta(days=3)
+
+    lines = list(render_profiles_report(iter(reports.values()), "ROLLOVER"))
+    assert lines[-1] == "2 profiles · 6 quests punished · 0 still overdue · 0 errors"
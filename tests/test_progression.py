@@ -0,0 +1,39 @@
+"""Level math and the progression simulator."""
+from __future__ import annotations
+
+import datetime as _dt
+import random
+
+from houssam_rpg.models import GameState, PlayerProgress
+from houssam_rpg.simulator import SimulationConfig, render_report, run_simulation
+from houssam_rpg.state import TITLE_UNLOCKS, award_xp, rank_for_level, xp_for_next_level
+
+
+def _level_by_level(level: int, xp: int, grant: int):
+    xp += grant
+    while xp >= xp_for_next_level(level):
+        xp -= xp_for_next_level(level)
+        level += 1
+    return level, xp
+
+
+def test_award_xp_matches_climbing_one_level_at_a_time():
+    rng = random.Random(3)
+    state = GameState(player=PlayerProgress(), quests=[], current_day=_dt.date(2026, 1, 1))
+    player = state.player
+    unlocked = []
+    for grant in [rng.randrange(500) for _ in range(200)] + [2**40, 7, 2**90, 1]:
+        expected = _level_by_level(player.level, player.xp, grant)
+        unlocked += award_xp(state, grant)
+        assert (player.level, player.xp) == expected
+        assert player.rank == rank_for_level(player.level)
+    assert player.level > 120
+    assert unlocked == player.titles == [TITLE_UNLOCKS[level] for level in sorted(TITLE_UNLOCKS)]
+
+
+def test_simulation_is_reproducible_and_independent_of_workers():
+    config = SimulationConfig(players=4, days=30, seed=5)
+    serial = run_simulation(config, workers=1)
+    assert run_simulation(config, workers=2) == serial
+    assert all(outcome.xp_earned > 0 for outcome in serial)
+    assert "4 players × 30 days" in render_report(config, serial)
@@ -0,0 +1,76 @@
+"""Paginated, streamed report rendering."""
+from __future__ import annotations
+
+import datetime as _dt
+import io
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.render import WRITE_CHUNK_LINES, Pager, write_lines
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _paged(sections, limit, page):
+    pager = Pager(limit, page)
+    items = [item for section in sections for item in pager.take(iter(section), total=len(section))]
+    return items, pager.more
+
+
+def test_pages_cover_every_section_exactly_once():
+    sections = [list(range(0, 5)), [], list(range(5, 12)), list(range(12, 13))]
+    pages = []
+    page = 1
+    while True:
+        items, more = _paged(sections, 4, page)
+        pages.append(items)
+        if not more:
+            break
+        page += 1
+    assert pages == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12]]
+    assert _paged(sections, None, 1) == (list(range(13)), False)
+    assert _paged(sections, 4, 9) == ([], False)
+
+
+def test_briefing_pages_split_the_full_quest_list():
+    quests = [
+        Quest(
+            title=f"Quest {n}",
+            tree=SkillTree.FAITH,
+            skill="Tafsir",
+            difficulty=Difficulty.EASY,
+            estimated_effort="10 minutes",
+            xp_reward=10,
+            streak_impact=1,
+            deadline=TODAY - _dt.timedelta(days=n % 2),
+            id=f"q{n:02d}",
+        )
+        for n in range(11)
+    ]
+    engine = GameEngine(GameState(player=PlayerProgress(), quests=quests, current_day=TODAY), saver=lambda *a: None)
+
+    def quest_lines(lines):
+        return [line for line in lines if line.startswith("[q")]
+
+    everything = quest_lines(engine.iter_morning())
+    assert len(everything) == 11
+    pages = [list(engine.iter_morning(limit=4, page=page)) for page in (1, 2, 3)]
+    assert [line for page in pages for line in quest_lines(page)] == everything
+    assert pages[0][-1] == "… more on the next page (--page 2)"
+    assert not pages[2][-1].startswith("…")
+    assert "No more quests on this page." in engine.iter_morning(limit=4, page=4)
+
+
+def test_write_lines_streams_in_chunks():
+    class Recorder(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            Recorder.writes += 1
+            return super().write(text)
+
+    lines = [f"line {n}" for n in range(WRITE_CHUNK_LINES * 2 + 3)]
+    out = Recorder()
+    write_lines(iter(lines), out)
+    assert out.getvalue() == "\n".join(lines) + "\n"
+    assert Recorder.writes == 3
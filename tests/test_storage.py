@@ -0,0 +1,105 @@
+"""Round trips through the storage backends."""
+from __future__ import annotations
+
+import datetime as _dt
+import sqlite3
+
+import pytest
+
+from houssam_rpg import sqlite_store
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.sqlite_store import LAYOUT_VERSION
+from houssam_rpg.state import award_xp, load_game_state, make_event, save_game_state
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+def _quest(quest_id: str, xp: int) -> Quest:
+    return Quest(
+        title=quest_id,
+        tree=SkillTree.BODY,
+        skill="Running",
+        difficulty=Difficulty.EASY,
+        estimated_effort="5 km",
+        xp_reward=xp,
+        streak_impact=1,
+        deadline=TODAY,
+        id=quest_id,
+    )
+
+
+@pytest.mark.parametrize("suffix", [".json", ".hrpg", ".db"])
+def test_escalated_rewards_past_64_bits_survive_a_round_trip(tmp_path, suffix):
+    path = tmp_path / f"state{suffix}"
+    small, big = _quest("small", 30), _quest("big", 25)
+    big.escalate_failure(70)
+    state = GameState(player=PlayerProgress(), quests=[small, big], current_day=TODAY)
+    save_game_state(state, path)
+    # And again through the incremental path.
+    big.escalate_failure(3)
+    save_game_state(state, path, event=make_event("fail", state, quests=[big]))
+
+    loaded = load_game_state(path)
+    assert loaded.index.get("big").xp_reward == 25 << 73
+    assert loaded.index.get("small").xp_reward == 30
+
+
+def test_sqlite_databases_from_before_the_layout_stamp_are_upgraded(tmp_path):
+    path = tmp_path / "state.db"
+    save_game_state(GameState(player=PlayerProgress(), quests=[_quest("a", 10)], current_day=TODAY), path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE quests DROP COLUMN xp_overflow")
+        conn.execute("DELETE FROM meta WHERE key = 'layout'")
+
+    state = load_game_state(path)
+    assert state.index.get("a").xp_reward == 10
+    state.index.get("a").escalate_failure(64)
+    save_game_state(state, path, event=make_event("fail", state, quests=[state.index.get("a")]))
+    assert load_game_state(path).index.get("a").xp_reward == 10 << 64
+
+
+def test_completing_a_quest_escalated_past_64_bits_commits_on_sqlite(tmp_path):
+    path = tmp_path / "state.db"
+    quest = _quest("huge", 1)
+    quest.escalate_failure(70)
+    state = GameState(player=PlayerProgress(), quests=[quest], current_day=TODAY)
+    state.player.achievement_counters["clean-30"] = 2**65
+    save_game_state(state, path)
+
+    GameEngine(load_game_state(path), path=path, record_undo=False).complete_quest("huge")
+
+    loaded = load_game_state(path)
+    assert loaded.player.achievement_counters["clean-30"] == 2**65
+    expected = PlayerProgress()
+    award_xp(GameState(player=expected, quests=[], current_day=TODAY), 1 << 70)
+    assert (loaded.player.level, loaded.player.xp) == (expected.level, expected.xp)
+    assert loaded.history.xp[-1] == 2**63 - 1
+
+
+def test_sqlite_schema_runs_only_for_new_or_older_layouts(tmp_path, monkeypatch):
+    path = tmp_path / "state.db"
+    save_game_state(GameState(player=PlayerProgress(), quests=[_quest("a", 10)], current_day=TODAY), path)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone() == (str(LAYOUT_VERSION),)
+
+    def forbidden(*args):
+        raise AssertionError("schema DDL ran for an up-to-date database")
+
+    monkeypatch.setattr(sqlite_store, "_upgrade_tables", forbidden)
+    assert load_game_state(path).index.get("a").xp_reward == 10
+
+
+@pytest.mark.parametrize("suffix", [".json", ".hrpg", ".db"])
+def test_bulk_decoded_quests_are_indexed_and_track_changes(tmp_path, suffix):
+    path = tmp_path / f"state{suffix}"
+    quests = [_quest(f"q{n}", 10 + n) for n in range(5)]
+    save_game_state(GameState(player=PlayerProgress(), quests=quests, current_day=TODAY), path)
+
+    loaded = load_game_state(path)
+    assert loaded.quests == quests
+    assert [q.id for q in loaded.index.with_prefix("q")] == [f"q{n}" for n in range(5)]
+    quest = loaded.index.get("q2")
+    quest.reset_for_new_day(TODAY + _dt.timedelta(days=1))
+    assert loaded.index.due_between(quest.status, TODAY, TODAY) == [q for q in loaded.quests if q is not quest]
+    assert loaded.index.due_between(quest.status, TODAY + _dt.timedelta(days=1), TODAY + _dt.timedelta(days=1)) == [quest]
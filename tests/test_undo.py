@@ -0,0 +1,82 @@
+"""Undo and redo across the storage backends."""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+
+import pytest
+
+from houssam_rpg.catalog import load_catalog
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.state import _game_state_to_payload, load_game_state, save_game_state
+
+ONE_DAY = _dt.timedelta(days=1)
+
+
+def _today(engine: GameEngine):
+    day = engine.state.current_day
+    return engine.select_quests(first=day, last=day)
+
+
+def _first_template(engine: GameEngine) -> str:
+    catalog = load_catalog()
+    return catalog[catalog.select()[0]].id
+
+
+OPERATIONS = [
+    lambda engine: engine.complete_quests(quests=_today(engine)[:2]),
+    lambda engine: engine.fail_quests(quests=_today(engine)[:1]),
+    lambda engine: engine.advance_to(engine.state.current_day + 3 * ONE_DAY),
+    lambda engine: engine.schedule_quests([_first_template(engine)]),
+    lambda engine: engine.import_quests(engine.path.with_name("import.jsonl")),
+    lambda engine: engine.complete_quest("imported"),
+    lambda engine: engine.add_rule(_first_template(engine)),
+    lambda engine: engine.run_batch(
+        [lambda batch: batch.complete_quests(quests=_today(batch)), lambda batch: batch.advance_day()]
+    ),
+    lambda engine: engine.advance_day(),
+]
+
+
+def _snapshot(path) -> str:
+    payload = _game_state_to_payload(load_game_state(path))
+    payload.pop("version")
+    return json.dumps(payload, sort_keys=True)
+
+
+@pytest.mark.parametrize("suffix", [".json", ".hrpg", ".db"])
+def test_undo_all_then_redo_all_retraces_every_state(tmp_path, suffix):
+    path = tmp_path / f"state{suffix}"
+    state = load_game_state(path)
+    save_game_state(state, path)
+    record = {
+        "id": "imported",
+        "title": "Imported",
+        "tree": "Dev",
+        "skill": "Algorithms",
+        "estimated_effort": "5m",
+        "xp_reward": 500,
+        "streak_impact": 1,
+        "deadline": state.current_day.isoformat(),
+    }
+    path.with_name("import.jsonl").write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    def engine() -> GameEngine:
+        # A fresh engine per command, like separate CLI invocations.
+        return GameEngine(load_game_state(path), path=path)
+
+    snapshots = [_snapshot(path)]
+    for operation in OPERATIONS:
+        operation(engine())
+        snapshots.append(_snapshot(path))
+    assert len(set(snapshots)) == len(snapshots)  # every operation changed something
+
+    for expected in reversed(snapshots[:-1]):
+        assert engine().undo().startswith("↶ Undone")
+        assert _snapshot(path) == expected
+    assert engine().undo() == "Nothing to undo."
+
+    for expected in snapshots[1:]:
+        assert engine().redo().startswith("↷ Redone")
+        assert _snapshot(path) == expected
+    assert engine().redo() == "Nothing to redo."
@@ -0,0 +1,97 @@
+"""Watch mode: the wake-up scheduler, screen diffs and midnight rollovers."""
+from __future__ import annotations
+
+import datetime as _dt
+import io
+
+from houssam_rpg.engine import GameEngine
+from houssam_rpg.locking import StateConflictError
+from houssam_rpg.models import Difficulty, GameState, PlayerProgress, Quest, SkillTree
+from houssam_rpg.state import load_game_state, save_game_state
+from houssam_rpg.watch import MAX_CONFLICT_RETRIES, Scheduler, Screen, Watcher
+
+TODAY = _dt.date(2026, 1, 1)
+
+
+class FakeClock:
+    def __init__(self, now: _dt.datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> _dt.datetime:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += _dt.timedelta(seconds=seconds)
+
+
+def _watcher(tmp_path, at: _dt.time):
+    path = tmp_path / "state.json"
+    quest = Quest(
+        title="Read a chapter",
+        tree=SkillTree.FAITH,
+        skill="Tafsir",
+        difficulty=Difficulty.EASY,
+        estimated_effort="20 minutes",
+        xp_reward=20,
+        streak_impact=1,
+        deadline=TODAY,
+        id="read",
+    )
+    save_game_state(GameState(player=PlayerProgress(), quests=[quest], current_day=TODAY), path)
+    clock = FakeClock(_dt.datetime.combine(TODAY, at))
+    watcher = Watcher(
+        path,
+        check_every=_dt.timedelta(minutes=10),
+        clock=clock,
+        sleep=clock.sleep,
+        stream=io.StringIO(),
+    )
+    return path, clock, watcher
+
+
+def test_scheduler_pops_due_wakeups_in_time_then_insertion_order():
+    scheduler = Scheduler()
+    noon = _dt.datetime(2026, 1, 1, 12)
+    scheduler.push(noon, "sync")
+    scheduler.push(noon - _dt.timedelta(hours=1), "reminder")
+    scheduler.push(noon, "deadline")
+    assert scheduler.next_time() == noon - _dt.timedelta(hours=1)
+    assert [w.kind for w in scheduler.pop_due(noon)] == ["reminder", "sync", "deadline"]
+    assert len(scheduler) == 0 and scheduler.next_time() is None
+
+
+def test_screen_rewrites_only_changed_lines():
+    out = io.StringIO()
+    screen = Screen(out)
+    assert screen.draw(["a", "b", "c"]) == 3
+    assert screen.draw(["a", "B", "c"]) == 2
+    assert out.getvalue().endswith("- b\n+ B\n")
+
+
+def test_midnight_rolls_the_state_over(tmp_path):
+    path, clock, watcher = _watcher(tmp_path, _dt.time(23, 30))
+    watcher.run(max_wakeups=4)
+    assert clock.now.date() == TODAY + _dt.timedelta(days=1)
+    assert load_game_state(path).current_day == TODAY + _dt.timedelta(days=1)
+    assert "Rolled over to 2026-01-02 · 1 quests escalated" in watcher.screen.lines[-1]
+
+
+def test_rollover_that_keeps_conflicting_is_reported_and_retried(tmp_path, monkeypatch):
+    path, clock, watcher = _watcher(tmp_path, _dt.time(0, 5))
+    clock.now += _dt.timedelta(days=1)  # the state is a day behind
+    advance_to = GameEngine.advance_to
+    attempts = []
+
+    def conflicting(engine, target):
+        attempts.append(clock.now)
+        if len(attempts) <= MAX_CONFLICT_RETRIES:
+            raise StateConflictError(engine.state.version, engine.state.version + 1)
+        return advance_to(engine, target)
+
+    monkeypatch.setattr(GameEngine, "advance_to", conflicting)
+    watcher.run(max_wakeups=1)
+
+    assert "⚠ Rollover to 2026-01-02 gave up after 5 conflicting writes" in watcher.screen.stream.getvalue()
+    assert attempts[-1] == _dt.datetime(2026, 1, 2, 0, 15) and len(attempts) == MAX_CONFLICT_RETRIES + 1
+    assert load_game_state(path).current_day == TODAY + _dt.timedelta(days=1)
+    assert "Rolled over to 2026-01-02" in watcher.screen.lines[-1]